@@ -0,0 +1,261 @@
+# admin/export_charts.py
+
+"""
+Headless Chart Export for the EasyA Grade Analysis System
+
+Pre-renders the instructor comparison graphs of the student window for every
+department x course level x metric x faculty filter, e.g. for a static site
+or as a cache of ready-made images. No window is opened: the comparison data
+comes from QueryBuilder and the charts are drawn with the Agg backend.
+
+- Queries run in the main process (they are cheap rollup aggregations), and
+  rendering, which is CPU bound, is spread over a process pool.
+- Every chart's input (its parameters, the query results, the file format and
+  RENDER_VERSION) is hashed into a fingerprint. manifest.json in the output
+  directory records the fingerprint each file was rendered from, so a re-run
+  only renders charts whose data changed since the last run.
+- Combinations without any grade data produce no chart.
+- --from/--to restrict every chart to a span of terms (e.g., --from "Fall 2013"
+  --to "Spring 2016").
+
+Usage:
+    python -m admin.export_charts [--output DIR] [--format png svg] [--workers N]
+                                  [--backend mongo|columnar] [--department MATH ...] [--force]
+                                  [--from TERM] [--to TERM]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from src.data.query_builder import QueryBuilder
+from src.utils.helpers import parse_term, term_name
+
+# Where charts are written by default
+DEFAULT_OUTPUT_DIR = "charts"
+
+# Fingerprints of the rendered files, kept in the output directory
+MANIFEST_NAME = "manifest.json"
+
+# Bump when the look of the charts changes, so every chart is rendered again
+RENDER_VERSION = 1
+
+# None is the department-wide chart over every level
+CHART_LEVELS = [None, 100, 200, 300, 400, 500, 600]
+
+METRIC_LABELS = {"percent_a": "% As", "percent_df": "% Ds/Fs"}
+
+# Figure width per bar in inches; charts are never narrower than 6 inches
+INCHES_PER_BAR = 0.45
+
+
+class ChartSpec(NamedTuple):
+    department: str
+    level: Optional[int]
+    metric: str
+    faculty_only: bool
+    start: Optional[str] = None
+    end: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        """
+        File name without extension, e.g. MATH_300_percent_a_faculty, or
+        MATH_300_percent_a_faculty_from_Fall2013_to_Spring2016 for a term range.
+        """
+        name = (f"{self.department}_{self.level or 'all'}_{self.metric}"
+                f"_{'faculty' if self.faculty_only else 'all'}")
+        # bounds are named by the terms they resolve to, so "2013" and "Winter 2013" share a file
+        if self.start:
+            name += f"_from_{term_name(parse_term(self.start)).replace(' ', '')}"
+        if self.end:
+            name += f"_to_{term_name(parse_term(self.end, end=True)).replace(' ', '')}"
+        return name
+
+    @property
+    def title(self) -> str:
+        parts = [f"Dept: {self.department}"]
+        if self.level:
+            parts.append(f"Level: {self.level}-level")
+        parts.append("Regular faculty" if self.faculty_only else "All instructors")
+        if self.start or self.end:
+            parts.append(f"{self.start or 'first term'} - {self.end or 'last term'}")
+        return " | ".join(parts)
+
+
+def chart_specs(departments: List[str], levels: List[Optional[int]] = CHART_LEVELS,
+                start: Optional[str] = None, end: Optional[str] = None) -> List[ChartSpec]:
+    """Every department x level x metric x faculty filter combination."""
+    return [ChartSpec(department, level, metric, faculty_only, start, end)
+            for department in departments
+            for level in levels
+            for metric in METRIC_LABELS
+            for faculty_only in (False, True)]
+
+
+def fingerprint(spec: ChartSpec, results: List[Dict[str, Any]], file_format: str) -> str:
+    """Hash of everything a chart file is rendered from."""
+    payload = json.dumps({"spec": spec, "results": results, "format": file_format,
+                          "render_version": RENDER_VERSION}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_chart(spec: ChartSpec, results: List[Dict[str, Any]], path: str) -> str:
+    """
+    Render one comparison chart to path (format taken from its extension).
+    Runs in a worker process; only Agg is used, so no display is needed.
+
+    Returns:
+        The path written
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from src.gui.bar_chart import BarChart
+
+    fig = Figure(figsize=(max(6, INCHES_PER_BAR * len(results)), 4.5), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    chart = BarChart(fig, canvas, color="blue", slots=len(results), animated=False)
+    chart.set_data([r["_id"] for r in results], [r["average"] for r in results],
+                   [r["class_count"] for r in results], show_counts=True,
+                   y_label=METRIC_LABELS[spec.metric], title=spec.title)
+
+    # write next to path and rename, so an interrupted run never leaves a partial image
+    file_format = os.path.splitext(path)[1][1:]
+    fig.savefig(f"{path}.tmp", format=file_format)
+    os.replace(f"{path}.tmp", path)
+    return path
+
+
+class ChartExporter:
+    def __init__(self, db_manager, output_dir: str = DEFAULT_OUTPUT_DIR, formats=("png",),
+                 workers: Optional[int] = None, progress=None):
+        """
+        Args:
+            db_manager: Query backend (DatabaseManager or ColumnarGradeStore)
+            output_dir: Directory charts and the manifest are written to
+            formats: File formats to render every chart in (e.g., "png", "svg")
+            workers: Number of render processes (default: one per CPU)
+            progress: Optional callback receiving a charts_rendered counter
+        """
+        self.queries = QueryBuilder(db_manager)
+        self.db = db_manager
+        self.output_dir = output_dir
+        self.formats = list(formats)
+        self.workers = workers
+        self.progress = progress
+        self._manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+
+    def load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self._manifest_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self, manifest: Dict[str, str]) -> None:
+        with open(f"{self._manifest_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=1, sort_keys=True)
+        os.replace(f"{self._manifest_path}.tmp", self._manifest_path)
+
+    def export(self, departments: Optional[List[str]] = None, levels: List[Optional[int]] = CHART_LEVELS,
+               force: bool = False, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Render every chart whose data changed since the last export.
+
+        Args:
+            departments: Departments to export (default: every department with grade data)
+            levels: Course levels to export; None is the department-wide chart
+            force: Render every chart, even if its fingerprint is unchanged
+            start: Optional first term or year included (e.g., "Fall 2013")
+            end: Optional last term or year included (e.g., "Spring 2016")
+
+        Returns:
+            Dictionary with counts of charts rendered, unchanged and empty
+            (combinations without data) and the seconds spent querying and rendering
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        started = time.perf_counter()
+        if departments is None:
+            departments = sorted(r["_id"] for r in self.db.group_stats("department") if r["_id"])
+
+        manifest = self.load_manifest()
+        summary = {"rendered": 0, "unchanged": 0, "empty": 0}
+        tasks = []
+        for spec in chart_specs(departments, levels, start, end):
+            results = self.queries.build_comparison_query(
+                spec.department, level=spec.level, instructors_only=spec.faculty_only, metric=spec.metric,
+                start=spec.start, end=spec.end
+            )
+            if not results:
+                summary["empty"] += 1
+                continue
+            for file_format in self.formats:
+                file_name = f"{spec.name}.{file_format}"
+                digest = fingerprint(spec, results, file_format)
+                if (not force and manifest.get(file_name) == digest
+                        and os.path.exists(os.path.join(self.output_dir, file_name))):
+                    summary["unchanged"] += 1
+                    continue
+                tasks.append((spec, results, file_name, digest))
+        summary["query_seconds"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if tasks:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [(file_name, digest,
+                            pool.submit(render_chart, spec, results, os.path.join(self.output_dir, file_name)))
+                           for spec, results, file_name, digest in tasks]
+                try:
+                    for file_name, digest, future in futures:
+                        future.result()
+                        # record each chart as it lands, so an interrupted run keeps its progress
+                        manifest[file_name] = digest
+                        summary["rendered"] += 1
+                        if self.progress:
+                            self.progress(charts_rendered=summary["rendered"])
+                finally:
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    self.save_manifest(manifest)
+        summary["render_seconds"] = time.perf_counter() - started
+        return summary
+
+
+def open_backend(backend: str):
+    """Open the query backend the same way the student window does, without importing data."""
+    from src.data.db_manager import DatabaseManager
+    from src.data.columnar_store import ColumnarGradeStore
+    from src.data.snapshot import DEFAULT_SNAPSHOT_PATH, load_snapshot
+
+    if backend == "columnar" and os.path.exists(DEFAULT_SNAPSHOT_PATH):
+        return load_snapshot(DEFAULT_SNAPSHOT_PATH)
+    db_manager = DatabaseManager()
+    if backend == "columnar":
+        return ColumnarGradeStore.from_database(db_manager)
+    return db_manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every comparison chart without opening a window.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="Directory to write charts to")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=["png", "svg"], help="File formats")
+    parser.add_argument("--workers", type=int, default=None, help="Number of render processes")
+    parser.add_argument("--backend", default="mongo", choices=["mongo", "columnar"], help="Query backend")
+    parser.add_argument("--department", nargs="+", default=None, help="Only export these departments")
+    parser.add_argument("--force", action="store_true", help="Render charts even if their data is unchanged")
+    parser.add_argument("--from", dest="start", default=None, help='First term or year included (e.g., "Fall 2013")')
+    parser.add_argument("--to", dest="end", default=None, help='Last term or year included (e.g., "Spring 2016")')
+    args = parser.parse_args()
+
+    exporter = ChartExporter(open_backend(args.backend), args.output, args.format, args.workers)
+    summary = exporter.export(args.department, force=args.force, start=args.start, end=args.end)
+    print(f"{summary['rendered']} chart(s) rendered, {summary['unchanged']} unchanged, "
+          f"{summary['empty']} combination(s) without data")
+    print(f"Queries: {summary['query_seconds']:.1f}s, rendering: {summary['render_seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
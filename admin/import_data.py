@@ -4,28 +4,262 @@ Data Import Module for EasyA Grade Analysis System
 
 import json
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pymongo import MongoClient
+from src.data.db_manager import build_rollups
+from src.utils.helpers import term_ordinal
+
+# Number of characters read from disk at a time by the streaming parser
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Number of grade rows buffered before they are flushed to MongoDB
+DEFAULT_BATCH_SIZE = 5000
+
+# Optional section enrollment keys, in order of preference. The public
+# gradedata.js export has none of them; sections without a count are stored
+# with total_students None and left out of enrollment-weighted statistics.
+ENROLLMENT_FIELDS = ("total_students", "TOT_STUDENTS", "students")
+
+
+def safe_float(value: str, default: float = 0.0) -> float:
+    try:
+        return float(value) if value and value != 'NA' else default
+    except ValueError:
+        return default
+
+
+def parse_enrollment(entry: Dict[str, Any]) -> Optional[int]:
+    """Return a section's student count, or None if the entry has no usable count."""
+    for field in ENROLLMENT_FIELDS:
+        count = safe_float(str(entry.get(field) or ''))
+        if count > 0:
+            return int(count)
+    return None
+
+
+def normalize_course(course_id: str, course_entries) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Convert the raw gradedata entries of one course into grade distribution rows.
+
+    Args:
+        course_id: Course key from the data file (e.g., "MATH111")
+        course_entries: List of raw entries recorded for that course
+
+    Returns:
+        Tuple of (grade distribution rows, number of skipped entries)
+    """
+    grades = []
+    skipped_entries = 0
+    try:
+        if not isinstance(course_entries, list) or not course_entries:
+            print(course_entries)
+            print(f"Warning: Invalid entries for course {course_id}")
+            return grades, 1
+
+        for entry in course_entries:
+            # Extract term and year
+            term_desc = entry.get('TERM_DESC', '')
+            term_parts = term_desc.split()
+            # Check if format is correct TODO: are LAW terms supposed to be in here?? ask
+            if len(term_parts) != 2 and len(term_parts) != 3:
+                print(f"Warning: Invalid term format for {course_id}: {term_desc}")
+                skipped_entries += 1
+                continue
+
+            if len(term_parts) == 3:
+                term_parts.pop(1)
+
+            term, year = term_parts
+            academic_year = int(year)
+
+            # get grade percentages
+            percent_a = safe_float(entry.get('aprec', '0.0'))
+            percent_b = safe_float(entry.get('bprec', '0.0'))
+            percent_c = safe_float(entry.get('cprec', '0.0'))
+            percent_d = safe_float(entry.get('dprec', '0.0'))
+            percent_f = safe_float(entry.get('fprec', '0.0'))
+
+            # Validate percentages
+            if all(p == 0 for p in [percent_a, percent_b, percent_c, percent_d, percent_f]):
+                print(f"Warning: All percentages zero for {course_id}")
+                skipped_entries += 1
+                continue
+
+            # Infer department and course number
+            department = ''.join(re.search(r'^([A-z]*)(\d*)', course_id).group(1))
+            course_number = ''
+            try:
+                course_number = (''.join(re.search(r'^([A-z]*)(\d*)', course_id).group(2)))
+                number = int(course_number)
+            except ValueError:
+                print(f"Warning: Invalid course number for {course_id}")
+                skipped_entries += 1
+                continue
+
+            # Create grade distribution entry; course attributes are stored on
+            # every row so queries can filter with exact, indexed matches
+            grades.append({
+                'course_id': department + course_number,
+                'department': department,
+                'number': number,
+                'level': (number // 100) * 100,
+                'instructor_name': entry.get('instructor', '').strip(),
+                'year': academic_year,
+                'term': term,
+                'term_ordinal': term_ordinal(term, academic_year),
+                'percent_a': percent_a,
+                'percent_b': percent_b,
+                'percent_c': percent_c,
+                'percent_df': percent_d + percent_f,
+                'total_students': parse_enrollment(entry),
+                'crn': entry.get('crn', '')
+            })
+
+    except Exception as e:
+        print(f"Warning: Error processing {course_id}: {str(e)}")
+        skipped_entries += 1
+
+    return grades, skipped_entries
+
+
+class _ChunkReader:
+    """
+    Character buffer over a text file that only keeps the unconsumed tail of
+    the current chunk in memory.
+    """
+    def __init__(self, file, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read the next chunk, dropping already consumed text. Returns False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+            return False
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next significant character, or None at end of file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, chars: str) -> str:
+        """Consume the next significant character, which must be one of chars."""
+        char = self.peek()
+        if char is None or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} but found {char!r}")
+        self.pos += 1
+        return char
+
+    def skip_to(self, char: str) -> None:
+        """Discard everything up to (not including) the next occurrence of char."""
+        while True:
+            index = self.buffer.find(char, self.pos)
+            if index != -1:
+                self.pos = index
+                return
+            self.pos = len(self.buffer)
+            if not self.fill():
+                raise ValueError(f"No {char!r} found in file")
+
+    def decode_value(self):
+        """Decode one JSON value, reading more chunks until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # a value ending exactly at the buffer edge may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def iter_grade_data(json_file_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally parse a gradedata.js/.json file one course at a time.
+
+    Only the current chunk and the entries of the course being decoded are held
+    in memory, so memory use does not grow with the size of the file. The JS
+    assignment wrapper (``var groups = {...};``) is skipped by seeking to the
+    first ``{``.
+
+    Args:
+        json_file_path: Path to the .js or .json data file
+        chunk_size: Number of characters to read from disk at a time
+
+    Yields:
+        (course_id, course_entries) pairs in file order
+    """
+    with open(json_file_path, 'r', encoding='utf-8') as file:
+        reader = _ChunkReader(file, chunk_size)
+        reader.skip_to('{')
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            course_id = reader.decode_value()
+            if not isinstance(course_id, str):
+                raise ValueError(f"Expected course id string but found {course_id!r}")
+            reader.expect(':')
+            yield course_id, reader.decode_value()
+            if reader.expect(',}') == '}':
+                return
+
+
+def _no_progress(**counters) -> None:
+    pass
+
 
 class DataImporter:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, progress=None):
         """
         Initialize the DataImporter with a database manager.
-        
+
         Args:
             db_manager: Instance of DatabaseManager that provides access to MongoDB collections
+            progress: Optional callback receiving rows_parsed / rows_inserted
+                      counters as the import advances (see admin/jobs.py)
         """
         self.db = db_manager
+        self.progress = progress or _no_progress
 
-    def import_grade_data(self, json_file_path: str) -> None:
+    def import_grade_data(self, json_file_path: str, streaming: bool = False,
+                          batch_size: int = DEFAULT_BATCH_SIZE) -> None:
         """
         Import grade distribution data from the provided JSON file.
+
+        Args:
+            json_file_path: Path to the .js or .json data file
+            streaming: If True, parse the file one course at a time and flush
+                       rows to MongoDB in batches instead of loading it whole
+            batch_size: Maximum number of rows per insert in streaming mode
         """
+        if streaming:
+            return self._import_streaming(json_file_path, batch_size)
+
         processed_courses = set()
         processed_grades = []
         skipped_entries = 0
         year_counts = {}
-        
+
         try:
             with open(json_file_path, 'r', encoding='utf-8') as file:
                 # load json from file !!!weird split stuff is to trim the extra JS!!!
@@ -35,106 +269,91 @@ class DataImporter:
                     data = json.loads(file.read().split("= ")[1].split(";")[0])
         except (json.JSONDecodeError, FileNotFoundError) as e:
             raise ValueError(f"Error reading JSON file: {e}")
-        
+
         for course_id, course_entries in data.items():
-            try:
-                if not isinstance(course_entries, list) or not course_entries:
-                    print(course_entries)
-                    print(f"Warning: Invalid entries for course {course_id}")
-                    skipped_entries += 1
-                    continue
-                
-                for entry in course_entries:
-                    # Extract term and year
-                    term_desc = entry.get('TERM_DESC', '')
-                    term_parts = term_desc.split()
-                    # Check if format is correct TODO: are LAW terms supposed to be in here?? ask
-                    if len(term_parts) != 2 and len(term_parts) != 3:
-                        print(f"Warning: Invalid term format for {course_id}: {term_desc}")
-                        skipped_entries += 1
-                        continue
-
-                    if len(term_parts) == 3:
-                        term_parts.pop(1)
-                    
-                    term, year = term_parts
-                    academic_year = int(year)
-                    
-                    # track year distribution DONT FORGET PLUS 1
-                    year_counts[academic_year] = year_counts.get(academic_year, 0) + 1
-                    
-                    def safe_float(value: str, default: float = 0.0) -> float:
-                        try:
-                            return float(value) if value and value != 'NA' else default
-                        except ValueError:
-                            return default
-                    
-                    # get grade percentages
-                    percent_a = safe_float(entry.get('aprec', '0.0'))
-                    percent_b = safe_float(entry.get('bprec', '0.0'))
-                    percent_c = safe_float(entry.get('cprec', '0.0'))
-                    percent_d = safe_float(entry.get('dprec', '0.0'))
-                    percent_f = safe_float(entry.get('fprec', '0.0'))
-                    
-                    # Validate percentages
-                    if all(p == 0 for p in [percent_a, percent_b, percent_c, percent_d, percent_f]):
-                        print(f"Warning: All percentages zero for {course_id}")
-                        skipped_entries += 1
-                        continue
-                    
-                    # Infer department and course number
-                    department = ''.join(re.search(r'^([A-z]*)(\d*)', course_id).group(1))
-                    course_number = ''
-                    try:
-                        course_number = (''.join(re.search(r'^([A-z]*)(\d*)', course_id).group(2)))
-                    except ValueError:
-                        print(f"Warning: Invalid course number for {course_id}")
-                        skipped_entries += 1
-                        continue
-                    new_course_number = department + course_number
-                    
-                    # Add course if not already processed
-                    if course_id not in processed_courses:
-                        processed_courses.add(department + course_number)
-                    
-                    # Create grade distribution entry
-                    grade_dist = {
-                        'course_id': department + course_number,
-                        'instructor_name': entry.get('instructor', '').strip(),
-                        'year': academic_year,
-                        'term': term,
-                        'percent_a': percent_a,
-                        'percent_b': percent_b,
-                        'percent_c': percent_c,
-                        'percent_df': percent_d + percent_f,
-                        'crn': entry.get('crn', '')
-                    }
-                    
-                    processed_grades.append(grade_dist)
-            
-            except Exception as e:
-                print(f"Warning: Error processing {course_id}: {str(e)}")
-                skipped_entries += 1
-        
-        print("\nImport Summary:")
-        print(f"Total entries processed: {len(processed_grades)}")
-        print(f"Entries skipped: {skipped_entries}")
-        print(f"Unique courses: {len(processed_courses)}")
-        print("\nYear Distribution:")
-        for year in sorted(year_counts.keys()):
-            print(f"Year {year}: {year_counts[year]} records")
-        
+            grades, skipped = normalize_course(course_id, course_entries)
+            skipped_entries += skipped
+            for grade in grades:
+                # track year distribution DONT FORGET PLUS 1
+                year_counts[grade['year']] = year_counts.get(grade['year'], 0) + 1
+                processed_courses.add(grade['course_id'])
+            processed_grades.extend(grades)
+
+        self._print_summary(len(processed_grades), skipped_entries, processed_courses, year_counts)
+
         if processed_courses:
-            self.db.courses.insert_many(
-                [{'course_id': id, 'department': ''.join(filter(str.isalpha, id)), 
-                  'number': int(''.join(filter(str.isdigit, id))), 
-                  'level': (int(''.join(filter(str.isdigit, id))) // 100) * 100} 
-                 for id in processed_courses]
-            )
+            self._insert_courses(processed_courses)
         else:
             return False
+        self.progress(rows_parsed=len(processed_grades))
         if processed_grades:
             self.db.grade_distributions.insert_many(processed_grades)
         else:
             return False
+        self.progress(rows_inserted=len(processed_grades))
+        build_rollups(self.db)
         return True
+
+    def _import_streaming(self, json_file_path: str, batch_size: int) -> bool:
+        """
+        Streaming variant of import_grade_data.
+
+        Grade rows are flushed to MongoDB every batch_size rows, so peak memory
+        is bounded by the batch size and the largest single course rather than
+        by the file size. A malformed file raises ValueError, but batches
+        flushed before the error are left in the database.
+        """
+        processed_courses = set()
+        batch = []
+        total_grades = 0
+        parsed_grades = 0
+        skipped_entries = 0
+        year_counts = {}
+
+        try:
+            for course_id, course_entries in iter_grade_data(json_file_path):
+                grades, skipped = normalize_course(course_id, course_entries)
+                skipped_entries += skipped
+                for grade in grades:
+                    year_counts[grade['year']] = year_counts.get(grade['year'], 0) + 1
+                    processed_courses.add(grade['course_id'])
+                batch.extend(grades)
+                parsed_grades += len(grades)
+                while len(batch) >= batch_size:
+                    self.db.grade_distributions.insert_many(batch[:batch_size])
+                    total_grades += batch_size
+                    batch = batch[batch_size:]
+                    self.progress(rows_parsed=parsed_grades, rows_inserted=total_grades)
+        except (ValueError, FileNotFoundError) as e:
+            raise ValueError(f"Error reading JSON file: {e}")
+
+        if batch:
+            self.db.grade_distributions.insert_many(batch)
+            total_grades += len(batch)
+        self.progress(rows_parsed=parsed_grades, rows_inserted=total_grades)
+
+        self._print_summary(total_grades, skipped_entries, processed_courses, year_counts)
+
+        if not processed_courses:
+            return False
+        self._insert_courses(processed_courses)
+        build_rollups(self.db)
+        return total_grades > 0
+
+    def _insert_courses(self, course_ids) -> None:
+        """Insert one courses document per imported course id."""
+        self.db.courses.insert_many(
+            [{'course_id': id, 'department': ''.join(filter(str.isalpha, id)),
+              'number': int(''.join(filter(str.isdigit, id))),
+              'level': (int(''.join(filter(str.isdigit, id))) // 100) * 100}
+             for id in course_ids]
+        )
+
+    def _print_summary(self, total_grades, skipped_entries, processed_courses, year_counts) -> None:
+        print("\nImport Summary:")
+        print(f"Total entries processed: {total_grades}")
+        print(f"Entries skipped: {skipped_entries}")
+        print(f"Unique courses: {len(processed_courses)}")
+        print("\nYear Distribution:")
+        for year in sorted(year_counts.keys()):
+            print(f"Year {year}: {year_counts[year]} records")
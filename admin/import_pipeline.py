@@ -0,0 +1,236 @@
+"""
+Pipelined Import Module for EasyA Grade Analysis System
+
+Runs a grade data import as three overlapping stages so that large files
+load well within the SRS's five minute update window:
+
+1. Read: the main process streams the data file one course at a time
+   (see iter_grade_data) and groups courses into tasks.
+2. Normalize: a process pool runs the term/year parsing, course id split and
+   float conversion for each task.
+3. Write: a configurable number of writer threads drain a bounded queue of
+   batches with unordered insert_many calls.
+
+Every queue between stages is bounded, so memory stays flat regardless of
+the file size. A per-stage throughput report is printed at the end of a run.
+
+Run from the command line, the file is imported as a new dataset version
+(see DatabaseUpdater.import_versioned), so a rerun replaces the live data
+instead of adding to it.
+"""
+
+import argparse
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from admin.import_data import DataImporter, DEFAULT_BATCH_SIZE, iter_grade_data, normalize_course
+from src.data.db_manager import build_rollups
+
+# Number of courses handed to a parse worker at a time
+DEFAULT_COURSES_PER_TASK = 50
+
+
+def _normalize_task(task: List[Tuple[str, list]]):
+    """
+    Normalize a group of courses in a worker process.
+
+    Returns:
+        Tuple of (grade rows, skipped entries, raw entries seen, seconds spent)
+    """
+    start = time.perf_counter()
+    rows = []
+    skipped_entries = 0
+    raw_entries = 0
+    for course_id, course_entries in task:
+        grades, skipped = normalize_course(course_id, course_entries)
+        rows.extend(grades)
+        skipped_entries += skipped
+        raw_entries += len(course_entries) if isinstance(course_entries, list) else 1
+    return rows, skipped_entries, raw_entries, time.perf_counter() - start
+
+
+class StageTimer:
+    """Accumulates rows handled and busy time for one pipeline stage."""
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, rows: int, seconds: float) -> None:
+        with self._lock:
+            self.rows += rows
+            self.seconds += seconds
+
+    def rate(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class PipelinedImporter(DataImporter):
+    def __init__(self, db_manager, parse_workers: int = None, writer_threads: int = 2,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 courses_per_task: int = DEFAULT_COURSES_PER_TASK):
+        """
+        Initialize the pipelined importer.
+
+        Args:
+            db_manager: Instance of DatabaseManager that provides access to MongoDB collections
+            parse_workers: Number of normalize processes (defaults to the CPU count)
+            writer_threads: Number of threads issuing insert_many batches
+            batch_size: Number of rows per insert_many call
+            courses_per_task: Number of courses sent to a parse worker at a time
+        """
+        super().__init__(db_manager)
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.writer_threads = max(1, writer_threads)
+        self.batch_size = batch_size
+        self.courses_per_task = courses_per_task
+
+    def import_grade_data(self, json_file_path: str) -> bool:
+        """
+        Import grade distribution data through the read/normalize/write pipeline.
+
+        Args:
+            json_file_path: Path to the .js or .json data file
+
+        Returns:
+            True if courses and grade rows were imported, otherwise False
+        """
+        read_stage = StageTimer("Read")
+        parse_stage = StageTimer("Normalize")
+        write_stage = StageTimer("Write")
+
+        # at most two batches per writer wait in memory at any time
+        batches = queue.Queue(maxsize=self.writer_threads * 2)
+        write_errors = []
+        writers = [
+            threading.Thread(target=self._write_batches, args=(batches, write_stage, write_errors), daemon=True)
+            for _ in range(self.writer_threads)
+        ]
+        for writer in writers:
+            writer.start()
+
+        processed_courses = set()
+        year_counts = {}
+        skipped_entries = 0
+        pending_rows = []
+        in_flight = deque()
+        max_in_flight = self.parse_workers * 2
+        started = time.perf_counter()
+
+        def collect(future):
+            nonlocal skipped_entries, pending_rows
+            rows, skipped, raw_entries, seconds = future.result()
+            parse_stage.add(raw_entries, seconds)
+            skipped_entries += skipped
+            for grade in rows:
+                year_counts[grade['year']] = year_counts.get(grade['year'], 0) + 1
+                processed_courses.add(grade['course_id'])
+            pending_rows.extend(rows)
+            while len(pending_rows) >= self.batch_size:
+                batches.put(pending_rows[:self.batch_size])
+                pending_rows = pending_rows[self.batch_size:]
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+                task = []
+                task_entries = 0
+                read_start = time.perf_counter()
+                try:
+                    for course_id, course_entries in iter_grade_data(json_file_path):
+                        task.append((course_id, course_entries))
+                        task_entries += len(course_entries) if isinstance(course_entries, list) else 1
+                        if len(task) < self.courses_per_task:
+                            continue
+                        read_stage.add(task_entries, time.perf_counter() - read_start)
+                        in_flight.append(pool.submit(_normalize_task, task))
+                        task, task_entries = [], 0
+                        while len(in_flight) >= max_in_flight:
+                            collect(in_flight.popleft())
+                        read_start = time.perf_counter()
+                except (ValueError, FileNotFoundError) as e:
+                    raise ValueError(f"Error reading JSON file: {e}")
+                if task:
+                    read_stage.add(task_entries, time.perf_counter() - read_start)
+                    in_flight.append(pool.submit(_normalize_task, task))
+                while in_flight:
+                    collect(in_flight.popleft())
+            if pending_rows:
+                batches.put(pending_rows)
+        finally:
+            for _ in writers:
+                batches.put(None)
+            for writer in writers:
+                writer.join()
+
+        if write_errors:
+            raise write_errors[0]
+
+        elapsed = time.perf_counter() - started
+        self._print_summary(write_stage.rows, skipped_entries, processed_courses, year_counts)
+        self._print_throughput([read_stage, parse_stage, write_stage], write_stage.rows, elapsed)
+
+        if not processed_courses:
+            return False
+        self._insert_courses(processed_courses)
+        build_rollups(self.db)
+        return write_stage.rows > 0
+
+    def _write_batches(self, batches: queue.Queue, write_stage: StageTimer, write_errors: list) -> None:
+        """Writer thread body: insert queued batches until a None sentinel arrives."""
+        while True:
+            batch = batches.get()
+            if batch is None:
+                return
+            if write_errors:
+                continue  # drain the queue so the producer never blocks
+            start = time.perf_counter()
+            try:
+                self.db.grade_distributions.insert_many(batch, ordered=False)
+            except Exception as e:
+                write_errors.append(e)
+                continue
+            write_stage.add(len(batch), time.perf_counter() - start)
+
+    def _print_throughput(self, stages: List[StageTimer], total_rows: int, elapsed: float) -> None:
+        print("\nThroughput:")
+        for stage in stages:
+            print(f"{stage.name}: {stage.rows} rows in {stage.seconds:.2f}s busy "
+                  f"({stage.rate():,.0f} rows/sec)")
+        overall = total_rows / elapsed if elapsed else 0.0
+        print(f"Overall: {total_rows} rows in {elapsed:.2f}s ({overall:,.0f} rows/sec) "
+              f"with {self.parse_workers} parse workers and {self.writer_threads} writer threads")
+
+
+def main():
+    from src.data.db_manager import DatabaseManager
+    from admin.update_db import DatabaseUpdater
+
+    parser = argparse.ArgumentParser(description="Import a gradedata.js/.json file with the parallel pipeline.")
+    parser.add_argument("file", help="Path to the grade data file")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parse processes")
+    parser.add_argument("--writers", type=int, default=2, help="Number of writer threads")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per insert_many")
+    args = parser.parse_args()
+
+    def load(collections):
+        importer = PipelinedImporter(collections, parse_workers=args.workers,
+                                     writer_threads=args.writers, batch_size=args.batch_size)
+        return importer.import_grade_data(args.file)
+
+    updater = DatabaseUpdater(DatabaseManager())
+    version = updater.import_versioned(args.file, load=load)
+    if version is None:
+        print("Data import failed.")
+        return
+    updater.write_snapshot()
+    print(f"Imported dataset version {version}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# admin/jobs.py
+
+"""
+Background Job Runner for the EasyA Admin Tool
+
+Imports, faculty scraping and name resolution take minutes. Running them on
+the Tk main loop froze the admin window, so they run as jobs on worker
+threads instead:
+
+- A job is a function taking a Job; it reports progress by calling
+  job.progress(rows_inserted=..., names_resolved=...) with any counters.
+- Progress, results and errors travel back through a queue that the UI drains
+  from the Tk main loop (JobRunner.attach schedules this with root.after), so
+  callbacks always run on the UI thread and may touch widgets.
+- Cancellation is cooperative: JobRunner.cancel sets the job's event and the
+  job's next progress report raises JobCancelled inside the worker.
+- Every job declares the collections (or files) it touches; a job is rejected
+  with JobConflict while another running job holds any of them.
+"""
+
+import queue
+import threading
+import traceback
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# How often the UI drains the event queue
+POLL_INTERVAL_MS = 100
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it was cancelled."""
+
+
+class JobConflict(Exception):
+    """Raised when a job would touch resources held by a running job."""
+
+
+class Job:
+    def __init__(self, name: str, resources: Iterable[str], events: queue.Queue):
+        """
+        Args:
+            name: Display name (e.g., "Import data")
+            resources: Collections or files the job reads or writes
+            events: Queue the job posts its progress to
+        """
+        self.name = name
+        self.resources = frozenset(resources)
+        self.counters: Dict[str, Any] = {}
+        self._events = events
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def check_cancelled(self) -> None:
+        """Raise JobCancelled if the job was cancelled."""
+        if self._cancel.is_set():
+            raise JobCancelled(self.name)
+
+    def progress(self, **counters) -> None:
+        """
+        Report progress counters (merged into the job's running totals) and
+        stop the job here if it was cancelled.
+        """
+        self.check_cancelled()
+        self._events.put(("progress", self, dict(counters)))
+
+
+class JobRunner:
+    def __init__(self):
+        self._events: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._running: List[Job] = []
+        self._callbacks: Dict[Job, Dict[str, Optional[Callable]]] = {}
+
+    def submit(self, name: str, resources: Iterable[str], function: Callable[[Job], Any],
+               on_progress: Optional[Callable[[Job, Dict[str, Any]], None]] = None,
+               on_done: Optional[Callable[[Job, Any], None]] = None,
+               on_error: Optional[Callable[[Job, BaseException], None]] = None) -> Job:
+        """
+        Start function(job) on a worker thread.
+
+        Callbacks run on the thread that calls poll (the Tk main loop):
+        on_progress(job, counters) after each report, on_done(job, result) when
+        the function returns, on_error(job, exception) when it raises
+        (including JobCancelled).
+
+        Raises:
+            JobConflict: if a running job holds any of the resources
+        """
+        job = Job(name, resources, self._events)
+        with self._lock:
+            for running in self._running:
+                shared = running.resources & job.resources
+                if shared:
+                    raise JobConflict(f"{running.name} is still running and uses {', '.join(sorted(shared))}")
+            self._running.append(job)
+            self._callbacks[job] = {"progress": on_progress, "done": on_done, "error": on_error}
+
+        def work():
+            try:
+                self._events.put(("done", job, function(job)))
+            except BaseException as error:
+                self._events.put(("error", job, error))
+
+        threading.Thread(target=work, name=f"job-{name}", daemon=True).start()
+        return job
+
+    def running(self) -> List[Job]:
+        with self._lock:
+            return list(self._running)
+
+    def cancel(self, job: Optional[Job] = None) -> None:
+        """Cancel one job, or every running job."""
+        for running in ([job] if job else self.running()):
+            running.cancel()
+
+    def poll(self) -> int:
+        """
+        Deliver queued events to the job callbacks on the calling thread.
+
+        Returns:
+            Number of events delivered
+        """
+        delivered = 0
+        while True:
+            try:
+                kind, job, payload = self._events.get_nowait()
+            except queue.Empty:
+                return delivered
+            delivered += 1
+            if kind == "progress":
+                job.counters.update(payload)
+            else:
+                with self._lock:
+                    self._running.remove(job)
+            callback = self._callbacks[job][kind]
+            if kind != "progress":
+                del self._callbacks[job]
+            if callback:
+                try:
+                    callback(job, payload)
+                except Exception:
+                    # Report it like Tk reports a failing callback, but keep
+                    # delivering the events of this and other jobs
+                    traceback.print_exc()
+
+    def attach(self, root, interval_ms: int = POLL_INTERVAL_MS) -> None:
+        """Drain the event queue from the Tk main loop every interval_ms."""
+        def tick():
+            self.poll()
+            root.after(interval_ms, tick)
+        root.after(interval_ms, tick)
@@ -2,30 +2,44 @@ import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import subprocess
-from src.data.db_manager import DatabaseManager
-from admin.import_data import DataImporter
+from src.data.db_manager import DatabaseManager, DATASET_COLLECTIONS
+from admin.update_db import DatabaseUpdater
+from admin.migrate_db import migrate_database
 import admin.scrape_faculty
+from admin.scrape_faculty import FACULTY_DATASET_PATH
 from admin.resolve_discrepancies import NameStandardizer
+from admin.jobs import JobRunner, JobCancelled, JobConflict
 
-# Initialize database manager and data importer
+# Initialize database manager and dataset updater
 db = DatabaseManager()
-importer = DataImporter(db)
+updater = DatabaseUpdater(db)
+
+# What each admin job touches; jobs sharing any of these never run together
+DATASET_RESOURCES = set(DATASET_COLLECTIONS) | {"dataset_versions", "dataset_meta", "snapshot"}
+RESOLVE_RESOURCES = {"grade_distributions", "grade_rollups", "dataset_meta", "snapshot", "faculty_list"}
+SCRAPE_RESOURCES = {"faculty_list"}
 
 class AdminWindow:
     """
     GUI application for selecting data files and initiating faculty scraping.
+    Long operations run as background jobs (see admin/jobs.py), so the window
+    stays responsive and shows their progress.
     """
     def __init__(self, root):
         self.root = root
 
         self.root.title("File Selector App")
-        self.root.geometry("300x200")
+        self.root.geometry("300x340")
 
         self.root.configure(bg="#FFFFFF")
         
         self.style = ttk.Style()
         self.configure_styles()
         
+        # background jobs, polled from the Tk main loop
+        self.jobs = JobRunner()
+        self.jobs.attach(root)
+        
         # select a data file
         self.select_button = ttk.Button(root, text="Select Data", command=self.select_file)
         self.select_button.pack(pady=10)
@@ -37,6 +51,18 @@ class AdminWindow:
         # resolve discrepancies
         self.resolve_button = ttk.Button(root, text="Resolve Discrepancies", command=self.run_resolve_discrepancies)
         self.resolve_button.pack(pady=10)
+        
+        # roll back to the previous dataset version
+        self.rollback_button = ttk.Button(root, text="Roll Back Data", command=self.rollback_data)
+        self.rollback_button.pack(pady=10)
+        
+        # cancel running jobs
+        self.cancel_button = ttk.Button(root, text="Cancel", command=self.jobs.cancel, state=tk.DISABLED)
+        self.cancel_button.pack(pady=5)
+        
+        # progress of running jobs
+        self.status_var = tk.StringVar(value="Idle")
+        ttk.Label(root, textvariable=self.status_var, background="#FFFFFF", wraplength=280).pack(pady=5)
     
     def configure_styles(self):
         """Configures the styles for UI elements."""
@@ -46,44 +72,106 @@ class AdminWindow:
         self.style.configure("TCheckbutton", font=("Helvetica", 14, "bold"), foreground="black")
         self.style.map("TButton", foreground=[("active", "#FFFFFF")], background=[("active", "#4CAF50")])
     
+    def run_job(self, name, resources, button, work, on_done):
+        """
+        Runs work(job) in the background while button shows "Working...".
+        on_done(result) runs on the UI thread when the job finishes.
+        """
+        label = button.cget("text")
+
+        def finish():
+            button.config(text=label)
+            if not self.jobs.running():
+                self.cancel_button.config(state=tk.DISABLED)
+                self.status_var.set("Idle")
+
+        try:
+            self.jobs.submit(name, resources, work, on_progress=self.show_progress,
+                             on_done=lambda job, result: (finish(), on_done(result)),
+                             on_error=lambda job, error: (finish(), self.show_error(job, error)))
+        except JobConflict as conflict:
+            messagebox.showinfo(name, f"Please wait: {conflict}.")
+            return
+
+        button.config(text="Working...")
+        self.cancel_button.config(state=tk.NORMAL)
+        self.status_var.set(f"{name}: started")
+    
+    def show_progress(self, job, counters):
+        """Shows the running totals reported by a job."""
+        details = ", ".join(f"{key.replace('_', ' ')}: {value}" for key, value in job.counters.items())
+        self.status_var.set(f"{job.name}: {details}")
+    
+    def show_error(self, job, error):
+        if isinstance(error, JobCancelled):
+            messagebox.showinfo(job.name, f"{job.name} was cancelled.")
+        else:
+            messagebox.showerror(job.name, f"{job.name} failed: {error}")
+    
     def select_file(self):
-        """Opens a file dialog to select a data file and imports the data."""
+        """
+        Opens a file dialog to select a data file and imports it as a new
+        dataset version. The data is loaded into shadow collections and swapped
+        in when complete, so the student window never sees a half-loaded dataset.
+        """
         file_path = filedialog.askopenfilename()
-        if file_path:
-            # Clear existing data in the database before importing new data
-            db.courses.delete_many({})
-            db.instructors.delete_many({})
-            db.grade_distributions.delete_many({})
-            
-            print(f"Selected file: {file_path}")
-            status = importer.import_grade_data(file_path)
-            
-            if status:
-                messagebox.showinfo("Data Import", "Data imported successfully.")
+        if not file_path:
+            return
+        print(f"Selected file: {file_path}")
+
+        def work(job):
+            version = updater.import_versioned(file_path, progress=job.progress)
+            if version:
+                updater.write_snapshot()
+            return version
+
+        def done(version):
+            if version:
+                messagebox.showinfo("Data Import", f"Data imported successfully (version {version}).")
             else:
                 messagebox.showinfo("Data Import", "Data import failed.")
+
+        self.run_job("Data Import", DATASET_RESOURCES, self.select_button, work, done)
+    
+    def rollback_data(self):
+        """Swaps the most recently archived dataset version back in."""
+        def work(job):
+            version = updater.rollback()
+            if version:
+                updater.write_snapshot()
+            return version
+
+        def done(version):
+            if version:
+                messagebox.showinfo("Roll Back", f"Restored dataset version {version}.")
+            else:
+                messagebox.showinfo("Roll Back", "No archived dataset version to restore.")
+
+        self.run_job("Roll Back", DATASET_RESOURCES, self.rollback_button, work, done)
     
     def scrape_faculty(self):
         """Triggers faculty data scraping."""
-        self.print_button.config(text="Working...")
         print("Faculty scraping initiated.")
-        print("Working...")
-        admin.scrape_faculty.main()
-        self.print_button.config(text="Scrape for faculty")
-        print("Scrape for faculty complete")
+        self.run_job("Faculty Scrape", SCRAPE_RESOURCES, self.print_button,
+                     lambda job: admin.scrape_faculty.main(progress=job.progress),
+                     lambda result: print("Scrape for faculty complete"))
     
     def run_resolve_discrepancies(self):
         """Runs the resolve_discrepancies.py script."""
-        self.resolve_button.config(text="Working...")
-        print("Working (this will take some time)...")
-        standardizer = NameStandardizer("faculty_list.txt")
-        standardizer.update_db_instructors()
-        print("DONE.")
-        self.resolve_button.config(text="Resolve Discrepancies")
+        def work(job):
+            standardizer = NameStandardizer("faculty_list.txt", db, faculty_dataset_path=FACULTY_DATASET_PATH)
+            standardizer.update_db_instructors(progress=job.progress)
+            updater.write_snapshot()
+
+        self.run_job("Resolve Discrepancies", RESOLVE_RESOURCES, self.resolve_button, work,
+                     lambda result: print("DONE."))
     
         
 
 def main():
+    # Backfill course fields on data imported before grade rows carried them
+    migrate_database(db)
+
     root = tk.Tk()
     app = AdminWindow(root)
     root.mainloop()
@@ -0,0 +1,157 @@
+# admin/migrate_db.py
+
+"""
+Schema Migration for EasyA Grade Analysis System
+
+Grade rows used to store only course_id, so any filter on department or level
+needed the courses collection; QueryBuilder.build_level_comparison_query
+matched those fields on grade_distributions directly and found nothing.
+Since the denormalized schema every grade row carries its course's
+department, number and level, and the rollups are built from those fields
+without a $lookup.
+
+This module backfills those fields on databases imported before the change,
+as well as the term_ordinal that term range filters use.
+It updates the live dataset and every archived dataset version, so rolling
+back never brings rows without course fields back. Rows that already carry
+the fields are left alone, which makes the migration safe to run repeatedly;
+the admin tool runs it on startup.
+
+Rollup cells built before the cells carried sums of squares, minimums,
+maximums, enrollment-weighted sums and percent histograms are rebuilt from
+the grade rows, so the statistics group_stats and group_percentiles return
+are available for every version. Datasets imported before rollups existed at
+all get them built the same way.
+
+Usage:
+    python -m admin.migrate_db
+"""
+
+import time
+from pymongo import UpdateMany
+from src.data.db_manager import DatabaseManager, build_rollups
+from src.utils.helpers import split_course_id, term_ordinal
+from admin.update_db import DatabaseUpdater, ShadowCollections
+
+# Rows that still need their course fields
+MISSING_COURSE_FIELDS = {"department": {"$exists": False}}
+
+# Rows that still need their term ordinal
+MISSING_TERM_ORDINAL = {"term_ordinal": {"$exists": False}}
+
+# Rollup cells from before the cells carried a term ordinal (the newest cell
+# field; cells that have it also have the histograms, variance and
+# enrollment sums)
+OUTDATED_ROLLUP_CELLS = {"term_ordinal": {"$exists": False}}
+
+
+def backfill_course_fields(grade_distributions) -> int:
+    """
+    Set department, number and level on grade rows that lack them.
+    One UpdateMany per course is sent in a single unordered bulk write.
+
+    Args:
+        grade_distributions: Grade distribution collection to migrate
+
+    Returns:
+        Number of rows updated
+    """
+    operations = []
+    for course_id in grade_distributions.distinct("course_id", MISSING_COURSE_FIELDS):
+        course = split_course_id(course_id)
+        if course is None:
+            print(f"Warning: Invalid course number for {course_id}")
+            continue
+        department, number, level = course
+        operations.append(UpdateMany(
+            dict(MISSING_COURSE_FIELDS, course_id=course_id),
+            {"$set": {"department": department, "number": number, "level": level}}
+        ))
+    if not operations:
+        return 0
+    return grade_distributions.bulk_write(operations, ordered=False).modified_count
+
+
+def backfill_term_ordinals(grade_distributions) -> int:
+    """
+    Set term_ordinal on grade rows that lack it.
+    One UpdateMany per (year, term) is sent in a single unordered bulk write.
+
+    Args:
+        grade_distributions: Grade distribution collection to migrate
+
+    Returns:
+        Number of rows updated
+    """
+    terms = grade_distributions.aggregate([
+        {"$match": MISSING_TERM_ORDINAL},
+        {"$group": {"_id": {"year": "$year", "term": "$term"}}}
+    ])
+    operations = [
+        UpdateMany(dict(MISSING_TERM_ORDINAL, year=t["_id"]["year"], term=t["_id"]["term"]),
+                   {"$set": {"term_ordinal": term_ordinal(t["_id"]["term"], t["_id"]["year"])}})
+        for t in terms
+    ]
+    if not operations:
+        return 0
+    return grade_distributions.bulk_write(operations, ordered=False).modified_count
+
+
+def needs_migration(grade_distributions) -> bool:
+    """Check for rows without course fields (served by the department index) or a term ordinal."""
+    return any(grade_distributions.find_one(condition, {"_id": 1}) is not None
+               for condition in (MISSING_COURSE_FIELDS, MISSING_TERM_ORDINAL))
+
+
+def needs_rollup_rebuild(grade_rollups, grade_distributions) -> bool:
+    """
+    Check for rollup cells written in an older format (see
+    OUTDATED_ROLLUP_CELLS), or grade rows without any rollup cells.
+    """
+    if grade_rollups.estimated_document_count() == 0:
+        return grade_distributions.estimated_document_count() > 0
+    return grade_rollups.find_one(OUTDATED_ROLLUP_CELLS, {"_id": 1}) is not None
+
+
+def migrate_database(db_manager) -> int:
+    """
+    Backfill course fields on the live dataset and all archived versions, and
+    rebuild rollups whose cells are in an outdated format or missing. Rollups
+    built before the course fields migration already hold those fields (they
+    were joined from courses at build time), so backfilling alone never
+    requires a rebuild; datasets imported before rollups existed have none
+    and get them built here.
+
+    Args:
+        db_manager: DatabaseManager for the database to migrate
+
+    Returns:
+        Number of rows updated across all versions
+    """
+    targets = [("live", db_manager)]
+    for record in DatabaseUpdater(db_manager).list_versions(include_live=False):
+        targets.append((record["_id"], ShadowCollections(db_manager.db, record["_id"])))
+
+    updated = 0
+    for label, collections in targets:
+        if needs_migration(collections.grade_distributions):
+            start = time.perf_counter()
+            count = backfill_course_fields(collections.grade_distributions)
+            count += backfill_term_ordinals(collections.grade_distributions)
+            print(f"Migrated {count} grade rows in {label} dataset ({time.perf_counter() - start:.2f}s)")
+            updated += count
+        if needs_rollup_rebuild(collections.grade_rollups, collections.grade_distributions):
+            start = time.perf_counter()
+            build_rollups(collections)
+            print(f"Rebuilt rollups of {label} dataset ({time.perf_counter() - start:.2f}s)")
+    db_manager.cache.invalidate(db_manager.get_generation())
+    return updated
+
+
+def main():
+    updated = migrate_database(DatabaseManager())
+    print(f"Migration complete: {updated} grade rows updated.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+# admin/name_resolution.py
+
+"""
+Instructor Name Resolution for EasyA Grade Analysis System
+
+Matches instructor names from gradedata.js ("Last, First M.") against the
+scraped faculty lists ("First M. Last"), tolerating formatting differences,
+accents, missing or extra middle initials and small spelling variations,
+without comparing every grade name against every faculty name.
+
+How it works:
+1. Every name is parsed into normalized (first, middles, last) parts.
+2. Blocking: faculty names are grouped by a blocking key of the Soundex code of
+   the last name plus the first initial. A grade name is only scored against
+   the faculty names in its own block, so "Li" is never compared with
+   "Lincoln" and the work grows with the block sizes, not with N x M.
+3. Scoring: within a block, last and first names are compared with a
+   Levenshtein distance computed for all (grade, faculty) pairs at once with
+   NumPy, and combined into a similarity between 0 and 1.
+4. The best candidate per grade name is classified against the confidence
+   thresholds (match / review / unmatched) and returned as a ranked report.
+
+Usage:
+    python -m admin.name_resolution [faculty_list.txt]
+"""
+
+import sys
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Best candidates scoring at least this are accepted as the same person
+MATCH_THRESHOLD = 0.9
+
+# Best candidates scoring at least this (but below MATCH_THRESHOLD) are
+# reported for manual review
+REVIEW_THRESHOLD = 0.75
+
+# Weights of the last and first name similarities in the score
+LAST_NAME_WEIGHT = 0.6
+FIRST_NAME_WEIGHT = 0.4
+
+# Subtracted when both names carry middle initials and they differ
+MIDDLE_MISMATCH_PENALTY = 0.15
+
+# Upper bound on pair x character cells per edit-distance batch, to cap memory
+MAX_BATCH_CELLS = 4_000_000
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"), **dict.fromkeys("dt", "3"),
+    "l": "4", **dict.fromkeys("mn", "5"), "r": "6",
+}
+
+
+class ParsedName(NamedTuple):
+    first: str
+    middles: Tuple[str, ...]
+    last: str
+
+
+class NameMatch(NamedTuple):
+    grade_name: str
+    faculty_name: Optional[str]
+    score: float
+    status: str  # "match", "review" or "unmatched"
+
+
+def _normalize_token(token: str) -> str:
+    """Lowercase, strip accents and keep only letters and hyphens."""
+    token = unicodedata.normalize("NFKD", token)
+    return "".join(c for c in token.lower() if c.isalpha() or c == "-")
+
+
+def parse_name(name: str) -> ParsedName:
+    """
+    Parse a grade data ("Last, First M.") or faculty list ("First M. Last")
+    name into normalized parts. A name without a comma and only one word is
+    treated as a last name.
+    """
+    if "," in name:
+        last, rest = name.split(",", 1)
+        tokens = [_normalize_token(t) for t in rest.replace(",", " ").split()]
+        tokens = [t for t in tokens if t]
+        last = "".join(_normalize_token(t) for t in last.split())
+        first, middles = (tokens[0], tuple(tokens[1:])) if tokens else ("", ())
+        return ParsedName(first, middles, last)
+
+    tokens = [t for t in (_normalize_token(t) for t in name.split()) if t]
+    if not tokens:
+        return ParsedName("", (), "")
+    if len(tokens) == 1:
+        return ParsedName("", (), tokens[0])
+    return ParsedName(tokens[0], tuple(tokens[1:-1]), tokens[-1])
+
+
+def soundex(word: str) -> str:
+    """American Soundex code of a word (e.g., "Robert" -> "R163")."""
+    letters = [c for c in word.lower() if c.isalpha()]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for letter in letters[1:]:
+        digit = _SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def blocking_key(name: ParsedName) -> Tuple[str, str]:
+    """Soundex of the last name plus the first initial ("" if there is no first name)."""
+    return soundex(name.last), name.first[:1]
+
+
+def _encode(strings: List[str], fill: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack strings into a padded code point matrix and a length vector."""
+    lengths = np.array([len(s) for s in strings], dtype=np.int64)
+    codes = np.full((len(strings), max(int(lengths.max(initial=0)), 1)), fill, dtype=np.int32)
+    for row, string in enumerate(strings):
+        codes[row, :len(string)] = [ord(c) for c in string]
+    return codes, lengths
+
+
+def edit_distances(queries: List[str], candidates: List[str]) -> np.ndarray:
+    """
+    Levenshtein distances between every query and every candidate.
+
+    All pairs are advanced through the dynamic program together, one query
+    character at a time; the insertion step along a row is resolved with a
+    running minimum, so there is no Python loop over candidate characters.
+
+    Returns:
+        int array of shape (len(queries), len(candidates))
+    """
+    if not queries or not candidates:
+        return np.zeros((len(queries), len(candidates)), dtype=np.int64)
+
+    query_codes, query_lengths = _encode(queries, -1)
+    candidate_codes, candidate_lengths = _encode(candidates, -2)
+    steps = np.arange(candidate_codes.shape[1] + 1)
+    pairs = np.arange(len(candidates))
+
+    result = np.empty((len(queries), len(candidates)), dtype=np.int64)
+    result[query_lengths == 0] = candidate_lengths
+    rows = np.broadcast_to(steps, (len(queries), len(candidates), len(steps))).copy()
+    for i in range(query_codes.shape[1]):
+        cost = candidate_codes[None, :, :] != query_codes[:, i, None, None]
+        best = np.empty_like(rows)
+        best[..., 0] = i + 1
+        best[..., 1:] = np.minimum(rows[..., 1:] + 1, rows[..., :-1] + cost)
+        rows = np.minimum.accumulate(best - steps, axis=-1) + steps
+        done = query_lengths == i + 1
+        if done.any():
+            result[done] = rows[done][:, pairs, candidate_lengths]
+    return result
+
+
+def _similarity(distances: np.ndarray, left: List[str], right: List[str]) -> np.ndarray:
+    """Turn edit distances into 0..1 similarities relative to the longer string."""
+    longest = np.maximum.outer(np.array([len(s) for s in left]), np.array([len(s) for s in right]))
+    return 1.0 - distances / np.maximum(longest, 1)
+
+
+class MatchReport:
+    """Best faculty candidate for every grade name, ranked by score."""
+    def __init__(self, results: List[NameMatch]):
+        self.results = sorted(results, key=lambda r: (-r.score, r.grade_name))
+
+    def _with_status(self, status):
+        return [r for r in self.results if r.status == status]
+
+    @property
+    def matches(self) -> List[NameMatch]:
+        return self._with_status("match")
+
+    @property
+    def review(self) -> List[NameMatch]:
+        return self._with_status("review")
+
+    @property
+    def unmatched(self) -> List[NameMatch]:
+        return self._with_status("unmatched")
+
+    def summary(self) -> str:
+        return (f"{len(self.results)} names: {len(self.matches)} matched, "
+                f"{len(self.review)} to review, {len(self.unmatched)} unmatched")
+
+    def lines(self, statuses: Iterable[str] = ("match", "review")) -> List[str]:
+        """Formatted report lines for the given statuses, best scores first."""
+        return [f"{r.score:5.2f}  {r.status:<9} {r.grade_name} -> {r.faculty_name or '-'}"
+                for r in self.results if r.status in statuses]
+
+
+class NameResolver:
+    def __init__(self, faculty_names: Iterable[str],
+                 match_threshold: float = MATCH_THRESHOLD,
+                 review_threshold: float = REVIEW_THRESHOLD):
+        """
+        Build the blocking index for a faculty list (e.g., several years of
+        scraped faculty merged together). Duplicate names are kept once.
+
+        Args:
+            faculty_names: Faculty names in "First M. Last" format
+            match_threshold: Minimum score for an accepted match
+            review_threshold: Minimum score for a match that needs review
+        """
+        self.match_threshold = match_threshold
+        self.review_threshold = review_threshold
+        self.blocks: Dict[Tuple[str, str], List[Tuple[str, ParsedName]]] = defaultdict(list)
+        self.blocks_by_soundex: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for faculty_name in dict.fromkeys(faculty_names):
+            parsed = parse_name(faculty_name)
+            if not parsed.last:
+                continue
+            key = blocking_key(parsed)
+            if key not in self.blocks:
+                self.blocks_by_soundex[key[0]].append(key)
+            self.blocks[key].append((faculty_name, parsed))
+
+    def _candidates(self, key: Tuple[str, str]) -> List[Tuple[str, ParsedName]]:
+        """Faculty in a block; a grade name without a first name checks every initial."""
+        if key[1]:
+            return self.blocks.get(key, []) + self.blocks.get((key[0], ""), [])
+        return [entry for block in self.blocks_by_soundex.get(key[0], []) for entry in self.blocks[block]]
+
+    def _score_block(self, queries: List[ParsedName], candidates: List[ParsedName]) -> np.ndarray:
+        """Score every (query, candidate) pair of one block."""
+        last_q, last_c = [q.last for q in queries], [c.last for c in candidates]
+        last_sim = _similarity(edit_distances(last_q, last_c), last_q, last_c)
+
+        first_q, first_c = [q.first for q in queries], [c.first for c in candidates]
+        first_sim = _similarity(edit_distances(first_q, first_c), first_q, first_c)
+        # an initial or a missing first name agrees with any first name it could stand for
+        short = np.logical_or.outer(np.array([len(f) <= 1 for f in first_q]),
+                                    np.array([len(f) <= 1 for f in first_c]))
+        initials_agree = np.equal.outer(np.array([f[:1] for f in first_q]), np.array([f[:1] for f in first_c]))
+        missing = np.logical_or.outer(np.array([not f for f in first_q]), np.array([not f for f in first_c]))
+        first_sim = np.where(short, (initials_agree | missing).astype(float), first_sim)
+
+        middle_q = np.array([q.middles[0][:1] if q.middles else "" for q in queries])
+        middle_c = np.array([c.middles[0][:1] if c.middles else "" for c in candidates])
+        conflict = (np.not_equal.outer(middle_q, middle_c)
+                    & (middle_q != "")[:, None] & (middle_c != "")[None, :])
+
+        return LAST_NAME_WEIGHT * last_sim + FIRST_NAME_WEIGHT * first_sim - MIDDLE_MISMATCH_PENALTY * conflict
+
+    def _status(self, score: float) -> str:
+        if score >= self.match_threshold:
+            return "match"
+        if score >= self.review_threshold:
+            return "review"
+        return "unmatched"
+
+    def resolve(self, grade_names: Iterable[str]) -> MatchReport:
+        """
+        Find the best faculty candidate for every distinct grade data name.
+
+        Args:
+            grade_names: Instructor names from the grade data
+
+        Returns:
+            MatchReport ranked by score
+        """
+        queries = defaultdict(list)
+        for grade_name in dict.fromkeys(grade_names):
+            parsed = parse_name(grade_name)
+            queries[blocking_key(parsed)].append((grade_name, parsed))
+
+        results = []
+        for key, block_queries in queries.items():
+            candidates = self._candidates(key) if key[0] else []
+            if not candidates:
+                results += [NameMatch(name, None, 0.0, "unmatched") for name, _ in block_queries]
+                continue
+            longest = max(len(c.last) + len(c.first) for _, c in candidates) + 1
+            chunk = max(1, MAX_BATCH_CELLS // (len(candidates) * longest))
+            for start in range(0, len(block_queries), chunk):
+                part = block_queries[start:start + chunk]
+                scores = self._score_block([q for _, q in part], [c for _, c in candidates])
+                best = scores.argmax(axis=1)
+                for (grade_name, _), index, score in zip(part, best, scores[np.arange(len(part)), best]):
+                    score = round(float(score), 4)
+                    status = self._status(score)
+                    faculty_name = candidates[index][0] if status != "unmatched" else None
+                    results.append(NameMatch(grade_name, faculty_name, score, status))
+        return MatchReport(results)
+
+
+def main():
+    from src.data.db_manager import DatabaseManager
+    from admin.resolve_discrepancies import NameStandardizer
+
+    faculty_path = sys.argv[1] if len(sys.argv) > 1 else "faculty_list.txt"
+    db = DatabaseManager()
+    faculty_names = NameStandardizer(faculty_path, db).faculty_list
+    report = NameResolver(faculty_names).resolve(db.grade_distributions.distinct("instructor_name"))
+    print("\n".join(report.lines()))
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,92 @@
+import json
+import os
+import time
+from pymongo import UpdateMany
 from src.data.db_manager import DatabaseManager
+from src.utils.helpers import academic_year
+
+# Names resolved between progress reports
+PROGRESS_EVERY = 500
+
+
+class FacultyIndex:
+    """
+    Lookup table for regular faculty names, built once per faculty list.
+
+    Faculty are keyed by (first, last); each key holds the set of middle
+    names/initials seen for it ("" for faculty listed without one). A lookup
+    is then a single dictionary probe with the same result as comparing the
+    name against every faculty entry with NameStandardizer.compare_names:
+    first and last must match, and middles only matter when both names have one.
+    """
+    def __init__(self, name_tuples):
+        """
+        Args:
+            name_tuples: Standardized (first, middle, last) faculty tuples,
+                         as returned by NameStandardizer.format_name_tuple
+        """
+        self.middles = {}
+        for name in name_tuples:
+            if name:
+                first, middle, last = name
+                self.middles.setdefault((first, last), set()).add(middle)
+
+    def __len__(self):
+        return len(self.middles)
+
+    def contains(self, name_tuple) -> bool:
+        """Return True if a standardized name matches any faculty entry."""
+        if not name_tuple:
+            return False
+        first, middle, last = name_tuple
+        middles = self.middles.get((first, last))
+        if not middles:
+            return False
+        return not middle or "" in middles or middle in middles
+
 
 class NameStandardizer:
-    def __init__(self, faculty_list_path: str):
+    def __init__(self, faculty_list_path: str, db_manager=None, faculty_dataset_path=None):
         """
         Initialize the NameStandardizer with the faculty list.
 
         Args:
             faculty_list_path: Path to the faculty list file.
+            db_manager: Optional DatabaseManager to update, defaults to a new
+                        connection to the local database.
+            faculty_dataset_path: Optional year-tagged faculty dataset written by
+                        scrape_faculty.py. When given (and present), faculty
+                        status is decided per term from the catalog of that
+                        term's academic year instead of from the combined list.
         """
         self.faculty_list = self._load_faculty_names(faculty_list_path)
-        self.db = DatabaseManager()
+        self.faculty_index = self._build_index(self.faculty_list)
+        self.faculty_by_year = {}
+        if faculty_dataset_path and os.path.exists(faculty_dataset_path):
+            with open(faculty_dataset_path, 'r', encoding='utf-8') as file:
+                dataset = json.load(file)
+            self.faculty_by_year = {
+                int(year): self._build_index(name for names in departments.values() for name in names)
+                for year, departments in dataset["faculty"].items()
+            }
+        self.db = db_manager or DatabaseManager()
+
+    def _build_index(self, faculty_names):
+        return FacultyIndex(self.format_name_tuple(self.standardize_faculty_name(faculty))
+                            for faculty in faculty_names)
+
+    def faculty_index_for(self, term=None, year=None):
+        """
+        Return the faculty index that applies to a term.
+        Uses the catalog of the term's academic year, or the nearest scraped
+        year (the earlier one on ties); without a year-tagged dataset or a
+        term, the combined faculty list is used.
+        """
+        if not self.faculty_by_year or term is None or year is None:
+            return self.faculty_index
+        wanted = academic_year(term, year)
+        nearest = min(self.faculty_by_year, key=lambda catalog: (abs(catalog - wanted), catalog))
+        return self.faculty_by_year[nearest]
 
     def _load_faculty_names(self, file_path):
         """Load faculty names from the provided text file."""
@@ -51,24 +128,20 @@ class NameStandardizer:
 
         return first_name, middle_init, last_name
 
-    def is_regular_faculty(self, instructor_name):
+    def is_regular_faculty(self, instructor_name, term=None, year=None):
         """
         Check if an instructor is in the faculty list.
 
         Args:
             instructor_name: Name in "Last, First Middle" format from the database.
+            term: Optional term (e.g., "Fall") to check against that year's faculty.
+            year: Calendar year of term.
 
         Returns:
             Boolean - True if instructor is found in the faculty list, otherwise False.
         """
         standardized_instructor = self.format_name_tuple(self.standardize_instructor_name(instructor_name))
-
-        for faculty in self.faculty_list:
-            standardized_faculty = self.format_name_tuple(self.standardize_faculty_name(faculty))
-            if self.compare_names(standardized_instructor, standardized_faculty):
-                return True  # Found in faculty list
-
-        return False  # Not in faculty list
+        return self.faculty_index_for(term, year).contains(standardized_instructor)
 
     def format_name_tuple(self, name_tuple):
         """Convert name tuple into a standardized format."""
@@ -94,32 +167,109 @@ class NameStandardizer:
 
         return name1 == name2  # Compare first, middle, and last names
 
-    def update_db_instructors(self):
-        """Standardize instructor names and update faculty status in the database."""
+    def build_name_mapping(self, db_names, progress=None):
+        """
+        Compute the standardized name and faculty status for every instructor name.
 
-        db_names = self.db.grade_distributions.distinct("instructor_name")
-        
+        Args:
+            db_names: Instructor names as stored in the database.
+            progress: Optional callback receiving a names_resolved counter.
 
-        for old_name in db_names:
-            standardized_tuple = self.standardize_instructor_name(old_name)  
-            new_name = " ".join(filter(None, standardized_tuple))  # Convert tuple to string
-            
-            is_faculty = self.is_regular_faculty(old_name)  # Check faculty status
+        Returns:
+            Dictionary of old name -> (new name, is_regular_faculty). Names that
+            standardize to the same new name share one faculty flag, so the
+            rows they end up on never disagree.
+        """
+        new_names = {}
+        flags = {}
+        for count, old_name in enumerate(db_names, 1):
+            new_name = self.untuple(self.standardize_instructor_name(old_name))
+            new_names[old_name] = new_name
+            flags[new_name] = self.is_regular_faculty(old_name)
+            if progress and count % PROGRESS_EVERY == 0:
+                progress(names_resolved=count)
+        return {old_name: (new_name, flags[new_name]) for old_name, new_name in new_names.items()}
 
-            # Rename instructor to match standardized format
-            self.db.grade_distributions.update_many(
-                {'instructor_name': old_name},
-                {'$set': {'instructor_name': new_name}}
-            )
+    def build_term_mapping(self, name_terms, progress=None):
+        """
+        Compute the standardized name and per-term faculty status for every
+        (instructor name, year, term) combination.
+
+        Args:
+            name_terms: (instructor name, year, term) tuples as stored in the database.
+            progress: Optional callback receiving a names_resolved counter.
 
-            # Update faculty status after renaming
-            self.db.grade_distributions.update_many(
-                {'instructor_name': new_name},
-                {'$set': {'is_regular_faculty': is_faculty}}
+        Returns:
+            Dictionary of (old name, year, term) -> (new name, is_regular_faculty).
+            Names that standardize to the same new name share one flag per
+            academic year.
+        """
+        new_names = {}
+        flags = {}
+        for count, (old_name, year, term) in enumerate(name_terms, 1):
+            new_name = self.untuple(self.standardize_instructor_name(old_name))
+            new_names[(old_name, year, term)] = new_name
+            flags[(new_name, academic_year(term, year))] = self.is_regular_faculty(old_name, term, year)
+            if progress and count % PROGRESS_EVERY == 0:
+                progress(names_resolved=count)
+        return {
+            key: (new_name, flags[(new_name, academic_year(key[2], key[1]))])
+            for key, new_name in new_names.items()
+        }
+
+    def update_db_instructors(self, progress=None):
+        """
+        Standardize instructor names and update faculty status in the database.
+        Every rename and flag is sent in one unordered bulk write with one
+        UpdateMany per distinct name, or per distinct name and term when a
+        year-tagged faculty dataset is loaded.
+
+        Args:
+            progress: Optional callback receiving a names_resolved counter
+                      (see admin/jobs.py). It is not called once the bulk
+                      write has started, so a cancelled job never leaves
+                      names updated without their rollups.
+        """
+        start = time.perf_counter()
+        if self.faculty_by_year:
+            groups = self.db.grade_distributions.aggregate([
+                {"$group": {"_id": {"instructor_name": "$instructor_name", "year": "$year", "term": "$term"}}}
+            ])
+            mapping = self.build_term_mapping(
+                ((group["_id"]["instructor_name"], group["_id"]["year"], group["_id"]["term"]) for group in groups),
+                progress
             )
+            filters = {key: {'instructor_name': key[0], 'year': key[1], 'term': key[2]} for key in mapping}
+            old_names = {key: key[0] for key in mapping}
+        else:
+            mapping = self.build_name_mapping(self.db.grade_distributions.distinct("instructor_name"), progress)
+            filters = {key: {'instructor_name': key} for key in mapping}
+            old_names = {key: key for key in mapping}
+        mapped = time.perf_counter()
+        if progress:
+            progress(names_resolved=len(mapping))
+
+        operations = [
+            UpdateMany(filters[key], {'$set': {'instructor_name': new_name, 'is_regular_faculty': is_faculty}})
+            for key, (new_name, is_faculty) in mapping.items()
+        ]
+        modified = 0
+        if operations:
+            modified = self.db.grade_distributions.bulk_write(operations, ordered=False).modified_count
+        written = time.perf_counter()
 
-            # print(f"Updated {old_name} to {new_name}: is_regular_faculty={is_faculty}")
+        # Names and faculty flags are part of the rollup keys
+        self.db.rebuild_rollups()
+        finished = time.perf_counter()
 
+        names = set(old_names.values())
+        renamed = {old_names[key] for key, (new_name, _) in mapping.items() if old_names[key] != new_name}
+        faculty = sum(is_faculty for _, is_faculty in mapping.values())
+        unit = "name/term pairs" if self.faculty_by_year else "names"
+        print(f"Standardized {len(names)} instructor names ({len(renamed)} renamed); "
+              f"{faculty} of {len(mapping)} {unit} are regular faculty")
+        print(f"  mapping: {mapped - start:.2f}s, bulk write: {written - mapped:.2f}s ({modified} rows), "
+              f"rollups: {finished - written:.2f}s, total: {finished - start:.2f}s")
         print("Database update complete.")
 
     
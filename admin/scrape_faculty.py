@@ -1,6 +1,162 @@
+"""
+Faculty Scraper for EasyA Grade Analysis System
+
+Collects the regular faculty of the natural science departments from archived
+University of Oregon catalog pages on the Wayback Machine. Several snapshots
+(Wayback timestamps) and catalog sections can be scraped in one run; the
+results are merged into a faculty dataset tagged with the academic year of
+each catalog (faculty_dataset.json), so resolve_discrepancies.py can decide
+faculty status per term, and into the combined faculty_list.txt.
+
+Pages are fetched concurrently through one connection-pooled session. Requests
+to the same host are spaced by a rate limiter instead of fixed sleeps, failed
+requests are retried with exponential backoff and jitter, and every page is
+kept in a content-addressed on-disk cache, so re-runs only fetch what is
+missing. Parsed faculty lists are cached by page digest as well, so a page
+whose content has not changed (including the same capture served for two
+timestamps) is never parsed twice. A department that cannot be fetched is
+reported and skipped without stopping the run.
+
+Pages are parsed with lxml when it is installed (html.parser otherwise), and
+only the elements the scraper reads are built into the tree: the department
+nav list of a section index, and the title and paragraphs of a department page.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401  (optional, faster parser backend)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Where fetched pages are cached between runs
+DEFAULT_CACHE_DIR = "admin/.scrape_cache"
+
+# Status codes worth retrying; anything else but 200 is a permanent failure
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Department pages: only the title and the paragraphs (facultylist entries) are kept
+DEPARTMENT_STRAINER = SoupStrainer(["title", "p"])
+
+# Catalog site captured by the Wayback Machine
+CATALOG_URL = "http://catalog.uoregon.edu"
+
+# Wayback timestamps scraped by default, one per academic year of grade data;
+# the Wayback Machine serves the capture closest to each timestamp
+DEFAULT_TIMESTAMPS = ["20130901000000", "20140901091007", "20150901000000", "20160901000000"]
+
+# Catalog sections (colleges) scraped by default
+DEFAULT_SECTIONS = ["arts_sciences"]
+
+# Year-tagged faculty dataset written next to faculty_list.txt
+FACULTY_DATASET_PATH = "faculty_dataset.json"
+
+
+def catalog_year(timestamp: str) -> int:
+    """
+    Academic year of the catalog captured at a Wayback timestamp: captures
+    from July on show the catalog of the year starting that fall.
+    """
+    year, month = int(timestamp[:4]), int(timestamp[4:6] or 1)
+    return year if month >= 7 else year - 1
+
+
+class RateLimiter:
+    """Spaces requests to the same host at least min_interval seconds apart."""
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str):
+        """Block until the next request to host is allowed, then claim that slot."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class HtmlCache:
+    """
+    Content-addressed page cache.
+
+    Page bodies are stored once under the SHA-256 of their content
+    (objects/<digest>.html) and index.json maps each URL to its digest, so
+    identical pages fetched from different URLs share one file and a page can
+    be checked for changes by comparing digests.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._objects = os.path.join(directory, "objects")
+        self._index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        os.makedirs(self._objects, exist_ok=True)
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as file:
+                self._index = json.load(file)
+        except (OSError, ValueError):
+            self._index = {}
+
+    def digest(self, url: str):
+        """Return the content digest cached for url, or None."""
+        with self._lock:
+            return self._index.get(url)
+
+    def get(self, url: str):
+        """Return the cached page for url, or None."""
+        digest = self.digest(url)
+        if digest is None:
+            return None
+        try:
+            with open(os.path.join(self._objects, f"{digest}.html"), "r", encoding="utf-8") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def get_parsed(self, digest: str):
+        """Return the parse result stored for a page digest, or None."""
+        try:
+            with open(os.path.join(self._objects, f"{digest}.json"), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def put_parsed(self, digest: str, parsed) -> None:
+        """Store the parse result of the page with the given digest."""
+        path = os.path.join(self._objects, f"{digest}.json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(parsed, file)
+        os.replace(f"{path}.tmp", path)
+
+    def put(self, url: str, text: str) -> str:
+        """Store a page for url and return its content digest."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        path = os.path.join(self._objects, f"{digest}.html")
+        if not os.path.exists(path):
+            with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+                file.write(text)
+            os.replace(f"{path}.tmp", path)
+        with self._lock:
+            self._index[url] = digest
+            with open(f"{self._index_path}.tmp", "w", encoding="utf-8") as file:
+                json.dump(self._index, file, indent=1, sort_keys=True)
+            os.replace(f"{self._index_path}.tmp", self._index_path)
+        return digest
+
 
 class WebScraper:
     """
@@ -10,8 +166,14 @@ class WebScraper:
         base_url (str): The base URL of the website to scrape.
 
     Methods:
-        get_code(url, retries=3, delay=60):
-            Fetches the HTML content of a webpage.
+        fetch(url):
+            Fetches the HTML text of a webpage, from the cache when possible.
+
+        fetch_all(urls):
+            Fetches several webpages concurrently.
+
+        get_code(url):
+            Fetches and parses the HTML content of a webpage.
         
         get_departments(soup):
             Extracts department URLs from the main page's HTML content.
@@ -19,8 +181,38 @@ class WebScraper:
         get_faculty(soup):
             Extracts faculty names from a department page's HTML content.
     """
-    def __init__(self, base_url):
+    def __init__(self, base_url, cache_dir=DEFAULT_CACHE_DIR, max_workers=4, min_interval=1.0,
+                 retries=4, backoff=2.0, max_backoff=120.0, timeout=30, refresh=False, progress=None):
+        """
+        Args:
+            base_url: Base URL links on the pages are relative to
+            cache_dir: Directory of the on-disk page cache, or None to disable it
+            max_workers: Number of pages fetched at the same time
+            min_interval: Minimum seconds between requests to the same host
+            retries: Attempts per page before giving up on it
+            backoff: Base delay in seconds; attempt n waits up to backoff * 2**n
+            max_backoff: Upper bound on a single backoff delay
+            timeout: Request timeout in seconds
+            refresh: If True, ignore cached pages (they are still updated)
+            progress: Optional callback receiving a pages_fetched counter
+        """
         self.base_url = base_url
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.refresh = refresh
+        self.progress = progress
+        self.pages_fetched = 0
+        self.cache = HtmlCache(cache_dir) if cache_dir else None
+        self.rate_limiter = RateLimiter(min_interval)
+
+        # one pooled session shared by all worker threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.natural_sciences = ["anthropology",
                     "biology",
                     "chemistry",
@@ -32,42 +224,103 @@ class WebScraper:
                     "physics", 
                     "psychology"]
 
-    def get_code(self, url, retries=3, delay=60):
+    def fetch(self, url):
         """
-        Fetches the HTML content of a webpage.
+        Fetches the HTML text of a webpage.
+
+        Cached pages are returned without a request. Otherwise the request
+        waits for the host's rate limiter, and connection errors, timeouts and
+        429/5xx responses are retried with exponential backoff and full jitter
+        (honouring a numeric Retry-After header).
 
         Args:
             url (str): The URL of the webpage to fetch.
-            retries (int, optional): The number of times to retry fetching the webpage in case of failure. Defaults to 3.
-            delay (int, optional): The delay in seconds between retries. Defaults to 60.
-            Added 60 seconds to the delay each retry.
 
         Returns:
-            BeautifulSoup: A BeautifulSoup object containing the parsed HTML content of the webpage if the request is successful.
-            None: If the request fails after the specified number of retries.
+            str: The HTML text if the request is successful.
+            None: If the page could not be fetched.
         """
-        for i in range(retries):
-            #this website limits the amount of HTTP requests that can be made in a certain amount of time so I added a delay 60 seconds
+        if self.cache and not self.refresh:
+            text = self.cache.get(url)
+            if text is not None:
+                return text
+
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries):
+            self.rate_limiter.wait(host)
+            retry_after = None
             try:
-                response = requests.get(url)
+                response = self.session.get(url, timeout=self.timeout)
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    return soup
-                else:
-                    print(f"Failed to fetch the webpage. Status code: {response.status_code}")
+                    if self.cache:
+                        self.cache.put(url, response.text)
+                    return response.text
+                if response.status_code not in RETRY_STATUS_CODES:
+                    print(f"Failed to fetch {url}. Status code: {response.status_code}")
                     return None
+                print(f"Fetching {url} returned status code {response.status_code}")
+                retry_after = response.headers.get("Retry-After")
             except requests.exceptions.RequestException as e:
                 print(f"Error fetching {url}: {e}")
-                if i < retries - 1:
-                    print(f"Retrying in {delay} seconds...")
-                    time.sleep(delay)
-                    delay += 60
-                else:
-                    print("Max retries exceeded.")
-                    return None
 
-    def get_departments(self, soup):
-        ul_element = soup.find("ul", {"class": "nav", "id": "/arts_sciences/"})
+            if attempt < self.retries - 1:
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, min(self.max_backoff, float(retry_after)))
+                time.sleep(delay)
+        print(f"Max retries exceeded for {url}")
+        return None
+
+    def fetch_all(self, urls):
+        """
+        Fetches several webpages concurrently.
+
+        Returns:
+            dict: URL -> HTML text, or None for pages that could not be fetched.
+        """
+        urls = list(dict.fromkeys(urls))
+        pages = {}
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            for url, text in zip(urls, pool.map(self.fetch, urls)):
+                pages[url] = text
+                self.pages_fetched += 1
+                if self.progress:
+                    self.progress(pages_fetched=self.pages_fetched)
+        finally:
+            # if progress raised (a cancelled job), drop the pages not started yet
+            pool.shutdown(wait=True, cancel_futures=True)
+        return pages
+
+    def get_code(self, url):
+        """
+        Fetches the HTML content of a webpage.
+
+        Returns:
+            BeautifulSoup: A BeautifulSoup object containing the parsed HTML content of the webpage if the request is successful.
+            None: If the page could not be fetched.
+        """
+        text = self.fetch(url)
+        if text is None:
+            return None
+        return BeautifulSoup(text, HTML_PARSER)
+
+    def parse_index(self, text, section="arts_sciences"):
+        """Parses only the department nav list of a catalog section index page."""
+        return BeautifulSoup(text, HTML_PARSER, parse_only=SoupStrainer("ul", id=f"/{section}/"))
+
+    def parse_department_page(self, text):
+        """Parses only the title and paragraphs of a department page."""
+        return BeautifulSoup(text, HTML_PARSER, parse_only=DEPARTMENT_STRAINER)
+
+    def wayback_url(self, timestamp, section):
+        """URL of a catalog section's index page in the Wayback snapshot at timestamp."""
+        return f"{self.base_url}/web/{timestamp}/{CATALOG_URL}/{section}/"
+
+    def get_departments(self, soup, section="arts_sciences"):
+        ul_element = soup.find("ul", {"class": "nav", "id": f"/{section}/"})
+        if ul_element is None:
+            return []
         links = ul_element.find_all("a", href=True)
         urls = [self.base_url + link['href'] for link in links]
         return urls #finds the links to the departments and strips HTML tags
@@ -95,41 +348,150 @@ class WebScraper:
             text = text[:pos]
         return text.strip() #strips the faculty names of any extra info
 
-def main():
-    base_url = 'https://web.archive.org'
-    start_url = base_url + '/web/20140901091007/http://catalog.uoregon.edu/arts_sciences/'
-    scraper = WebScraper(base_url)
-    
-    soup = scraper.get_code(start_url)
-    if soup:
-        dep = scraper.get_departments(soup)
-        natural_dep =[]
-        for department in dep:
-                for science in scraper.natural_sciences:
-                    if science in department:
-                        natural_dep.append(department)
+    def parse_department(self, url, text):
+        """
+        Extracts the department name and faculty names from a department page.
+        Results are cached by page digest, so unchanged pages are not parsed again.
+
+        Returns:
+            dict: {"department": name, "faculty": [names]}
+        """
+        digest = self.cache.digest(url) if self.cache else None
+        if digest:
+            parsed = self.cache.get_parsed(digest)
+            if parsed is not None:
+                return parsed
+
+        dep_soup = self.parse_department_page(text)
+        parsed = {
+            "department": self.strip_name(dep_soup.find('title').text),  # Clean up the department name
+            "faculty": [self.strip_fac_name(fac) for fac in self.get_faculty(dep_soup)],
+        }
+        if digest:
+            self.cache.put_parsed(digest, parsed)
+        return parsed
+
+    def _wanted(self, department_url, all_departments):
+        return all_departments or any(science in department_url for science in self.natural_sciences)
+
+    def scrape(self, start_url, section="arts_sciences", all_departments=False):
+        """
+        Scrapes the faculty of every natural science department linked from start_url.
+
+        Returns:
+            Tuple of (department name -> faculty names, URLs that failed),
+            or None if the start page could not be fetched.
+        """
+        text = self.fetch(start_url)
+        if text is None:
+            return None
+
+        natural_dep = [department for department in self.get_departments(self.parse_index(text, section), section)
+                       if self._wanted(department, all_departments)]
 
         fac_list = {}
-        for department in natural_dep:
-            dep_soup = scraper.get_code(department)
-            if dep_soup:
-                dep_name = dep_soup.find('title').text
-                dep_name = scraper.strip_name(dep_name)  # Clean up the department name
-                print(dep_name) 
-                faculty = scraper.get_faculty(dep_soup)
-                fac_list[dep_name] = [scraper.strip_fac_name(fac) for fac in faculty]
-            else:
+        failed = []
+        for department, text in self.fetch_all(natural_dep).items():
+            if text is None:
                 print(f"Failed to fetch content for {department}")
-                break  # Stop the loop if a request fails
-
-        with open('faculty_list.txt', 'w', encoding='utf-8') as file:
-            for dep, faculty in fac_list.items():
-                file.write(f"{dep}:\n")
-                for fac in faculty:
-                    file.write(f"{fac}\n")
-                file.write("\n")
-    else:
+                failed.append(department)
+                continue
+            parsed = self.parse_department(department, text)
+            print(parsed["department"])
+            fac_list[parsed["department"]] = parsed["faculty"]
+        return fac_list, failed
+
+    def scrape_snapshots(self, timestamps=DEFAULT_TIMESTAMPS, sections=DEFAULT_SECTIONS, all_departments=False):
+        """
+        Scrapes several Wayback snapshots and catalog sections concurrently and
+        merges them into a year-tagged faculty dataset.
+
+        Args:
+            timestamps: Wayback timestamps (e.g., "20140901091007")
+            sections: Catalog section slugs (e.g., "arts_sciences")
+            all_departments: If True, keep every department instead of only natural_sciences
+
+        Returns:
+            Tuple of (dataset, URLs that failed). The dataset is a dictionary:
+            - faculty: catalog year (as a string) -> department -> faculty names
+            - snapshots: timestamp -> {"catalog_year": year, "sections": [...]}
+        """
+        index_urls = {(timestamp, section): self.wayback_url(timestamp, section)
+                      for timestamp in timestamps for section in sections}
+        index_pages = self.fetch_all(index_urls.values())
+
+        failed = []
+        department_urls = {timestamp: [] for timestamp in timestamps}
+        for (timestamp, section), url in index_urls.items():
+            text = index_pages[url]
+            if text is None:
+                failed.append(url)
+                continue
+            department_urls[timestamp] += [department
+                                           for department in self.get_departments(self.parse_index(text, section), section)
+                                           if self._wanted(department, all_departments)]
+
+        pages = self.fetch_all(url for urls in department_urls.values() for url in urls)
+
+        dataset = {"faculty": {}, "snapshots": {}}
+        for timestamp, urls in department_urls.items():
+            if not urls:
+                continue
+            year = catalog_year(timestamp)
+            faculty = dataset["faculty"].setdefault(str(year), {})
+            for url in urls:
+                if pages[url] is None:
+                    failed.append(url)
+                    continue
+                parsed = self.parse_department(url, pages[url])
+                names = faculty.setdefault(parsed["department"], [])
+                names += [name for name in parsed["faculty"] if name not in names]
+            dataset["snapshots"][timestamp] = {"catalog_year": year, "sections": list(sections)}
+        return dataset, failed
+
+
+def merge_years(dataset):
+    """Combine the faculty of every catalog year into one department -> names listing."""
+    merged = {}
+    for year in sorted(dataset["faculty"]):
+        for dep, faculty in dataset["faculty"][year].items():
+            names = merged.setdefault(dep, [])
+            names += [name for name in faculty if name not in names]
+    return merged
+
+
+def write_faculty_dataset(dataset, path=FACULTY_DATASET_PATH):
+    """Writes the year-tagged faculty dataset as JSON."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(dataset, file, indent=1, ensure_ascii=False)
+
+
+def write_faculty_list(fac_list, path='faculty_list.txt'):
+    """Writes the scraped faculty grouped by department headers."""
+    with open(path, 'w', encoding='utf-8') as file:
+        for dep, faculty in fac_list.items():
+            file.write(f"{dep}:\n")
+            for fac in faculty:
+                file.write(f"{fac}\n")
+            file.write("\n")
+
+
+def main(progress=None):
+    base_url = 'https://web.archive.org'
+    scraper = WebScraper(base_url, progress=progress)
+
+    dataset, failed = scraper.scrape_snapshots(DEFAULT_TIMESTAMPS, DEFAULT_SECTIONS)
+    if not dataset["faculty"]:
         print("Failed to fetch the main page.")
+        return
+
+    write_faculty_dataset(dataset)
+    write_faculty_list(merge_years(dataset))
+    print(f"Scraped catalog years: {', '.join(sorted(dataset['faculty']))}")
+    if failed:
+        print(f"{len(failed)} page(s) could not be fetched; run again to retry them:")
+        for url in failed:
+            print(f"  {url}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
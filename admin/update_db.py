@@ -20,8 +20,52 @@ This module is crucial for:
 2. Maintaining data consistency across different data sources
 3. Ensuring accurate faculty status tracking
 4. Facilitating clean data reloads when new data is available
+5. Versioned re-imports that load into shadow collections and swap them in,
+   keeping the last few versions around for instant rollback
+6. Writing the binary snapshot the student window starts from
 """
 
+import os
+from datetime import datetime
+from admin.import_data import DataImporter
+from admin.name_resolution import NameResolver
+from src.data.db_manager import DATASET_COLLECTIONS
+from src.data.columnar_store import ColumnarGradeStore
+from src.data.snapshot import DEFAULT_SNAPSHOT_PATH, write_snapshot
+
+# Number of archived dataset versions kept for rollback after a versioned import
+DEFAULT_KEEP_VERSIONS = 3
+
+# Version id given to data that was loaded before versioned imports were used
+UNVERSIONED_ID = "initial"
+
+
+class ShadowCollections:
+    """
+    Exposes the dataset collections of one version under the same attribute
+    names as DatabaseManager (courses, instructors, grade_distributions), so a
+    DataImporter can load into e.g. grade_distributions_<version> unchanged.
+    """
+    def __init__(self, database, version: str):
+        for name in DATASET_COLLECTIONS:
+            setattr(self, name, database[f"{name}_{version}"])
+
+
+def prepare_dataset(db_manager, file_path):
+    """
+    Import a data file as a new dataset version and write the snapshot for it.
+    The student window calls this on launch when its snapshot is stale.
+
+    Returns:
+        The new version id, or None if the file produced no data
+    """
+    updater = DatabaseUpdater(db_manager)
+    version = updater.import_versioned(file_path)
+    if version:
+        updater.write_snapshot()
+    return version
+
+
 class DatabaseUpdater:
     def __init__(self, db_manager):
         """
@@ -50,6 +94,175 @@ class DatabaseUpdater:
         self.db.instructors.delete_many({})
         self.db.grade_distributions.delete_many({})
 
+    def import_versioned(self, file_path, keep_versions=DEFAULT_KEEP_VERSIONS, progress=None, load=None):
+        """
+        Import a data file as a new dataset version without disturbing readers.
+
+        The data is loaded into shadow collections (e.g.
+        grade_distributions_20250101120000) and indexed while the current data
+        stays live. The shadow collections are then renamed over the live names
+        and the previous version is archived under its own suffix, so readers
+        only ever see a complete dataset. Archived versions beyond
+        keep_versions are dropped.
+
+        Args:
+            file_path: Path to the .js or .json data file
+            keep_versions: Number of archived versions to keep for rollback
+            progress: Optional importer progress callback; if it raises (e.g.,
+                      a cancelled admin job) the shadow collections are dropped
+                      and the live data is left untouched
+            load: Optional function importing file_path into the collections
+                  it is given and returning whether any data was imported
+                  (e.g., a PipelinedImporter); defaults to a streaming
+                  DataImporter
+
+        Returns:
+            The new version id, or None if the import produced no data
+        """
+        version = self._new_version_id()
+        shadow = ShadowCollections(self.db.db, version)
+
+        try:
+            if load is None:
+                imported = DataImporter(shadow, progress).import_grade_data(file_path, streaming=True)
+            else:
+                imported = load(shadow)
+        except BaseException:
+            self._drop_version(version)
+            raise
+        if not imported:
+            self._drop_version(version)
+            return None
+
+        self.db.create_indexes(f"_{version}")
+        self.db.dataset_versions.insert_one({"_id": version, "created_at": datetime.now(), "live": False})
+        self._swap_in(version)
+        self._prune_versions(keep_versions)
+        return version
+
+    def rollback(self, version=None):
+        """
+        Swap an archived dataset version back in.
+
+        Args:
+            version: Version id to restore, defaults to the version that was
+                     live most recently among those older than the live one,
+                     so repeated rollbacks keep going back
+
+        Returns:
+            The restored version id, or None if there is nothing to roll back to
+        """
+        if version is None:
+            version = self._previous_version()
+            if version is None:
+                return None
+        elif not self.db.dataset_versions.find_one({"_id": version, "live": False}):
+            raise ValueError(f"No archived dataset version {version}")
+
+        self._swap_in(version)
+        return version
+
+    def write_snapshot(self, path=DEFAULT_SNAPSHOT_PATH):
+        """
+        Write the live dataset to a binary snapshot for the student window.
+        Should be called after every change to the live data (imports,
+        rollbacks, name standardization) so the snapshot never goes stale.
+        An empty dataset is not written; any older snapshot is removed
+        instead, so the student window falls back to the database.
+
+        Args:
+            path: Snapshot file path
+
+        Returns:
+            True if a snapshot was written
+        """
+        store = ColumnarGradeStore.from_database(self.db)
+        if store.size == 0:
+            if os.path.exists(path):
+                os.remove(path)
+            return False
+        write_snapshot(path, store)
+        return True
+
+    def list_versions(self, include_live=True):
+        """Return dataset version records, newest first."""
+        query = {} if include_live else {"live": False}
+        return list(self.db.dataset_versions.find(query).sort("created_at", -1))
+
+    def _new_version_id(self):
+        version = datetime.now().strftime("%Y%m%d%H%M%S")
+        candidate, counter = version, 1
+        while self.db.dataset_versions.find_one({"_id": candidate}):
+            candidate = f"{version}{counter:02d}"
+            counter += 1
+        return candidate
+
+    def _live_version(self):
+        """
+        Return the id of the live version, registering pre-existing
+        unversioned data as UNVERSIONED_ID so it can be rolled back to.
+        Returns None when there is no live data at all (live collections that
+        only hold indexes do not count).
+        """
+        live = self.db.dataset_versions.find_one({"live": True})
+        if live:
+            return live["_id"]
+        if self.db.grade_distributions.estimated_document_count() == 0:
+            return None
+        self.db.dataset_versions.insert_one(
+            {"_id": UNVERSIONED_ID, "created_at": datetime.now(), "live": True}
+        )
+        return UNVERSIONED_ID
+
+    def _previous_version(self):
+        """The archived version a default rollback restores, or None."""
+        live = self.db.dataset_versions.find_one({"live": True})
+        archived = self.list_versions(include_live=False)
+        if live is not None:
+            archived = [record for record in archived if record["created_at"] < live["created_at"]]
+        if not archived:
+            return None
+        # versions archived before replaced_at was recorded count as replaced when created
+        latest = max(archived, key=lambda record: record.get("replaced_at", record["created_at"]))
+        return latest["_id"]
+
+    def _swap_in(self, version):
+        """
+        Rename the collections of version over the live names, archiving the
+        current live collections under their version suffix. The dataset is
+        marked as changing for the duration, so readers going through
+        DatabaseManager.read_consistent wait for the last rename instead of
+        seeing a missing collection or collections of two versions.
+        """
+        live_version = self._live_version()
+        names = set(self.db.db.list_collection_names())
+        self.db.bump_generation(changing=True)
+        try:
+            for name in DATASET_COLLECTIONS:
+                source = f"{name}_{version}"
+                if source not in names:
+                    self.db.db.create_collection(source)
+                if name in names and live_version is not None:
+                    self.db.db[name].rename(f"{name}_{live_version}")
+                # without a live version, any live collection is empty and replaced
+                self.db.db[source].rename(name, dropTarget=live_version is None)
+
+            if live_version is not None:
+                self.db.dataset_versions.update_one({"_id": live_version},
+                                                    {"$set": {"live": False, "replaced_at": datetime.now()}})
+            self.db.dataset_versions.update_one({"_id": version}, {"$set": {"live": True}})
+        finally:
+            self.db.bump_generation()
+
+    def _prune_versions(self, keep_versions):
+        for record in self.list_versions(include_live=False)[keep_versions:]:
+            self._drop_version(record["_id"])
+
+    def _drop_version(self, version):
+        for name in DATASET_COLLECTIONS:
+            self.db.db.drop_collection(f"{name}_{version}")
+        self.db.dataset_versions.delete_one({"_id": version, "live": False})
+
     def update_instructor_status(self, instructor_name, is_regular=True):
         """
         Update an instructor's regular faculty status.
@@ -68,6 +281,13 @@ class DatabaseUpdater:
             {'$set': {'is_regular_faculty': is_regular}},   # Add/Update the field
             upsert=False   # Do NOT create new entries, just update existing ones
         )
+        # Keep the rollup cells in step; queries re-group cells, so cells that
+        # now share a key are summed correctly without a full rebuild
+        self.db.grade_rollups.update_many(
+            {'instructor_name': instructor_name},
+            {'$set': {'is_regular_faculty': is_regular}}
+        )
+        self.db.bump_generation()
 
 
     def match_instructor_names(self, grade_data_names, faculty_names):
@@ -75,8 +295,11 @@ class DatabaseUpdater:
         Match instructor names between grade data and faculty data.
         
         This method handles the requirement to resolve discrepancies between
-        names found in gradedata.js and the scraped faculty data. It implements
-        a flexible matching system that can handle minor variations in name format.
+        names found in gradedata.js and the scraped faculty data. Candidates
+        are narrowed with phonetic blocking and scored with edit distance (see
+        admin/name_resolution.py), so formatting differences, accents and
+        small spelling variations match while unrelated names that merely
+        contain each other (e.g., "Li" and "Lincoln") do not.
         
         Args:
             grade_data_names: List of instructor names from grade data
@@ -86,46 +309,15 @@ class DatabaseUpdater:
             Tuple containing:
             - matches: List of (grade_name, faculty_name) pairs that match
             - unmatched: List of grade_data_names that didn't find a match
+              (including candidates that only reached the review threshold)
             
         This supports the administrative requirement to ensure data consistency
-        and provide statistics about name matching results.
+        and provide statistics about name matching results. Use
+        NameResolver(faculty_names).resolve(grade_data_names) directly for the
+        full ranked report with scores.
         """
-        matches = []
-        unmatched = []
-        
-        for grade_name in grade_data_names:
-            found = False
-            for faculty_name in faculty_names:
-                if self._names_match(grade_name, faculty_name):
-                    matches.append((grade_name, faculty_name))
-                    found = True
-                    break
-            if not found:
-                unmatched.append(grade_name)
-                
+        report = NameResolver(faculty_names).resolve(grade_data_names)
+        matched = {r.grade_name: r.faculty_name for r in report.matches}
+        matches = [(name, matched[name]) for name in grade_data_names if name in matched]
+        unmatched = [name for name in grade_data_names if name not in matched]
         return matches, unmatched
-
-    def _names_match(self, name1, name2):
-        """
-        Helper function to determine if two name variants match.
-        
-        This internal method implements the name matching logic used to
-        resolve discrepancies between different data sources. It uses
-        a simple but flexible matching approach that can be enhanced
-        for more sophisticated matching if needed.
-        
-        Args:
-            name1: First name to compare
-            name2: Second name to compare
-            
-        Returns:
-            Boolean indicating whether names are considered a match
-            
-        Note:
-            Current implementation uses case-insensitive substring matching,
-            which can be enhanced with more sophisticated algorithms
-            (e.g., Levenshtein distance) if needed.
-        """
-        name1 = name1.lower().strip()
-        name2 = name2.lower().strip()
-        return name1 == name2 or name1 in name2 or name2 in name1
\ No newline at end of file
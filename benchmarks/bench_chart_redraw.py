@@ -0,0 +1,104 @@
+# bench_chart_redraw.py
+
+"""
+Benchmark: rebuilding the student window graph vs updating persistent artists.
+
+Pages through synthetic results and toggles between % As and % Ds/Fs, timing
+each redraw two ways on an off-screen Agg canvas of the window's size:
+- rebuild: fig.clear(), new axes and bars, tight_layout and a full draw, as
+  update_side_graph originally did
+- persistent: BarChart updating its existing bars and labels and blitting them
+  over the cached background
+
+Usage:
+    python -m benchmarks.bench_chart_redraw [--results N] [--repeat N]
+"""
+
+import argparse
+import statistics
+import time
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from src.gui.bar_chart import BarChart
+
+RESULTS_PER_PAGE = 8
+
+
+def synthetic_results(count):
+    return [{"_id": f"Instructor {i}, Name", "avg_percent_a": (i * 37) % 100,
+             "avg_percent_df": (i * 11) % 20, "class_count": i % 9 + 1} for i in range(count)]
+
+
+def page_views(results, repeat):
+    """(page results, show_as) for paging forward and toggling the metric on every page."""
+    pages = [results[start:start + RESULTS_PER_PAGE] for start in range(0, len(results), RESULTS_PER_PAGE)]
+    views = []
+    for _ in range(repeat):
+        for page in pages:
+            views += [(page, True), (page, False)]
+    return views
+
+
+def rebuild(fig, canvas, page, show_as):
+    fig.clear()
+    ax = fig.add_subplot(111)
+    percentages = [r["avg_percent_a" if show_as else "avg_percent_df"] for r in page]
+    bars = ax.bar(range(len(page)), percentages, color="blue", alpha=0.7)
+    for bar, r in zip(bars, page):
+        ax.text(bar.get_x() + bar.get_width() / 2., bar.get_height(), f"n={r['class_count']}",
+                ha="center", va="bottom")
+    ax.set_ylabel("% As" if show_as else "% Ds/Fs")
+    ax.set_title("Dept: CIS")
+    ax.set_xticks(range(len(page)))
+    ax.set_xticklabels([r["_id"] for r in page], rotation=45, ha="right")
+    ax.grid(True, axis="y", linestyle="--", alpha=0.7)
+    ax.set_ylim(0, 100)
+    fig.tight_layout()
+    canvas.draw()
+
+
+def persistent(chart, page, show_as):
+    chart.update([r["_id"] for r in page],
+                 [r["avg_percent_a" if show_as else "avg_percent_df"] for r in page],
+                 [r["class_count"] for r in page],
+                 show_counts=True, y_label="% As" if show_as else "% Ds/Fs", title="Dept: CIS")
+
+
+def time_views(redraw, views):
+    timings = []
+    for page, show_as in views:
+        start = time.perf_counter()
+        redraw(page, show_as)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full rebuilds with persistent-artist redraws.")
+    parser.add_argument("--results", type=int, default=80, help="Number of results to page through")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over all pages")
+    args = parser.parse_args()
+
+    views = page_views(synthetic_results(args.results), args.repeat)
+
+    fig = Figure(figsize=(6, 4), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    rebuild_ms = time_views(lambda page, show_as: rebuild(fig, canvas, page, show_as), views)
+
+    fig = Figure(figsize=(6, 4), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    chart = BarChart(fig, canvas, color="blue", slots=RESULTS_PER_PAGE)
+    canvas.draw()  # first paint caches the background, as the window's first draw does
+    persistent_ms = time_views(lambda page, show_as: persistent(chart, page, show_as), views)
+
+    print(f"{len(views)} redraws (paging and % As / % Ds/Fs toggles)\n")
+    print(f"{'mode':<12}{'median ms':>11}{'max ms':>9}")
+    for label, (median, worst) in (("rebuild", rebuild_ms), ("persistent", persistent_ms)):
+        print(f"{label:<12}{median:>11.2f}{worst:>9.2f}")
+    print(f"\nspeedup: {rebuild_ms[0] / persistent_ms[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
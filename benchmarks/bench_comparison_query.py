@@ -0,0 +1,157 @@
+# bench_comparison_query.py
+
+"""
+Benchmark: two-phase $in comparison queries vs single server-side pipelines.
+
+The original QueryBuilder.build_comparison_query first fetched every matching
+course_id from courses and every regular faculty name from instructors, then
+inlined both lists as $in arrays into an aggregation over grade_distributions.
+This compares that approach with
+- a single pipeline on grade_distributions that matches the denormalized
+  department/number/level and is_regular_faculty fields, and
+- the rollup query QueryBuilder runs today (the same $match on grade_rollups,
+  summing pre-aggregated cells; the query cache is bypassed).
+
+For every query shape it prints the median latency of each approach, the size
+of the $in lists the old approach had to send, and whether all three agree.
+
+Requires a running MongoDB; data is loaded into a separate easya_bench
+database so the application's data is left alone.
+
+Usage:
+    python -m benchmarks.bench_comparison_query [--scales 10 100] [--repeat N]
+"""
+
+import argparse
+import statistics
+import time
+
+from src.data.db_manager import DatabaseManager
+from benchmarks.bench_course_filters import load_dataset
+
+# (department, course number, level, regular faculty only)
+QUERY_SHAPES = [
+    ("MATH", None, None, False),
+    ("MATH", None, None, True),
+    ("CH", None, 300, False),
+    ("CH", None, 300, True),
+    ("BI", None, 100, True),
+]
+
+
+def mark_faculty(db):
+    """Mark every other instructor as regular faculty, the way the admin tools would."""
+    names = sorted(db.grade_distributions.distinct("instructor_name"))
+    faculty = names[::2]
+    db.instructors.insert_many(
+        [{"name": name, "is_regular_faculty": index % 2 == 0} for index, name in enumerate(names)]
+    )
+    db.grade_distributions.update_many({}, {"$set": {"is_regular_faculty": False}})
+    db.grade_distributions.update_many({"instructor_name": {"$in": faculty}},
+                                       {"$set": {"is_regular_faculty": True}})
+    db.rebuild_rollups()
+
+
+def course_filters(department, number, level, faculty_only):
+    filters = {"department": department}
+    if number:
+        filters["number"] = number
+    elif level:
+        filters["level"] = level
+    if faculty_only:
+        filters["is_regular_faculty"] = True
+    return filters
+
+
+def two_phase(db, department, number, level, faculty_only):
+    """The original build_comparison_query: two lookups, then $in lists."""
+    match_stage = {"department": department}
+    if number:
+        match_stage["number"] = number
+    elif level:
+        match_stage["level"] = level
+    course_ids = [course["course_id"] for course in db.courses.find(match_stage)]
+    pipeline = [{"$match": {"course_id": {"$in": course_ids}}}]
+    faculty_names = []
+    if faculty_only:
+        faculty_names = [f["name"] for f in db.instructors.find({"is_regular_faculty": True}, {"name": 1})]
+        pipeline.append({"$match": {"instructor_name": {"$in": faculty_names}}})
+    pipeline.append({"$group": {
+        "_id": "$instructor_name",
+        "average": {"$avg": "$percent_a"},
+        "class_count": {"$sum": 1}
+    }})
+    pipeline.append({"$sort": {"average": -1}})
+    results = list(db.grade_distributions.aggregate(pipeline))
+    return results, len(course_ids), len(faculty_names)
+
+
+def single_pipeline(db, department, number, level, faculty_only):
+    """One aggregation on raw rows, matching the denormalized fields."""
+    return list(db.grade_distributions.aggregate([
+        {"$match": course_filters(department, number, level, faculty_only)},
+        {"$group": {
+            "_id": "$instructor_name",
+            "average": {"$avg": "$percent_a"},
+            "class_count": {"$sum": 1}
+        }},
+        {"$sort": {"average": -1}}
+    ]))
+
+
+def rollups(db, department, number, level, faculty_only):
+    """The query QueryBuilder runs today, without the query cache."""
+    return db._group_stats("instructor_name", course_filters(department, number, level, faculty_only),
+                           "avg_percent_a")
+
+
+def median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def summarize(results, average_key):
+    return {r["_id"]: (round(r[average_key], 6), r["class_count"]) for r in results}
+
+
+def run_scale(db, scale, repeat):
+    load_dataset(db, scale)
+    mark_faculty(db)
+    rows = db.grade_distributions.count_documents({})
+    print(f"\nScale {scale}: {rows} grade rows, {db.grade_rollups.count_documents({})} rollup cells")
+    print(f"{'query':<18}{'two-phase':>11}{'single':>9}{'rollups':>9}{'speedup':>9}"
+          f"{'$in courses':>13}{'$in names':>11}{'agree':>7}")
+
+    for shape in QUERY_SHAPES:
+        department, number, level, faculty_only = shape
+        old, course_count, name_count = two_phase(db, *shape)
+        agree = (summarize(old, "average")
+                 == summarize(single_pipeline(db, *shape), "average")
+                 == summarize(rollups(db, *shape), "avg_percent_a"))
+
+        old_ms = median_ms(lambda: two_phase(db, *shape), repeat)
+        single_ms = median_ms(lambda: single_pipeline(db, *shape), repeat)
+        rollup_ms = median_ms(lambda: rollups(db, *shape), repeat)
+        label = f"{department} {number or level or 'all'}{' faculty' if faculty_only else ''}"
+        print(f"{label:<18}{old_ms:>11.2f}{single_ms:>9.2f}{rollup_ms:>9.2f}{old_ms / rollup_ms:>8.1f}x"
+              f"{course_count:>13}{name_count:>11}{'yes' if agree else 'NO':>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two-phase $in queries with single pipelines.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100], help="Synthetic data size multipliers")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query")
+    args = parser.parse_args()
+
+    db = DatabaseManager(database_name="easya_bench")
+    for scale in args.scales:
+        run_scale(db, scale, args.repeat)
+    db.client.drop_database("easya_bench")
+
+
+if __name__ == "__main__":
+    main()
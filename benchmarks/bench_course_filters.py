@@ -0,0 +1,118 @@
+# bench_course_filters.py
+
+"""
+Benchmark: prefix-regex course filters vs exact-match course fields.
+
+Compares the department/level filters the GUI used to run on raw
+grade_distributions rows ({"course_id": {"$regex": "^CH3"}}) with the exact
+matches on the denormalized department/level fields, which are served by the
+(department, level, term_ordinal, is_regular_faculty) index that
+DatabaseManager.create_indexes builds (see INDEXES). For every query shape it
+reports the median latency, the documents MongoDB examined and how many rows
+the regex matched that belong to another department (e.g. CHN under ^CH).
+
+Requires a running MongoDB; data is loaded into a separate easya_bench
+database so the application's data is left alone.
+
+Usage:
+    python -m benchmarks.bench_course_filters [--scale N] [--repeat N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+
+from src.data.db_manager import DatabaseManager, DATASET_COLLECTIONS
+from admin.import_data import DataImporter
+from benchmarks.synthetic import write_grade_file
+
+QUERY_SHAPES = [
+    ("CH", None),
+    ("CH", 300),
+    ("BI", None),
+    ("BI", 100),
+    ("MATH", 400),
+]
+
+
+def regex_filter(department, level):
+    prefix = department + (str(level // 100) if level else "")
+    return {"course_id": {"$regex": f"^{prefix}"}}
+
+
+def exact_filter(department, level):
+    filters = {"department": department}
+    if level:
+        filters["level"] = level
+    return filters
+
+
+def group_pipeline(match):
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": "$instructor_name",
+            "avg_percent_a": {"$avg": "$percent_a"},
+            "avg_percent_df": {"$avg": "$percent_df"},
+            "class_count": {"$sum": 1}
+        }},
+        {"$sort": {"avg_percent_a": -1}}
+    ]
+
+
+def time_query(collection, match, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(collection.aggregate(group_pipeline(match)))
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def docs_examined(collection, match):
+    return collection.find(match).explain()["executionStats"]["totalDocsExamined"]
+
+
+def load_dataset(db, scale):
+    for name in DATASET_COLLECTIONS:
+        db.db.drop_collection(name)
+    db.create_indexes()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "gradedata.js")
+        write_grade_file(path, scale)
+        with contextlib.redirect_stdout(io.StringIO()):
+            DataImporter(db).import_grade_data(path, streaming=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare regex and exact-match course filters.")
+    parser.add_argument("--scale", type=int, default=10, help="Synthetic data size multiplier")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query")
+    args = parser.parse_args()
+
+    db = DatabaseManager(database_name="easya_bench")
+    load_dataset(db, args.scale)
+    rows = db.grade_distributions.count_documents({})
+    print(f"Loaded {rows} grade rows (scale {args.scale})\n")
+
+    print(f"{'query':<12}{'regex ms':>10}{'exact ms':>10}{'speedup':>9}"
+          f"{'regex docs':>12}{'exact docs':>12}{'wrong rows':>12}")
+    for department, level in QUERY_SHAPES:
+        regex, exact = regex_filter(department, level), exact_filter(department, level)
+        regex_ms = time_query(db.grade_distributions, regex, args.repeat)
+        exact_ms = time_query(db.grade_distributions, exact, args.repeat)
+        wrong = db.grade_distributions.count_documents(dict(regex, department={"$ne": department}))
+        label = f"{department} {level or 'all'}"
+        print(f"{label:<12}{regex_ms:>10.2f}{exact_ms:>10.2f}{regex_ms / exact_ms:>8.1f}x"
+              f"{docs_examined(db.grade_distributions, regex):>12}"
+              f"{docs_examined(db.grade_distributions, exact):>12}{wrong:>12}")
+
+    db.client.drop_database("easya_bench")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# bench_scrape_parsing.py
+
+"""
+Benchmark: full-tree parsing vs parse-only extraction of catalog pages.
+
+Times WebScraper's extraction of department links (section index pages) and
+faculty names (department pages) three ways:
+- full: a complete html.parser tree, as the scraper originally built
+- strained: html.parser building only the elements the scraper reads
+  (parse_index / parse_department_page with SoupStrainer)
+- strained lxml: the same with the lxml backend, when it is installed
+
+Pages come from a directory of saved Wayback pages (by default the scraper's
+page cache, admin/.scrape_cache/objects). Without saved pages, synthetic pages
+padded with Wayback-style navigation and boilerplate are used instead. Every
+mode must extract exactly the same links and names.
+
+Usage:
+    python -m benchmarks.bench_scrape_parsing [--pages DIR] [--repeat N]
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import time
+
+from bs4 import BeautifulSoup
+
+import admin.scrape_faculty as scrape_faculty
+from admin.scrape_faculty import WebScraper, DEFAULT_CACHE_DIR
+
+SECTION = "arts_sciences"
+
+_BOILERPLATE = "".join(
+    f'<div class="wb-toolbar"><a href="/web/2014/http://catalog.uoregon.edu/page{i}/">Page {i}</a>'
+    f'<span>Captured {i} times</span><script>var x{i} = {i};</script></div>'
+    for i in range(400)
+)
+
+
+def synthetic_pages(count=40):
+    """Index and department pages shaped like the archived catalog."""
+    links = "".join(f'<li><a href="/web/2014/http://catalog.uoregon.edu/{SECTION}/dept{i}/">Dept {i}</a></li>'
+                    for i in range(60))
+    index = (f'<html><head><title>Arts and Sciences</title></head><body>{_BOILERPLATE}'
+             f'<ul class="nav" id="/{SECTION}/">{links}</ul>{_BOILERPLATE}</body></html>')
+    pages = [index]
+    for i in range(count - 1):
+        faculty = "".join(f'<p class="facultylist">Person{j} X. Dept{i}, professor (1990). Ph.D., Somewhere.</p>'
+                          for j in range(50))
+        pages.append(f'<html><head><title>Dept {i} &lt; University of Oregon</title></head><body>'
+                     f'{_BOILERPLATE}<p>Intro text</p>{faculty}{_BOILERPLATE}</body></html>')
+    return pages
+
+
+def load_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, "r", encoding="utf-8") as file:
+            pages.append(file.read())
+    return pages
+
+
+def is_index(text):
+    return f'id="/{SECTION}/"' in text
+
+
+def extract_full(scraper, text):
+    soup = BeautifulSoup(text, "html.parser")
+    if is_index(text):
+        return scraper.get_departments(soup, SECTION)
+    return soup.find("title").text, scraper.get_faculty(soup)
+
+
+def extract_strained(scraper, text):
+    if is_index(text):
+        return scraper.get_departments(scraper.parse_index(text, SECTION), SECTION)
+    soup = scraper.parse_department_page(text)
+    return soup.find("title").text, scraper.get_faculty(soup)
+
+
+def time_mode(function, scraper, pages, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in pages:
+            function(scraper, text)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and parse-only extraction of catalog pages.")
+    parser.add_argument("--pages", default=os.path.join(DEFAULT_CACHE_DIR, "objects"),
+                        help="Directory of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per mode")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    source = args.pages
+    if not pages:
+        pages, source = synthetic_pages(), "synthetic pages"
+    size = sum(len(page) for page in pages) / 1e6
+    print(f"{len(pages)} pages ({size:.1f} MB) from {source}\n")
+
+    scraper = WebScraper("https://web.archive.org", cache_dir=None)
+    modes = [("full html.parser", extract_full, "html.parser"),
+             ("strained html.parser", extract_strained, "html.parser")]
+    try:
+        import lxml  # noqa: F401
+        modes.append(("strained lxml", extract_strained, "lxml"))
+    except ImportError:
+        print("lxml is not installed; skipping the lxml backend\n")
+
+    baseline = None
+    reference = None
+    for label, function, backend in modes:
+        scraper_parser = scrape_faculty.HTML_PARSER
+        scrape_faculty.HTML_PARSER = backend
+        try:
+            results = [function(scraper, text) for text in pages]
+            milliseconds = time_mode(function, scraper, pages, args.repeat)
+        finally:
+            scrape_faculty.HTML_PARSER = scraper_parser
+        reference = reference or results
+        baseline = baseline or milliseconds
+        same = "same results" if results == reference else "DIFFERENT RESULTS"
+        print(f"{label:<22}{milliseconds:>10.1f} ms{baseline / milliseconds:>8.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
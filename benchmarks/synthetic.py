@@ -0,0 +1,69 @@
+# synthetic.py
+
+"""
+Synthetic grade data for the EasyA benchmarks.
+
+Generates gradedata.js files shaped like the real export (course id keys
+mapping to lists of section entries) at any scale, so query and import
+benchmarks can be run against 1x, 10x or 100x the shipped dataset. Department
+codes deliberately include prefix collisions (CH/CHN, BI/BIO) so prefix-regex
+filters show their false matches.
+"""
+
+import json
+import random
+
+DEPARTMENTS = ["ANTH", "ASTR", "BI", "BIO", "CH", "CHN", "CIS", "GEOG", "GEOL",
+               "HPHY", "MATH", "PHYS", "PSY"]
+TERMS = ["Fall", "Winter", "Spring", "Summer"]
+YEARS = list(range(2013, 2017))
+
+# Roughly the size of the shipped gradedata.js at scale 1
+COURSES_PER_DEPARTMENT = 30
+INSTRUCTORS_PER_DEPARTMENT = 40
+SECTIONS_PER_COURSE = 8
+
+
+def generate_grade_data(scale: int = 1, seed: int = 422) -> dict:
+    """
+    Build a gradedata dictionary.
+
+    Args:
+        scale: Multiplier for the number of courses, instructors and sections
+        seed: Random seed so runs are repeatable
+    """
+    rng = random.Random(seed)
+    data = {}
+    for department in DEPARTMENTS:
+        instructors = [f"Instructor{i}, {department.title()} {chr(65 + i % 26)}."
+                       for i in range(INSTRUCTORS_PER_DEPARTMENT * scale)]
+        # course numbers run out at 600 per department, so larger scales add sections instead
+        numbers = rng.sample(range(100, 700), min(600, COURSES_PER_DEPARTMENT * scale))
+        sections = round(SECTIONS_PER_COURSE * COURSES_PER_DEPARTMENT * scale / len(numbers))
+        for number in numbers:
+            entries = []
+            for _ in range(sections):
+                a = rng.uniform(5, 70)
+                d = rng.uniform(0, 12)
+                f = rng.uniform(0, 10)
+                b = rng.uniform(5, max(5.0, 100 - a - d - f))
+                entries.append({
+                    "TERM_DESC": f"{rng.choice(TERMS)} {rng.choice(YEARS)}",
+                    "aprec": f"{a:.1f}",
+                    "bprec": f"{b:.1f}",
+                    "cprec": f"{max(0.0, 100 - a - b - d - f):.1f}",
+                    "dprec": f"{d:.1f}",
+                    "fprec": f"{f:.1f}",
+                    "crn": str(rng.randint(10000, 39999)),
+                    "instructor": rng.choice(instructors),
+                })
+            data[f"{department}{number}"] = entries
+    return data
+
+
+def write_grade_file(path: str, scale: int = 1, seed: int = 422) -> None:
+    """Write a synthetic gradedata.js file to path."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("var groups = ")
+        json.dump(generate_grade_data(scale, seed), file)
+        file.write(";\n")
@@ -0,0 +1,307 @@
+# columnar_store.py
+
+"""
+In-Memory Columnar Backend for EasyA Grade Analysis System
+
+For read-only student use the whole grade dataset fits comfortably in RAM, so
+this module offers an alternative to running every group-by as a MongoDB
+aggregation. ColumnarGradeStore loads grade_distributions once into NumPy
+column arrays and answers the same GradeQueries interface as DatabaseManager
+(group_stats, get_course_stats, get_department_stats, get_instructor_stats),
+which also makes QueryBuilder work on top of it unchanged.
+
+Layout:
+- String fields (department, course_id, instructor_name, term) are dictionary
+  encoded: the column holds int32 codes and a parallel list maps codes back
+  to strings.
+- Numeric fields (number, level, year, term_ordinal, is_regular_faculty,
+  percent_a, percent_df, total_students) are stored as typed arrays; an
+  unknown enrollment is stored as 0 and an unknown term as ordinal -1.
+
+Queries build a boolean mask from the filters (exact values, or $gte/$lte
+style ranges such as term ranges) and group with np.bincount (one pass for
+the counts and one per metric), so a query costs a few vectorized passes over
+the rows and no database round trip. Spread statistics (group_stats with
+spread=True) add sums of squares, their enrollment-weighted versions and
+np.minimum.at/np.maximum.at passes, and are only computed when asked for. Percentiles use the same fixed-bin
+histograms as the rollup cells (see histogram.py), counted with one bincount
+over (group, bin), so both backends return the same estimates.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pymongo.errors import PyMongoError
+
+from src.data.db_manager import GradeQueries, METRICS
+from src.data.histogram import HISTOGRAM_BINS, bin_indexes
+from src.utils.helpers import term_ordinal
+
+# Dictionary-encoded string columns
+ENCODED_FIELDS = ("department", "course_id", "instructor_name", "term")
+
+# Range operators accepted in filters, as in MongoDB queries
+RANGE_OPERATORS = {"$gte": np.greater_equal, "$gt": np.greater, "$lte": np.less_equal, "$lt": np.less}
+
+# Plain typed columns
+NUMERIC_FIELDS = {
+    "number": np.int32,
+    "level": np.int32,
+    "year": np.int32,
+    "term_ordinal": np.int32,
+    "is_regular_faculty": np.bool_,
+    "percent_a": np.float64,
+    "percent_df": np.float64,
+    "total_students": np.int32,
+}
+
+
+class ColumnarGradeStore(GradeQueries):
+    def __init__(self, columns: Dict[str, np.ndarray], dictionaries: Dict[str, List[str]],
+                 generation: int = 0, source=None, check_interval: float = 2.0):
+        """
+        Initialize the store from already built columns.
+
+        Args:
+            columns: Field name -> array (int32 codes for ENCODED_FIELDS)
+            dictionaries: Encoded field name -> list of strings indexed by code
+            generation: Dataset generation the columns were built from
+            source: Optional DatabaseManager to reload from when its generation changes
+            check_interval: Seconds between generation checks against source
+        """
+        self.source = source
+        self.check_interval = check_interval
+        self._checked_at = time.monotonic()
+        # queries may run on worker threads; a reload must not swap the
+        # columns out from under a running query
+        self._lock = threading.RLock()
+        self._set_columns(columns, dictionaries, generation)
+
+    @classmethod
+    def from_database(cls, db_manager, check_interval: float = 2.0) -> "ColumnarGradeStore":
+        """
+        Load grade_distributions from MongoDB into a new store.
+
+        Args:
+            db_manager: DatabaseManager to read from (and to watch for new data)
+            check_interval: Seconds between generation checks against db_manager
+        """
+        columns, dictionaries, generation = cls._load(db_manager)
+        return cls(columns, dictionaries, generation, source=db_manager, check_interval=check_interval)
+
+    @classmethod
+    def from_rows(cls, rows) -> "ColumnarGradeStore":
+        """
+        Build a store from grade rows that already carry every field in
+        ENCODED_FIELDS and NUMERIC_FIELDS (total_students and term_ordinal may
+        be missing).
+        """
+        return cls(*cls._encode(rows))
+
+    @classmethod
+    def _load(cls, db_manager):
+        """Read every grade row once and encode it into columns."""
+        return db_manager.read_consistent(lambda: cls._read(db_manager))
+
+    @classmethod
+    def _read(cls, db_manager):
+        generation = db_manager.get_generation()
+        courses = {
+            course["course_id"]: course
+            for course in db_manager.courses.find({}, {"_id": 0, "course_id": 1, "department": 1,
+                                                       "number": 1, "level": 1})
+        }
+
+        def records():
+            projection = {"_id": 0, "course_id": 1, "department": 1, "number": 1, "level": 1,
+                          "instructor_name": 1, "year": 1, "term": 1,
+                          "percent_a": 1, "percent_df": 1, "is_regular_faculty": 1, "total_students": 1}
+            for row in db_manager.grade_distributions.find({}, projection):
+                # rows imported before course attributes were denormalized fall back to courses
+                course = row if "department" in row else courses.get(row.get("course_id"), {})
+                yield {
+                    "department": course.get("department", ""),
+                    "course_id": row.get("course_id", ""),
+                    "instructor_name": row.get("instructor_name", ""),
+                    "term": row.get("term", ""),
+                    "number": course.get("number", 0),
+                    "level": course.get("level", 0),
+                    "year": row.get("year", 0),
+                    "is_regular_faculty": bool(row.get("is_regular_faculty", False)),
+                    "percent_a": row.get("percent_a", 0.0),
+                    "percent_df": row.get("percent_df", 0.0),
+                    "total_students": row.get("total_students") or 0,
+                }
+
+        columns, dictionaries = cls._encode(records())
+        return columns, dictionaries, generation
+
+    @staticmethod
+    def _encode(records):
+        """Dictionary-encode string fields and pack every field into typed arrays."""
+        codes = {field: {} for field in ENCODED_FIELDS}
+        values = {field: [] for field in list(ENCODED_FIELDS) + list(NUMERIC_FIELDS)}
+        for record in records:
+            for field in ENCODED_FIELDS:
+                values[field].append(codes[field].setdefault(record[field], len(codes[field])))
+            for field in NUMERIC_FIELDS:
+                values[field].append(_numeric_value(record, field))
+
+        columns = {field: np.array(values[field], dtype=np.int32) for field in ENCODED_FIELDS}
+        columns.update({field: np.array(values[field], dtype=dtype) for field, dtype in NUMERIC_FIELDS.items()})
+        dictionaries = {field: list(codes[field]) for field in ENCODED_FIELDS}
+        return columns, dictionaries
+
+    def _set_columns(self, columns, dictionaries, generation):
+        self.columns = columns
+        self.dictionaries = dictionaries
+        self.generation = generation
+        self._codes = {field: {value: code for code, value in enumerate(strings)}
+                       for field, strings in dictionaries.items()}
+        self.size = len(columns["percent_a"])
+
+    def get_generation(self) -> int:
+        """Return the dataset generation the columns were loaded from."""
+        return self.generation
+
+    def refresh_if_stale(self) -> bool:
+        """
+        Reload from the source database if its generation moved on.
+        Checks at most once per check_interval seconds.
+
+        Returns:
+            True if the columns were reloaded
+        """
+        now = time.monotonic()
+        if self.source is None or now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        try:
+            if self.source.get_generation() == self.generation:
+                return False
+            loaded = self._load(self.source)
+        except PyMongoError:
+            return False  # database unreachable: keep serving the loaded columns
+        self._set_columns(*loaded)
+        return True
+
+    def _mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Build a row mask for exact-match and range filters.
+        Returns None when a filter value does not occur in the data at all.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for field, value in (filters or {}).items():
+            if isinstance(value, dict):
+                for operator, bound in value.items():
+                    mask &= RANGE_OPERATORS[operator](self.columns[field], bound)
+            elif field in self._codes:
+                code = self._codes[field].get(value)
+                if code is None:
+                    return None
+                mask &= self.columns[field] == code
+            else:
+                mask &= self.columns[field] == value
+        return mask
+
+    def _group_stats(self, group_by: str, filters: Optional[Dict[str, Any]],
+                     sort_by: Optional[str], spread: bool = False) -> List[Dict[str, Any]]:
+        """Vectorized equivalent of DatabaseManager._group_stats."""
+        with self._lock:
+            self.refresh_if_stale()
+            return self._group_columns(group_by, filters, sort_by, spread)
+
+    def _group_histograms(self, group_by: str, filters: Optional[Dict[str, Any]], metric: str):
+        """Vectorized equivalent of DatabaseManager._group_histograms: one bincount over (group, bin)."""
+        with self._lock:
+            self.refresh_if_stale()
+            mask = self._mask(filters)
+            if mask is None or not mask.any():
+                return []
+            labels, group_codes = self._group_codes(group_by, mask)
+            cells = group_codes.astype(np.intp) * HISTOGRAM_BINS + bin_indexes(self.columns[metric][mask])
+            histograms = np.bincount(cells, minlength=len(labels) * HISTOGRAM_BINS).reshape(-1, HISTOGRAM_BINS)
+            present = np.flatnonzero(histograms.any(axis=1))
+            return [(labels[code], histograms[code].tolist()) for code in present.tolist()]
+
+    def _group_codes(self, group_by: str, mask: np.ndarray):
+        """Return (group labels, group code per selected row) for a group-by field."""
+        if group_by in self.dictionaries:
+            return self.dictionaries[group_by], self.columns[group_by][mask]
+        labels, group_codes = np.unique(self.columns[group_by][mask], return_inverse=True)
+        return labels.tolist(), group_codes
+
+    def _group_columns(self, group_by, filters, sort_by, spread):
+        mask = self._mask(filters)
+        if mask is None or not mask.any():
+            return []
+
+        labels, group_codes = self._group_codes(group_by, mask)
+        bins = len(labels)
+
+        counts = np.bincount(group_codes, minlength=bins)
+        present = np.flatnonzero(counts)
+        class_count = counts[present]
+        stats = {"class_count": class_count.tolist()}
+        if spread:
+            weights = self.columns["total_students"][mask].astype(np.float64)
+            students = np.bincount(group_codes, weights=weights, minlength=bins)[present]
+            stats["students"] = students.astype(np.int64).tolist()
+        for metric in METRICS:
+            values = self.columns[metric][mask]
+            avg = np.bincount(group_codes, weights=values, minlength=bins)[present] / class_count
+            stats[f"avg_{metric}"] = avg.tolist()
+            if spread:
+                stats.update(_spread_stats(metric, values, avg, class_count, weights, students, group_codes, present, bins))
+
+        results = [
+            dict({field: column[i] for field, column in stats.items()}, _id=labels[code])
+            for i, code in enumerate(present.tolist())
+        ]
+        if sort_by:
+            # same order as the MongoDB backend: metric descending, then _id ascending
+            results.sort(key=lambda r: r["_id"])
+            results.sort(key=lambda r: r[sort_by], reverse=True)
+        return results
+
+
+def _spread_stats(metric: str, values: np.ndarray, avg: np.ndarray, class_count: np.ndarray, weights: np.ndarray,
+                  students: np.ndarray, group_codes: np.ndarray, present: np.ndarray, bins: int) -> Dict[str, List]:
+    """Variance, extremes and enrollment-weighted mean and variance of one metric, per present group."""
+    mean_sq = np.bincount(group_codes, weights=values * values, minlength=bins)[present] / class_count
+    weighted = weights * values
+    wsum = np.bincount(group_codes, weights=weighted, minlength=bins)[present]
+    wsumsq = np.bincount(group_codes, weights=weighted * values, minlength=bins)[present]
+    enrolled = students > 0
+    wavg = np.divide(wsum, students, out=np.zeros_like(wsum), where=enrolled)
+    wmean_sq = np.divide(wsumsq, students, out=np.zeros_like(wsum), where=enrolled)
+    lowest = np.full(bins, np.inf)
+    highest = np.full(bins, -np.inf)
+    np.minimum.at(lowest, group_codes, values)
+    np.maximum.at(highest, group_codes, values)
+    return {
+        f"var_{metric}": np.maximum(0, mean_sq - avg * avg).tolist(),
+        f"min_{metric}": lowest[present].tolist(),
+        f"max_{metric}": highest[present].tolist(),
+        f"wavg_{metric}": _where_enrolled(wavg, enrolled),
+        f"wvar_{metric}": _where_enrolled(np.maximum(0, wmean_sq - wavg * wavg), enrolled),
+    }
+
+
+def _where_enrolled(values: np.ndarray, enrolled: np.ndarray) -> List[Optional[float]]:
+    """Per-group values as a list, with None for groups without a known enrollment."""
+    return [value if known else None for value, known in zip(values.tolist(), enrolled.tolist())]
+
+
+def _numeric_value(record: Dict[str, Any], field: str):
+    """A row's value for a numeric column, filling the fields rows may omit."""
+    if field == "total_students":
+        return record.get(field) or 0  # unknown enrollment
+    if field == "term_ordinal":
+        ordinal = record.get(field)
+        if ordinal is None:
+            ordinal = term_ordinal(record["term"], record["year"])
+        return -1 if ordinal is None else ordinal
+    return record[field]
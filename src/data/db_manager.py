@@ -17,58 +17,330 @@ Collections managed:
 - courses: Stores course information (department, number, level)
 - instructors: Stores instructor information (name, faculty status, departments)
 - grade_distributions: Stores individual grade distribution records
+- grade_rollups: Materialized sums and counts per (department, level, course,
+  instructor, year, term, faculty flag) cell, rebuilt at import time. All
+  comparison queries aggregate these cells instead of the raw rows. Cells
+  are per term and carry a term_ordinal, so year and term range filters are
+  a single index range scan over the cells.
+- dataset_versions: Tracks versioned imports (live version and archived rollbacks)
+- dataset_meta: Holds the dataset generation counter used to invalidate query
+  caches, and marks the dataset as changing while a version swap renames its
+  collections (see DatabaseManager.read_consistent)
 """
 
-from pymongo import MongoClient
-from typing import List, Dict, Any, Optional
+import time
+from pymongo import MongoClient, ReturnDocument
+from typing import List, Dict, Any, Callable, Optional, Sequence
 from src.data.models import Course, Instructor, GradeDistribution
+from src.data.histogram import BIN_KEYS, BIN_WIDTH, HISTOGRAM_BINS, quantiles
+from src.utils.helpers import term_name, term_range_filter
+from src.data.query_cache import QueryCache, canonical_filters, normalize_filters
 
-class DatabaseManager:
-    def __init__(self, connection_string: str = "mongodb://localhost:27017/"):
+# Collections that make up one version of the grade dataset
+DATASET_COLLECTIONS = ("courses", "instructors", "grade_distributions", "grade_rollups")
+
+# How long readers wait before checking again whether a dataset change finished
+CHANGE_RETRY_SECONDS = 0.05
+
+# Fields that identify one rollup cell; every query filter must use these
+ROLLUP_KEYS = ("department", "level", "number", "course_id", "instructor_name",
+               "year", "term", "term_ordinal", "is_regular_faculty")
+
+# Per-section metrics summarized in every rollup cell
+METRICS = ("percent_a", "percent_df")
+
+# Section weight for enrollment-weighted statistics; sections imported
+# without a student count weigh nothing
+ENROLLMENT = {"$ifNull": ["$total_students", 0]}
+
+# Index key specs per dataset collection
+INDEXES = {
+    "grade_distributions": [
+        [("course_id", 1), ("instructor_name", 1), ("year", 1), ("term", 1)],
+        # serves department and department + level searches, with optional term range/faculty filters
+        [("department", 1), ("level", 1), ("term_ordinal", 1), ("is_regular_faculty", 1)],
+        # serves single course searches by department + number
+        [("department", 1), ("number", 1), ("term_ordinal", 1)],
+    ],
+    "courses": [
+        [("department", 1), ("level", 1)],
+        [("course_id", 1)],
+    ],
+    "instructors": [
+        [("name", 1), ("departments", 1)],
+    ],
+    "grade_rollups": [
+        # term ranges (and single years, which are ranges of four terms) scan
+        # one contiguous stretch of these indexes
+        [("department", 1), ("level", 1), ("term_ordinal", 1), ("is_regular_faculty", 1)],
+        [("course_id", 1), ("term_ordinal", 1)],
+        [("instructor_name", 1), ("term_ordinal", 1)],
+    ],
+}
+
+
+def rollup_pipeline(rollups_name: str) -> List[Dict[str, Any]]:
+    """
+    Build the aggregation pipeline that materializes grade_rollups.
+
+    Grade rows carry their course's department, number and level (schema
+    version 2, see admin/migrate_db.py), so rows are summed straight into one
+    cell per ROLLUP_KEYS combination without joining courses, and written to
+    rollups_name with $out, which replaces the old cells atomically.
+
+    Every cell holds, per metric, the sums needed to merge cells into means
+    and variances later (sum, sum of squares, and their enrollment-weighted
+    counterparts), the minimum and maximum, and a fixed-bin histogram
+    (hist_<metric>, see histogram.py) for percentiles, all from this single
+    $group.
+
+    Args:
+        rollups_name: Name of the collection to write the cells to
+    """
+    return [
+        {"$addFields": {
+            f"bin_{metric}": {"$min": [HISTOGRAM_BINS - 1,
+                                       {"$max": [0, {"$floor": {"$divide": [f"${metric}", BIN_WIDTH]}}]}]}
+            for metric in METRICS
+        }},
+        {"$group": {
+            "_id": {
+                "department": "$department",
+                "level": "$level",
+                "number": "$number",
+                "course_id": "$course_id",
+                "instructor_name": "$instructor_name",
+                "year": "$year",
+                "term": "$term",
+                "term_ordinal": "$term_ordinal",
+                "is_regular_faculty": {"$ifNull": ["$is_regular_faculty", False]}
+            },
+            "count": {"$sum": 1},
+            "students": {"$sum": ENROLLMENT},
+            **_cell_accumulators(),
+            **{f"hist_{metric}_{key}": {"$sum": {"$cond": [{"$eq": [f"$bin_{metric}", i]}, 1, 0]}}
+               for metric in METRICS for i, key in enumerate(BIN_KEYS)}
+        }},
+        {"$project": dict(
+            {"_id": 0, "count": 1, "students": 1},
+            **{field: 1 for field in _cell_accumulators()},
+            **{f"hist_{metric}": {key: f"$hist_{metric}_{key}" for key in BIN_KEYS} for metric in METRICS},
+            **{key: f"$_id.{key}" for key in ROLLUP_KEYS}
+        )},
+        {"$out": rollups_name}
+    ]
+
+
+def _cell_accumulators() -> Dict[str, Any]:
+    """$group accumulators summarizing the sections of one rollup cell, per metric."""
+    accumulators = {}
+    for metric in METRICS:
+        value = f"${metric}"
+        accumulators.update({
+            f"sum_{metric}": {"$sum": value},
+            f"sumsq_{metric}": {"$sum": {"$multiply": [value, value]}},
+            f"wsum_{metric}": {"$sum": {"$multiply": [ENROLLMENT, value]}},
+            f"wsumsq_{metric}": {"$sum": {"$multiply": [ENROLLMENT, value, value]}},
+            f"min_{metric}": {"$min": value},
+            f"max_{metric}": {"$max": value},
+        })
+    return accumulators
+
+
+def build_rollups(collections) -> None:
+    """
+    Rebuild the rollup cells for one set of dataset collections and bump the
+    dataset generation so cached query results are discarded.
+
+    Args:
+        collections: DatabaseManager or any object exposing
+                     grade_distributions and grade_rollups collections
+    """
+    collections.grade_distributions.aggregate(rollup_pipeline(collections.grade_rollups.name))
+    bump_generation(collections.grade_rollups.database)
+
+
+def bump_generation(database, changing: bool = False) -> int:
+    """
+    Increment the dataset generation counter stored in dataset_meta.
+
+    Args:
+        database: pymongo Database holding the dataset
+        changing: True while a change spanning several collections is under
+                  way; readers wait until a later bump clears it
+
+    Returns:
+        The new generation number
+    """
+    meta = database.dataset_meta.find_one_and_update(
+        {"_id": "generation"},
+        {"$inc": {"value": 1}, "$set": {"changing": changing}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return meta["value"]
+
+
+class GradeQueries:
+    """
+    Backend-independent query interface shared by DatabaseManager and the
+    in-memory ColumnarGradeStore. Subclasses provide _group_stats and a
+    cache attribute (a QueryCache, or None to disable caching); everything
+    else in the application queries grade data through these methods.
+    """
+    cache = None
+
+    def group_stats(self, group_by: str, filters: Optional[Dict[str, Any]] = None,
+                    sort_by: Optional[str] = None, spread: bool = False) -> List[Dict[str, Any]]:
         """
-        Initialize database connection and collections.
-        Creates a new MongoDB client connection and sets up collection references.
-        Also ensures all necessary indexes are created for optimal query performance.
-        
+        Aggregate rollup cells into per-group averages and class counts.
+        This is the single query primitive behind every comparison view. The
+        MongoDB backend only touches grade_rollups, so its cost depends on the
+        number of cells rather than the number of raw grade rows. Results are
+        served from the query cache when the same normalized query was run
+        against the current dataset generation.
+
         Args:
-            connection_string: MongoDB connection URL, defaults to localhost
+            group_by: Rollup field to group by (e.g., "instructor_name", "course_id")
+            filters: Conditions on rollup fields (see ROLLUP_KEYS): exact
+                     values, or for term_ordinal a {"$gte": ..., "$lte": ...}
+                     range (see term_range_filter)
+            sort_by: Optional result field to sort by in descending order
+                     (e.g., "avg_percent_a")
+            spread: Also compute the spread statistics below; they cost
+                    several extra passes, so comparison views leave them off
+
+        Returns:
+            List of dictionaries containing:
+            - _id: value of the group_by field
+            - avg_percent_a: average percentage of As
+            - avg_percent_df: average percentage of Ds and Fs
+            - class_count: number of classes in the group
+            and with spread, for each metric (percent_a, percent_df), computed in the same pass:
+            - var_<metric>: variance across the classes
+            - min_<metric>, max_<metric>: lowest and highest class value
+            - wavg_<metric>, wvar_<metric>: mean and variance weighted by
+              enrollment, over classes with a known student count
+              (None when no class in the group has one)
+            - students: total enrollment of the classes with a known count
         """
-        self.client = MongoClient(connection_string)
-        self.db = self.client.easya_db
-        
-        # Collections
-        self.courses = self.db.courses
-        self.instructors = self.db.instructors
-        self.grade_distributions = self.db.grade_distributions
-        
-        # Ensure indexes
-        self._create_indexes()
-    
-    def _create_indexes(self):
+        filters = canonical_filters(filters)
+        return self._cached(("group_stats", group_by, normalize_filters(filters), sort_by, spread),
+                            lambda: self._group_stats(group_by, filters, sort_by, spread))
+
+    def group_stats_page(self, group_by: str, filters: Optional[Dict[str, Any]], sort_by: str,
+                         page: int, page_size: int) -> Dict[str, Any]:
         """
-        Create MongoDB indexes for optimizing query performance.
-        Sets up compound indexes on frequently queried fields to improve
-        query execution time and efficiency. Includes:
-        - Compound index on grade distributions for course and instructor lookups
-        - Department and level index for course filtering
-        - Name and department index for instructor lookups
+        One page of group_stats results plus the total number of groups, so a
+        paged chart never holds more than the rows it shows.
+        Groups are ordered by sort_by descending, then by _id.
+
+        Args:
+            group_by: Rollup field to group by
+            filters: Conditions on rollup fields, as in group_stats
+            sort_by: Result field to sort by in descending order
+            page: Zero-based page number
+            page_size: Groups per page
+
+        Returns:
+            Dictionary with the page's rows (as group_stats returns them)
+            under "results" and the number of groups under "total"
         """
-        self.grade_distributions.create_index([
-            ("course_id", 1),
-            ("instructor_name", 1),
-            ("year", 1),
-            ("term", 1)
-        ])
-        self.courses.create_index([
-            ("department", 1),
-            ("level", 1)
-        ])
-        self.instructors.create_index([
-            ("name", 1),
-            ("departments", 1)
-        ])
-    
-    def get_course_stats(self, course_id: str) -> Dict[str, Any]:
+        filters = canonical_filters(filters)
+        # the cache stores lists of rows, so the page is cached as a one-item list
+        return self._cached(("group_stats_page", group_by, normalize_filters(filters), sort_by, page, page_size),
+                            lambda: [self._group_stats_page(group_by, filters, sort_by, page, page_size)])[0]
+
+    def group_stats_after(self, group_by: str, filters: Optional[Dict[str, Any]], sort_by: str,
+                          after: Optional[Dict[str, Any]], page_size: int) -> List[Dict[str, Any]]:
+        """
+        Keyset pagination: the page of groups that follows the row after in
+        the (sort_by descending, _id ascending) order. Unlike page numbers,
+        this needs no skip over the earlier groups and stays stable while
+        groups are ranked by a sort key shared by many of them.
+
+        Args:
+            group_by: Rollup field to group by
+            filters: Conditions on rollup fields, as in group_stats
+            sort_by: Result field to sort by in descending order
+            after: Last row of the previous page, or None for the first page
+            page_size: Groups per page
+
+        Returns:
+            Up to page_size rows, as group_stats returns them
+        """
+        filters = canonical_filters(filters)
+        position = (after[sort_by], after["_id"]) if after else None
+        return self._cached(("group_stats_after", group_by, normalize_filters(filters), sort_by, position, page_size),
+                            lambda: self._group_stats_after(group_by, filters, sort_by, position, page_size))
+
+    def group_percentiles(self, group_by: str, filters: Optional[Dict[str, Any]] = None,
+                          metric: str = "percent_a", percents=(25, 50, 75)) -> List[Dict[str, Any]]:
+        """
+        Estimate percentiles of a metric per group (e.g., the median % As per
+        instructor, or quartiles for box plots) by merging the histograms
+        stored on the rollup cells, so the cost depends on the number of
+        cells rather than raw rows. Estimates are within one histogram bin
+        (BIN_WIDTH percentage points) of the class value of that rank (see
+        histogram.py).
+
+        Args:
+            group_by: Rollup field to group by (e.g., "instructor_name", "course_id")
+            filters: Conditions on rollup fields, as in group_stats
+            metric: "percent_a" or "percent_df"
+            percents: Percentiles to estimate, from 0 to 100
+
+        Returns:
+            List of dictionaries ordered by _id, containing:
+            - _id: value of the group_by field
+            - class_count: number of classes in the group
+            - p<percent>: estimate per requested percentile (e.g., p50)
+            - histogram: merged class count per bin
+        """
+        filters, percents = canonical_filters(filters), tuple(percents)
+        return self._cached(("group_percentiles", group_by, normalize_filters(filters), metric, percents),
+                            lambda: self._group_percentiles(group_by, filters, metric, percents))
+
+    def _group_percentiles(self, group_by, filters, metric, percents):
+        results = []
+        for group, histogram in sorted(self._group_histograms(group_by, filters, metric),
+                                       key=lambda pair: (pair[0] is None, pair[0])):
+            row = {"_id": group, "class_count": int(sum(histogram)), "histogram": list(histogram)}
+            row.update({f"p{percent:g}": value
+                        for percent, value in zip(percents, quantiles(histogram, percents))})
+            results.append(row)
+        return results
+
+    def _cached(self, key, compute):
+        """Return the cached result for key, computing and caching it on a miss."""
+        if self.cache is None:
+            return compute()
+        results = self.cache.get(key)
+        if results is None:
+            results = compute()
+            self.cache.put(key, results)
+        return results
+
+    def _group_stats_page(self, group_by, filters, sort_by, page, page_size):
+        """Slices the full group_stats results; backends may push this into the query."""
+        results = self._group_stats(group_by, filters, sort_by)
+        return {"results": results[page * page_size:(page + 1) * page_size], "total": len(results)}
+
+    def _group_stats_after(self, group_by, filters, sort_by, position, page_size):
+        """Scans the full group_stats results; backends may push this into the query."""
+        results = self._group_stats(group_by, filters, sort_by)
+        if position is not None:
+            value, last_id = position
+            results = [r for r in results if r[sort_by] < value or (r[sort_by] == value and r["_id"] > last_id)]
+        return results[:page_size]
+
+    def _term_series(self, series):
+        """One group_stats by term per series; backends may batch these into one query."""
+        return [sorted(self._group_stats("term_ordinal", filters, None), key=lambda r: (r["_id"] is None, r["_id"]))
+                for filters in series]
+
+    def get_course_stats(self, course_id: str, start: Optional[str] = None,
+                         end: Optional[str] = None) -> Dict[str, Any]:
         """
         Retrieve grade statistics for a specific course.
         Aggregates grade distribution data for all instructors who have taught
@@ -76,6 +348,8 @@ class DatabaseManager:
 
         Args:
             course_id: Course identifier (e.g., "MATH111")
+            start: Optional first term or year included (e.g., "Fall 2013")
+            end: Optional last term or year included (e.g., "Spring 2016")
             
         Returns:
             List of dictionaries containing aggregated statistics per instructor:
@@ -84,18 +358,10 @@ class DatabaseManager:
             - average percentage of Ds and Fs
             - total number of classes taught
         """
-        pipeline = [
-            {"$match": {"course_id": course_id}},
-            {"$group": {
-                "_id": "$instructor_name",
-                "avg_percent_a": {"$avg": "$percent_a"},
-                "avg_percent_df": {"$avg": "$percent_df"},
-                "class_count": {"$sum": 1}
-            }}
-        ]
-        return list(self.grade_distributions.aggregate(pipeline))
+        return self.group_stats("instructor_name", dict({"course_id": course_id}, **term_range_filter(start, end)))
     
-    def get_department_stats(self, department: str, level: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_department_stats(self, department: str, level: Optional[int] = None, start: Optional[str] = None,
+                             end: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Retrieve grade statistics for an entire department, optionally filtered by course level.
         Aggregates grade distributions across all courses in a department, with optional
@@ -104,6 +370,8 @@ class DatabaseManager:
         Args:
             department: Department code (e.g., "MATH")
             level: Optional course level filter (e.g., 100, 200, etc.)
+            start: Optional first term or year included (e.g., "Fall 2013")
+            end: Optional last term or year included (e.g., "Spring 2016")
             
         Returns:
             List of dictionaries containing aggregated statistics per instructor:
@@ -112,25 +380,14 @@ class DatabaseManager:
             - average percentage of Ds and Fs
             - total number of classes taught
         """
-        match_stage = {"department": department}
+        filters = {"department": department}
         if level:
-            match_stage["level"] = level
-            
-        courses = self.courses.find(match_stage)
-        course_ids = [course["course_id"] for course in courses]
-        
-        pipeline = [
-            {"$match": {"course_id": {"$in": course_ids}}},
-            {"$group": {
-                "_id": "$instructor_name",
-                "avg_percent_a": {"$avg": "$percent_a"},
-                "avg_percent_df": {"$avg": "$percent_df"},
-                "class_count": {"$sum": 1}
-            }}
-        ]
-        return list(self.grade_distributions.aggregate(pipeline))
+            filters["level"] = level
+        filters.update(term_range_filter(start, end))
+        return self.group_stats("instructor_name", filters)
     
-    def get_instructor_stats(self, instructor_name: str) -> Dict[str, Any]:
+    def get_instructor_stats(self, instructor_name: str, start: Optional[str] = None,
+                             end: Optional[str] = None) -> Dict[str, Any]:
         """
         Retrieve grade statistics for a specific instructor across all their courses.
         Aggregates all grade distributions for the specified instructor, providing
@@ -138,6 +395,8 @@ class DatabaseManager:
 
         Args:
             instructor_name: Name of the instructor
+            start: Optional first term or year included (e.g., "Fall 2013")
+            end: Optional last term or year included (e.g., "Spring 2016")
             
         Returns:
             List of dictionaries containing aggregated statistics per course:
@@ -146,13 +405,260 @@ class DatabaseManager:
             - average percentage of Ds and Fs
             - total number of times taught
         """
+        return self.group_stats("course_id", dict({"instructor_name": instructor_name}, **term_range_filter(start, end)))
+
+    def get_trend(self, field: str, value: Any, metric: str = "percent_a", start: Optional[str] = None,
+                  end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Retrieve the per-term series of a metric for one course, instructor or
+        department, e.g. how an instructor's % As moved over the years.
+
+        Args:
+            field: "course_id", "instructor_name" or "department" (any rollup field works)
+            value: Value of that field (e.g., "MATH111")
+            metric: "percent_a" or "percent_df"
+            start: Optional first term or year included (e.g., "Fall 2013")
+            end: Optional last term or year included (e.g., "Spring 2016")
+
+        Returns:
+            One point per term with classes, in term order (see get_trends)
+        """
+        return self.get_trends([dict({field: value}, **term_range_filter(start, end))], metric)[0]
+
+    def get_trends(self, series: Sequence[Dict[str, Any]], metric: str = "percent_a") -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve per-term series for several selections at once (e.g., every
+        line of a trend chart). Rollup cells are per term, so a series is a
+        group_stats by term_ordinal; the MongoDB backend answers every series
+        in one aggregation. Both metrics are cached together, so switching
+        the metric does not query again.
+
+        Args:
+            series: Filters selecting each series, as in group_stats
+                    (e.g., {"department": "MATH", "instructor_name": "Smith, John"})
+            metric: "percent_a" or "percent_df"
+
+        Returns:
+            One list per series, in term order, of dictionaries containing:
+            - term_ordinal: ordinal of the term (see helpers.term_ordinal)
+            - term: name of the term (e.g., "Fall 2014")
+            - average: average of the metric over the term's classes
+            - class_count: number of classes in the term
+        """
+        series = [canonical_filters(filters) for filters in series]
+        stats = self._cached(("term_series", tuple(normalize_filters(filters) for filters in series)),
+                             lambda: self._term_series(series))
+        return [
+            [{"term_ordinal": r["_id"], "term": term_name(r["_id"]), "average": r[f"avg_{metric}"],
+              "class_count": r["class_count"]}
+             for r in rows if r["_id"] is not None and r["_id"] >= 0]  # skip rows without a known term
+            for rows in stats
+        ]
+
+
+class DatabaseManager(GradeQueries):
+    def __init__(self, connection_string: str = "mongodb://localhost:27017/",
+                 database_name: str = "easya_db"):
+        """
+        Initialize database connection and collections.
+        Creates a new MongoDB client connection and sets up collection references.
+        Also ensures all necessary indexes are created for optimal query performance.
+        
+        Args:
+            connection_string: MongoDB connection URL, defaults to localhost
+            database_name: Database to use, defaults to easya_db (benchmarks use their own)
+        """
+        self.client = MongoClient(connection_string)
+        self.db = self.client[database_name]
+        
+        # Collections
+        self.courses = self.db.courses
+        self.instructors = self.db.instructors
+        self.grade_distributions = self.db.grade_distributions
+        self.grade_rollups = self.db.grade_rollups
+        
+        # Dataset version bookkeeping for versioned imports
+        self.dataset_versions = self.db.dataset_versions
+        self.dataset_meta = self.db.dataset_meta
+        
+        # Results of repeated queries, invalidated whenever the generation changes
+        self.cache = QueryCache(self.get_generation)
+        
+        # Ensure indexes
+        self.create_indexes()
+    
+    def create_indexes(self, suffix: str = ""):
+        """
+        Create MongoDB indexes for optimizing query performance.
+        Sets up compound indexes on frequently queried fields to improve
+        query execution time and efficiency. Includes:
+        - Compound index on grade distributions for course and instructor lookups
+        - Department and level index for course filtering
+        - Name and department index for instructor lookups
+
+        Args:
+            suffix: Optional collection name suffix, used to index shadow
+                    collections (e.g., "_20250101120000") before they go live
+        """
+        for name, indexes in INDEXES.items():
+            for keys in indexes:
+                self.db[name + suffix].create_index(keys)
+    
+    def rebuild_rollups(self):
+        """
+        Recompute grade_rollups from grade_distributions.
+        Must be called after anything that rewrites raw rows in bulk
+        (imports, name standardization) so the comparison queries stay current.
+        """
+        build_rollups(self)
+        self.cache.invalidate(self.get_generation())
+
+    def get_generation(self) -> int:
+        """Return the current dataset generation (0 if nothing was ever imported)."""
+        meta = self.dataset_meta.find_one({"_id": "generation"})
+        return meta["value"] if meta else 0
+
+    def bump_generation(self, changing: bool = False) -> int:
+        """
+        Mark the live dataset as changed, invalidating this process's cache
+        immediately and other processes' caches on their next generation check.
+
+        Args:
+            changing: True before a change spanning several collections (e.g.,
+                      a version swap); the bump after it clears the mark
+        """
+        generation = bump_generation(self.db, changing)
+        self.cache.invalidate(generation)
+        return generation
+
+    def read_consistent(self, read: Callable[[], Any]) -> Any:
+        """
+        Run read() against a dataset that did not change while it ran.
+        Waits while the dataset is marked as changing and retries reads that
+        overlapped a generation bump, so a read never mixes collections of two
+        versions or sees one renamed away mid-swap.
+
+        Args:
+            read: Function doing the database reads
+        """
+        while True:
+            meta = self.dataset_meta.find_one({"_id": "generation"}) or {}
+            if meta.get("changing"):
+                time.sleep(CHANGE_RETRY_SECONDS)
+                continue
+            result = read()
+            if self.get_generation() == meta.get("value", 0):
+                return result
+
+    def _cached(self, key, compute):
+        """Cached results are computed with read_consistent."""
+        return super()._cached(key, lambda: self.read_consistent(compute))
+
+    def _group_stats(self, group_by: str, filters: Optional[Dict[str, Any]],
+                     sort_by: Optional[str], spread: bool = False) -> List[Dict[str, Any]]:
+        """Run the uncached rollup aggregation behind group_stats."""
+        pipeline = self._group_pipeline(group_by, filters, spread)
+        if sort_by:
+            pipeline.append({"$sort": {sort_by: -1, "_id": 1}})
+        return list(self.grade_rollups.aggregate(pipeline))
+
+    def _group_stats_page(self, group_by, filters, sort_by, page, page_size):
+        """Sort, skip, limit and count on the server in a single $facet stage."""
+        pipeline = self._group_pipeline(group_by, filters)
+        pipeline.append({"$facet": {
+            "results": [
+                {"$sort": {sort_by: -1, "_id": 1}},
+                {"$skip": page * page_size},
+                {"$limit": page_size}
+            ],
+            "total": [{"$count": "groups"}]
+        }})
+        facets = next(self.grade_rollups.aggregate(pipeline))
+        total = facets["total"][0]["groups"] if facets["total"] else 0
+        return {"results": facets["results"], "total": total}
+
+    def _group_stats_after(self, group_by, filters, sort_by, position, page_size):
+        """Match past the previous page's last row on the server, then sort and limit."""
+        pipeline = self._group_pipeline(group_by, filters)
+        if position is not None:
+            value, last_id = position
+            pipeline.append({"$match": {"$or": [
+                {sort_by: {"$lt": value}},
+                {sort_by: value, "_id": {"$gt": last_id}}
+            ]}})
+        pipeline += [{"$sort": {sort_by: -1, "_id": 1}}, {"$limit": page_size}]
+        return list(self.grade_rollups.aggregate(pipeline))
+
+    def _term_series(self, series):
+        """
+        Every series in one aggregation: a $match on any series' filters
+        narrows the cells through the indexes, then $facet runs the per-term
+        group pipeline of each series over those cells.
+        """
+        if not series:
+            return []
+        facets = {f"series_{i}": self._group_pipeline("term_ordinal", filters) + [{"$sort": {"_id": 1}}]
+                  for i, filters in enumerate(series)}
+        pipeline = [{"$match": {"$or": [filters or {} for filters in series]}}, {"$facet": facets}]
+        result = next(self.grade_rollups.aggregate(pipeline))
+        return [result[f"series_{i}"] for i in range(len(series))]
+
+    def _group_histograms(self, group_by: str, filters: Optional[Dict[str, Any]], metric: str):
+        """Sum the matching cells' histogram bins per group, in one $group over the cells."""
         pipeline = [
-            {"$match": {"instructor_name": instructor_name}},
-            {"$group": {
-                "_id": "$course_id",
-                "avg_percent_a": {"$avg": "$percent_a"},
-                "avg_percent_df": {"$avg": "$percent_df"},
-                "class_count": {"$sum": 1}
-            }}
+            {"$match": filters or {}},
+            {"$group": dict({"_id": f"${group_by}"},
+                            **{key: {"$sum": f"$hist_{metric}.{key}"} for key in BIN_KEYS})}
         ]
-        return list(self.grade_distributions.aggregate(pipeline))
\ No newline at end of file
+        return [(row["_id"], [row[key] for key in BIN_KEYS]) for row in self.grade_rollups.aggregate(pipeline)]
+
+    def _group_pipeline(self, group_by: str, filters: Optional[Dict[str, Any]],
+                        spread: bool = False) -> List[Dict[str, Any]]:
+        """
+        Pipeline stages merging the matching rollup cells into per-group
+        averages and class counts. With spread, the same $group pass also
+        merges the cells' sums of squares, enrollment-weighted sums and
+        extremes, and a second projection derives variances from them
+        (E[x^2] - E[x]^2).
+        """
+        sums = ["count"] + [f"sum_{metric}" for metric in METRICS]
+        if spread:
+            sums += ["students"] + [f"{prefix}_{metric}" for metric in METRICS
+                                    for prefix in ("sumsq", "wsum", "wsumsq")]
+        group = {"_id": f"${group_by}"}
+        group.update({field: {"$sum": f"${field}"} for field in sums})
+        means = {"class_count": "$count"}
+        means.update({f"avg_{metric}": {"$divide": [f"$sum_{metric}", "$count"]} for metric in METRICS})
+        if not spread:
+            return [{"$match": filters or {}}, {"$group": group}, {"$project": means}]
+
+        means["students"] = 1
+        spreads = {"class_count": 1, "students": 1}
+        for metric in METRICS:
+            avg, wavg = f"avg_{metric}", f"wavg_{metric}"
+            group[f"min_{metric}"] = {"$min": f"$min_{metric}"}
+            group[f"max_{metric}"] = {"$max": f"$max_{metric}"}
+            means.update({
+                wavg: {"$cond": [{"$gt": ["$students", 0]},
+                                 {"$divide": [f"$wsum_{metric}", "$students"]}, None]},
+                f"mean_sq_{metric}": {"$divide": [f"$sumsq_{metric}", "$count"]},
+                f"wmean_sq_{metric}": {"$cond": [{"$gt": ["$students", 0]},
+                                                 {"$divide": [f"$wsumsq_{metric}", "$students"]}, None]},
+                f"min_{metric}": 1,
+                f"max_{metric}": 1,
+            })
+            spreads.update({
+                avg: 1,
+                wavg: 1,
+                f"var_{metric}": _variance(f"$mean_sq_{metric}", f"${avg}"),
+                f"wvar_{metric}": {"$cond": [{"$eq": [f"${wavg}", None]}, None,
+                                             _variance(f"$wmean_sq_{metric}", f"${wavg}")]},
+                f"min_{metric}": 1,
+                f"max_{metric}": 1,
+            })
+        return [{"$match": filters or {}}, {"$group": group}, {"$project": means}, {"$project": spreads}]
+
+
+def _variance(mean_square: str, mean: str) -> Dict[str, Any]:
+    """E[x^2] - E[x]^2, clamped at zero against rounding error."""
+    return {"$max": [0.0, {"$subtract": [mean_square, {"$multiply": [mean, mean]}]}]}
@@ -0,0 +1,63 @@
+# histogram.py
+
+"""
+Mergeable Percent Histograms for EasyA Grade Analysis System
+
+Medians and other percentiles cannot be merged from sums the way averages
+can, and sorting raw rows for every query does not scale. Every rollup cell
+therefore also stores a fixed-bin histogram of each metric: HISTOGRAM_BINS
+equal-width bins over 0-100 %, each holding the number of classes whose value
+falls into it. Histograms merge by adding bin counts, so a department or level
+percentile query only sums the matching cells' bins (O(cells), no rescan of
+the grade rows), and both query backends share the bins and the quantile
+estimate below, so they return identical percentiles.
+
+Quantiles are interpolated linearly inside the bin holding the requested
+rank, so the estimate of percentile p is never further than one bin width
+(BIN_WIDTH percentage points) from the class value of that rank, the
+ceil(p / 100 * n)-th smallest of the n values.
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+HISTOGRAM_BINS = 50
+BIN_WIDTH = 100.0 / HISTOGRAM_BINS
+
+# Bin keys of the histogram subdocuments stored on rollup cells
+BIN_KEYS = [f"b{i:02d}" for i in range(HISTOGRAM_BINS)]
+
+
+def bin_indexes(values: np.ndarray) -> np.ndarray:
+    """Histogram bin of each percentage; 100 % falls into the last bin."""
+    return np.clip((np.asarray(values, dtype=np.float64) // BIN_WIDTH).astype(np.intp), 0, HISTOGRAM_BINS - 1)
+
+
+def quantiles(histogram: Sequence[int], percents: Sequence[float]) -> List[float]:
+    """
+    Estimate percentiles of the values counted in a histogram.
+
+    Args:
+        histogram: Class count per bin (HISTOGRAM_BINS entries)
+        percents: Percentiles to estimate, from 0 to 100 (e.g., 25, 50, 75)
+
+    Returns:
+        One estimate per requested percentile, or Nones for an empty histogram
+    """
+    counts = np.asarray(histogram, dtype=np.float64)
+    cumulative = np.cumsum(counts)
+    total = cumulative[-1]
+    if total == 0:
+        return [None for _ in percents]
+
+    estimates = []
+    for percent in percents:
+        rank = percent / 100.0 * total
+        # the bin holding the rank-th value; rank 0 is the first non-empty bin
+        index = int(np.searchsorted(cumulative, rank, side="left" if rank > 0 else "right"))
+        index = min(index, HISTOGRAM_BINS - 1)
+        before = cumulative[index - 1] if index else 0.0
+        fraction = (rank - before) / counts[index]
+        estimates.append(float((index + fraction) * BIN_WIDTH))
+    return estimates
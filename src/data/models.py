@@ -6,6 +6,8 @@ These models define the structure of our database documents and provide
 type hints for the rest of the application.
 """
 
+from src.utils.helpers import split_course_id, term_ordinal
+
 class Course:
     def __init__(self, course_id: str, department: str, number: int, level: int):
         """
@@ -58,6 +60,10 @@ class GradeDistribution:
                  term: str, percent_a: float, percent_df: float, total_students: int):
         """
         Initialize a GradeDistribution object.
+        Course attributes (department, number, level) are derived from the
+        course id and stored on every row, so queries never need to join
+        against the courses collection. The term ordinal is derived from
+        term and year for term range filters.
         
         Args:
             course_id: Course identifier (e.g., 'MATH111')
@@ -69,9 +75,11 @@ class GradeDistribution:
             total_students: Total number of students
         """
         self.course_id = course_id
+        self.department, self.number, self.level = split_course_id(course_id) or (course_id, None, None)
         self.instructor_name = instructor_name
         self.year = year
         self.term = term
+        self.term_ordinal = term_ordinal(term, year)
         self.percent_a = percent_a
         self.percent_df = percent_df
         self.total_students = total_students
@@ -80,9 +88,13 @@ class GradeDistribution:
         """Convert GradeDistribution object to dictionary for MongoDB storage"""
         return {
             'course_id': self.course_id,
+            'department': self.department,
+            'number': self.number,
+            'level': self.level,
             'instructor_name': self.instructor_name,
             'year': self.year,
             'term': self.term,
+            'term_ordinal': self.term_ordinal,
             'percent_a': self.percent_a,
             'percent_df': self.percent_df,
             'total_students': self.total_students
@@ -15,6 +15,7 @@ Key Features:
 - Handles metric switching between "Easy A" (percent As) and "Just Pass" (percent Ds/Fs)
 - Provides sorted results for optimal visualization presentation
 - Calculates class counts for each data point
+- Restricts any comparison to a span of terms (e.g., Fall 2013 through Spring 2016)
 
 This module is crucial for:
 1. Supporting side-by-side comparisons of instructors within same courses
@@ -22,6 +23,9 @@ This module is crucial for:
 3. Facilitating comparison between regular faculty and all instructors
 4. Supporting all graphing requirements specified in project documentation
 
+All queries run against the grade_rollups cells through DatabaseManager.group_stats,
+so they cost one aggregation over pre-summed cells rather than a scan of raw rows.
+
 Dependencies:
 - DatabaseManager for executing the constructed queries
 - MongoDB for query execution
@@ -29,6 +33,7 @@ Dependencies:
 
 from typing import List, Dict, Any, Optional
 from .db_manager import DatabaseManager
+from src.utils.helpers import term_range_filter
 
 class QueryBuilder:
     def __init__(self, db_manager: DatabaseManager):
@@ -46,7 +51,9 @@ class QueryBuilder:
         course_number: Optional[int] = None,
         level: Optional[int] = None,
         instructors_only: bool = False,
-        metric: str = "percent_a"  # or "percent_df"
+        metric: str = "percent_a",  # or "percent_df"
+        start: Optional[str] = None,
+        end: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Build a query for comparing grade distributions across instructors.
@@ -62,6 +69,8 @@ class QueryBuilder:
             level: Optional course level for filtering (e.g., 100)
             instructors_only: If True, only include regular faculty
             metric: Which metric to compare ("percent_a" or "percent_df")
+            start: Optional first term or year included (e.g., "Fall 2013")
+            end: Optional last term or year included (e.g., "Spring 2016")
         
         Returns:
             List of dictionaries containing:
@@ -74,51 +83,29 @@ class QueryBuilder:
             support the visualization requirement of ordering bars from highest
             to lowest.
         """
-        # Base pipeline stages
-        pipeline = []
-        
-        # Match stage for courses
-        match_stage = {"department": department}
+        # Match stage for rollup cells
+        filters = {"department": department}
         if course_number:
-            match_stage["number"] = course_number
+            filters["number"] = course_number
         elif level:
-            match_stage["level"] = level
-        
-        # Get relevant courses
-        courses = self.db.courses.find(match_stage)
-        course_ids = [course["course_id"] for course in courses]
+            filters["level"] = level
         
-        # Add course filter to pipeline
-        pipeline.append({"$match": {"course_id": {"$in": course_ids}}})
-        
-        # Add instructor filter if needed
+        # Faculty status is carried on every rollup cell, so no instructor lookup is needed
         if instructors_only:
-            regular_faculty = self.db.instructors.find(
-                {"is_regular_faculty": True},
-                {"name": 1}
-            )
-            faculty_names = [f["name"] for f in regular_faculty]
-            pipeline.append({"$match": {"instructor_name": {"$in": faculty_names}}})
-        
-        # Group by instructor and calculate statistics
-        pipeline.append({
-            "$group": {
-                "_id": "$instructor_name",
-                "average": {"$avg": f"${metric}"},
-                "class_count": {"$sum": 1}
-            }
-        })
-        
-        # Sort by the metric
-        pipeline.append({"$sort": {"average": -1}})
+            filters["is_regular_faculty"] = True
+
+        # Terms are numbered consecutively, so any span is one range on the cells
+        filters.update(term_range_filter(start, end))
         
-        return list(self.db.grade_distributions.aggregate(pipeline))
+        return self._averages("instructor_name", filters, metric)
 
     def build_level_comparison_query(
         self,
         department: str,
         level: int,
-        metric: str = "percent_a"
+        metric: str = "percent_a",
+        start: Optional[str] = None,
+        end: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Build a query for comparing different courses within the same level.
@@ -130,6 +117,8 @@ class QueryBuilder:
             department: Department code (e.g., "MATH")
             level: Course level to compare (e.g., 400 for 400-level courses)
             metric: Which metric to compare ("percent_a" or "percent_df")
+            start: Optional first term or year included (e.g., "Fall 2013")
+            end: Optional last term or year included (e.g., "Spring 2016")
         
         Returns:
             List of dictionaries containing:
@@ -142,20 +131,16 @@ class QueryBuilder:
             the visualization requirement of showing highest to lowest
             grade distributions.
         """
-        pipeline = [
-            # Match courses at the specified level
-            {"$match": {
-                "department": department,
-                "level": level
-            }},
-            # Group by course
-            {"$group": {
-                "_id": "$course_id",
-                "average": {"$avg": f"${metric}"},
-                "class_count": {"$sum": 1}
-            }},
-            # Sort by average
-            {"$sort": {"average": -1}}
+        filters = dict({"department": department, "level": level}, **term_range_filter(start, end))
+        return self._averages("course_id", filters, metric)
+
+    def _averages(self, group_by: str, filters: Dict[str, Any], metric: str) -> List[Dict[str, Any]]:
+        """
+        Run a rollup group-by and reshape it into {_id, average, class_count}
+        rows sorted by the requested metric.
+        """
+        results = self.db.group_stats(group_by, filters, sort_by=f"avg_{metric}")
+        return [
+            {"_id": r["_id"], "average": r[f"avg_{metric}"], "class_count": r["class_count"]}
+            for r in results
         ]
-        
-        return list(self.db.grade_distributions.aggregate(pipeline))
\ No newline at end of file
@@ -0,0 +1,155 @@
+# query_cache.py
+
+"""
+Query Result Cache for EasyA Grade Analysis System
+
+Keeps the results of recent comparison queries in memory so that re-running the
+same department/level/year search (from either side of the GUI) does not go
+back to MongoDB. Entries are keyed by the normalized query parameters and
+evicted least-recently-used first once either the entry or the row limit is
+exceeded.
+
+Invalidation is driven by a dataset generation counter that every import,
+rollup rebuild and dataset swap increments. The cache polls the counter at
+most once per check_interval seconds, so changes made by the admin tools in
+another process are picked up within that interval, while changes made
+through the same DatabaseManager invalidate the cache immediately.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Fields whose string values are case-insensitive codes (e.g., "math" == "MATH")
+_CODE_FIELDS = ("department", "course_id")
+
+
+def canonical_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return a copy of a filter dictionary with its values in the form stored
+    in the data: department and course codes are upper-cased, strings are
+    stripped and digit-only strings become the integers they represent.
+    Queries must run with these filters, so that equivalent searches (e.g.,
+    "math" and "MATH") return the same rows and share a cache entry.
+    """
+    canonical = {}
+    for field, value in (filters or {}).items():
+        if isinstance(value, str):
+            value = value.strip()
+            if field in _CODE_FIELDS:
+                value = value.upper()
+            elif value.isdigit():
+                value = int(value)
+        elif isinstance(value, dict):
+            value = canonical_filters(value)
+        canonical[field] = value
+    return canonical
+
+
+def normalize_filters(filters: Optional[Dict[str, Any]]) -> Tuple:
+    """
+    Turn a filter dictionary into a hashable, order-independent key part.
+    Values are taken as they are, so pass the filters the query actually
+    runs with (see canonical_filters).
+    """
+    normalized = []
+    for field, value in (filters or {}).items():
+        if isinstance(value, dict):
+            value = normalize_filters(value)
+        elif isinstance(value, (list, tuple)):
+            value = tuple(value)
+        normalized.append((field, value))
+    return tuple(sorted(normalized, key=lambda item: item[0]))
+
+
+class QueryCache:
+    def __init__(self, generation_source: Callable[[], int], max_entries: int = 256,
+                 max_rows: int = 50000, check_interval: float = 2.0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            generation_source: Callable returning the current dataset generation
+            max_entries: Maximum number of cached query results
+            max_rows: Maximum total number of result rows held across all entries
+            check_interval: Seconds between generation checks against the source
+        """
+        self.generation_source = generation_source
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.check_interval = check_interval
+
+        self._entries = OrderedDict()
+        self._rows = 0
+        self._generation = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[list]:
+        """Return a copy of the cached result for key, or None on a miss."""
+        self._check_generation()
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(result)
+
+    def put(self, key: Hashable, result: list) -> None:
+        """Store a query result, evicting least recently used entries as needed."""
+        if len(result) > self.max_rows:
+            return
+        self._check_generation()
+        with self._lock:
+            if key in self._entries:
+                self._rows -= len(self._entries.pop(key))
+            self._entries[key] = list(result)
+            self._rows += len(result)
+            while len(self._entries) > self.max_entries or self._rows > self.max_rows:
+                _, evicted = self._entries.popitem(last=False)
+                self._rows -= len(evicted)
+                self.evictions += 1
+
+    def invalidate(self, generation: Optional[int] = None) -> None:
+        """Drop every entry, optionally recording the generation it is now valid for."""
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+            self.invalidations += 1
+            if generation is not None:
+                self._generation = generation
+                self._checked_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for monitoring cache effectiveness."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "rows": self._rows,
+                "generation": self._generation,
+            }
+
+    def _check_generation(self) -> None:
+        now = time.monotonic()
+        if self._generation is not None and now - self._checked_at < self.check_interval:
+            return
+        generation = self.generation_source()
+        with self._lock:
+            self._checked_at = now
+            if generation == self._generation:
+                return
+        self.invalidate(generation)
@@ -0,0 +1,160 @@
+# snapshot.py
+
+"""
+Binary Dataset Snapshots for EasyA Grade Analysis System
+
+A snapshot is a single file holding the typed column arrays and string
+dictionaries of a ColumnarGradeStore, so the student window can start from it
+in milliseconds without parsing gradedata.js or even contacting MongoDB.
+
+File layout (little endian):
+- 8 byte magic b"EASYASNP"
+- uint32 format version, uint32 header length
+- UTF-8 JSON header: row count, dataset generation, creation time, and for
+  every column its dtype, byte offset and length, plus the string dictionaries
+- column data, each block aligned to ALIGNMENT bytes
+
+Columns are loaded as read-only NumPy views over a memory map of the file, so
+opening a snapshot only reads the header up front.
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.data.columnar_store import ColumnarGradeStore
+
+MAGIC = b"EASYASNP"
+FORMAT_VERSION = 3
+ALIGNMENT = 64
+
+# Where the admin tools write the snapshot and the student window reads it
+DEFAULT_SNAPSHOT_PATH = "src/data/gradedata.snapshot"
+
+_PREAMBLE = struct.Struct("<II")
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_snapshot(path: str, store: ColumnarGradeStore) -> None:
+    """
+    Write a store's columns to a snapshot file.
+    The file is written next to path and renamed over it, so a reader never
+    sees a partially written snapshot.
+
+    Args:
+        path: Destination file path
+        store: ColumnarGradeStore to persist
+    """
+    arrays = {name: np.ascontiguousarray(column) for name, column in store.columns.items()}
+    header = {
+        "rows": store.size,
+        "generation": store.generation,
+        "created_at": time.time(),
+        "dictionaries": store.dictionaries,
+        "columns": {},
+    }
+
+    # offsets depend on the header length, which depends on the offsets;
+    # iterate until the header size stops changing
+    header_length = 0
+    while True:
+        offset = _aligned(len(MAGIC) + _PREAMBLE.size + header_length)
+        for name, array in arrays.items():
+            header["columns"][name] = {"dtype": array.dtype.str, "offset": offset, "length": len(array)}
+            offset = _aligned(offset + array.nbytes)
+        encoded = json.dumps(header).encode("utf-8")
+        if len(encoded) == header_length:
+            break
+        header_length = len(encoded)
+    file_size = offset
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(_PREAMBLE.pack(FORMAT_VERSION, len(encoded)))
+        file.write(encoded)
+        for name, array in arrays.items():
+            file.seek(header["columns"][name]["offset"])
+            file.write(array.tobytes())
+        # every block offset must lie inside the file, including those of
+        # empty columns past the last written byte
+        file.truncate(file_size)
+    os.replace(temp_path, path)
+
+
+def read_header(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a snapshot's header without touching its column data.
+
+    Returns:
+        The header dictionary, or None if the file is missing, not a snapshot
+        or written in a different format version
+    """
+    try:
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                return None
+            version, header_length = _PREAMBLE.unpack(file.read(_PREAMBLE.size))
+            if version != FORMAT_VERSION:
+                return None
+            return json.loads(file.read(header_length).decode("utf-8"))
+    except (OSError, struct.error, ValueError):
+        return None
+
+
+def load_snapshot(path: str, source=None, check_interval: float = 2.0) -> ColumnarGradeStore:
+    """
+    Open a snapshot as a ColumnarGradeStore backed by a read-only memory map.
+
+    Args:
+        path: Snapshot file path
+        source: Optional DatabaseManager the store reloads from once its
+                generation moves past the snapshot's, like a store loaded
+                with ColumnarGradeStore.from_database
+        check_interval: Seconds between generation checks against source
+
+    Raises:
+        ValueError: if path is not a readable snapshot of this format version,
+                    or its column data is truncated
+    """
+    header = read_header(path)
+    if header is None:
+        raise ValueError(f"{path} is not a valid snapshot")
+
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    columns = {
+        name: np.frombuffer(mapped, dtype=np.dtype(spec["dtype"]), count=spec["length"], offset=spec["offset"])
+        if spec["length"] else np.empty(0, dtype=np.dtype(spec["dtype"]))
+        for name, spec in header["columns"].items()
+    }
+    return ColumnarGradeStore(columns, header["dictionaries"], header["generation"],
+                              source=source, check_interval=check_interval)
+
+
+def is_snapshot_fresh(path: str, source_path: Optional[str] = None) -> bool:
+    """
+    Check whether a snapshot can be used instead of importing.
+
+    A snapshot is stale when it is missing, unreadable, from another format
+    version, or older than source_path (e.g., a gradedata.js that was replaced
+    after the snapshot was written).
+
+    Args:
+        path: Snapshot file path
+        source_path: Optional data file the snapshot must be newer than
+    """
+    header = read_header(path)
+    if header is None:
+        return False
+    if source_path and os.path.exists(source_path):
+        return os.path.getmtime(source_path) <= header["created_at"]
+    return True
@@ -0,0 +1,99 @@
+# async_queries.py
+
+"""
+Background Query Dispatch for the EasyA Student Window
+
+Queries run on a small thread pool so the Tk main loop keeps repainting while
+MongoDB (or the columnar store) works. Results are handed back through a
+queue drained with root.after, so result callbacks always run on the Tk
+thread and may update widgets.
+
+Each graph side only cares about its latest request: every submit for a side
+supersedes the previous one, which is cancelled if it has not started and
+has its result dropped if it has.
+"""
+
+import queue
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+# How often finished queries are picked up from the Tk main loop
+POLL_INTERVAL_MS = 30
+
+
+class QueryDispatcher:
+    def __init__(self, root, max_workers: int = 2, poll_interval_ms: int = POLL_INTERVAL_MS):
+        """
+        Args:
+            root: Tk root window whose main loop delivers the results
+            max_workers: Number of queries that may run at the same time
+            poll_interval_ms: Milliseconds between checks for finished queries
+        """
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="query")
+        self._finished: queue.Queue = queue.Queue()
+        self._latest: Dict[str, int] = {}
+        self._futures: Dict[str, Future] = {}
+        self._polling = False
+
+    def submit(self, key: str, query: Callable[[], Any],
+               on_result: Callable[[Any], None],
+               on_error: Callable[[Exception], None]) -> None:
+        """
+        Run query() in the background and deliver its outcome on the Tk thread.
+        A later submit with the same key supersedes this one.
+
+        Args:
+            key: Request stream, e.g. the graph side ("left" or "right")
+            query: Function doing the blocking work
+            on_result: Called with the query's return value
+            on_error: Called with the exception the query raised
+        """
+        token = self._latest.get(key, 0) + 1
+        self._latest[key] = token
+        previous = self._futures.get(key)
+        if previous is not None:
+            previous.cancel()
+
+        def run():
+            try:
+                self._finished.put((key, token, on_result, query()))
+            except Exception as error:
+                self._finished.put((key, token, on_error, error))
+
+        self._futures[key] = self._executor.submit(run)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval_ms, self.poll)
+
+    def pending(self, key: str) -> bool:
+        """True while the latest request for key has not been delivered."""
+        return key in self._futures
+
+    def poll(self) -> None:
+        """Deliver finished queries; keeps rescheduling itself while any are outstanding."""
+        while True:
+            try:
+                key, token, callback, payload = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            if self._latest.get(key) != token:
+                continue  # superseded by a newer request for the same key
+            del self._futures[key]
+            try:
+                callback(payload)
+            except Exception:
+                # Report it like Tk reports a failing callback, but keep
+                # delivering the other results
+                traceback.print_exc()
+
+        if self._futures:
+            self.root.after(self.poll_interval_ms, self.poll)
+        else:
+            self._polling = False
+
+    def shutdown(self) -> None:
+        """Stop the worker threads, dropping queries that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
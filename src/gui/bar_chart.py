@@ -0,0 +1,126 @@
+# bar_chart.py
+
+"""
+Persistent Bar Chart for the EasyA Student Window
+
+Clearing the figure and rebuilding axes, bars and labels (plus tight_layout and
+a full canvas.draw) on every page change or metric toggle made each redraw cost
+a full render. BarChart builds its axes and a fixed pool of artists once:
+
+- one bar, one count label and one x-axis label per result slot on a page
+- the title and y-axis label
+
+Updates only change bar heights, texts and visibility. Those artists are
+animated, so a redraw restores the cached static background (axes, grid, ticks)
+and draws just them before blitting the figure. A full draw (first paint,
+window resize) goes through draw_idle and refreshes the cached background.
+
+With animated=False the artists are ordinary ones, for static rendering
+(e.g., fig.savefig in the headless chart exporter).
+"""
+
+from typing import List, Sequence
+
+from matplotlib.transforms import blended_transform_factory
+
+# Fixed margins replace per-redraw tight_layout; the bottom leaves room for
+# rotated course and instructor names
+SUBPLOT_MARGINS = {"left": 0.12, "right": 0.97, "top": 0.9, "bottom": 0.3}
+
+
+class BarChart:
+    def __init__(self, fig, canvas, color: str, slots: int, animated: bool = True):
+        """
+        Args:
+            fig: matplotlib Figure to draw into
+            canvas: Canvas the figure is shown on (e.g., FigureCanvasTkAgg)
+            color: Bar color
+            slots: Most bars shown at once (results per page)
+            animated: Blit updates over a cached background; False for static rendering
+        """
+        self.fig = fig
+        self.canvas = canvas
+        self.slots = slots
+        self._background = None
+
+        fig.subplots_adjust(**SUBPLOT_MARGINS)
+        self.ax = ax = fig.add_subplot(111)
+        ax.set_xlim(-0.5, slots - 0.5)
+        ax.set_ylim(0, 100)
+        ax.set_xticks(range(slots))
+        ax.tick_params(axis="x", labelbottom=False)
+        ax.grid(True, axis="y", linestyle="--", alpha=0.7)
+        ax.set_axisbelow(True)
+
+        self.bars = list(ax.bar(range(slots), [0] * slots, color=color, alpha=0.7))
+        self.count_labels = [ax.text(i, 0, "", ha="center", va="bottom") for i in range(slots)]
+        # x positions in data coordinates, y just below the axes
+        below_axis = blended_transform_factory(ax.transData, ax.transAxes)
+        self.x_labels = [
+            ax.text(i, -0.02, "", transform=below_axis, rotation=45,
+                    ha="right", va="top", rotation_mode="anchor")
+            for i in range(slots)
+        ]
+        self.title = ax.set_title("")
+        # The axis draws its own label even when animated, so use a plain text
+        self.y_label = ax.text(-0.1, 0.5, "", transform=ax.transAxes, rotation=90,
+                               ha="center", va="center")
+
+        self.animated: List = [*self.bars, *self.count_labels, *self.x_labels, self.title, self.y_label]
+        if animated:
+            for artist in self.animated:
+                artist.set_animated(True)
+            canvas.mpl_connect("draw_event", self._on_draw)
+
+    def update(self, labels: Sequence[str], values: Sequence[float], counts: Sequence[int],
+               show_counts: bool, y_label: str, title: str) -> None:
+        """Show one page of results (see set_data) and redraw."""
+        self.set_data(labels, values, counts, show_counts, y_label, title)
+        self.redraw()
+
+    def set_data(self, labels: Sequence[str], values: Sequence[float], counts: Sequence[int],
+                 show_counts: bool, y_label: str, title: str) -> None:
+        """
+        Update the artists for one page of results without drawing.
+        Slots beyond len(labels) are hidden.
+
+        Args:
+            labels: x-axis label per bar
+            values: Bar heights (percentages)
+            counts: Class count per bar
+            show_counts: Whether to label bars with their class count
+            y_label: y-axis label text
+            title: Chart title
+        """
+        for i, (bar, count_label, x_label) in enumerate(zip(self.bars, self.count_labels, self.x_labels)):
+            visible = i < len(labels)
+            bar.set_visible(visible)
+            count_label.set_visible(visible and show_counts)
+            x_label.set_visible(visible)
+            if not visible:
+                continue
+            bar.set_height(values[i])
+            count_label.set_y(values[i])
+            count_label.set_text(f"n={counts[i]}")
+            x_label.set_text(labels[i])
+
+        self.y_label.set_text(y_label)
+        self.title.set_text(title)
+
+    def redraw(self) -> None:
+        """Blit the animated artists over the cached background, or schedule a full draw."""
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.fig.bbox)
+
+    def _on_draw(self, event) -> None:
+        """After a full draw, cache the static background and paint the animated artists."""
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self) -> None:
+        for artist in self.animated:
+            self.fig.draw_artist(artist)
@@ -3,11 +3,40 @@ from tkinter import ttk
 from tkinter import messagebox
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from pymongo.errors import PyMongoError
 from src.data.db_manager import DatabaseManager
-from admin.import_data import DataImporter
+from src.data.columnar_store import ColumnarGradeStore
+from src.data.snapshot import DEFAULT_SNAPSHOT_PATH, is_snapshot_fresh, load_snapshot, write_snapshot
+from src.gui.async_queries import QueryDispatcher
+from src.gui.bar_chart import BarChart
+from src.gui.trend_chart import TrendChart
+from src.utils.helpers import parse_term_range
+
+# Data bundled with the application, imported on first launch
+DATA_FILE = "src/data/gradedata.js"
+
+# Redraw requests arriving within this many milliseconds are drawn once
+REDRAW_DELAY_MS = 50
+
+# Result field the bars are ranked by
+SORT_BY = "avg_percent_a"
+
+TERM_RANGE_HELP = ("Enter a year (2014), a range of years (2013-2016) "
+                   "or a range of terms (Fall 2013 - Spring 2016)")
 
 class DualWindowApp:
-    def __init__(self, root):
+    def __init__(self, root, backend="columnar", prepare_dataset=None):
+        """
+        Args:
+            root: Tk root window
+            backend: "columnar" to answer queries from in-memory NumPy columns,
+                     or "mongodb" to run them as MongoDB aggregations
+            prepare_dataset: Optional function(db_manager, data_file) importing
+                             the bundled data and writing a new snapshot (e.g.,
+                             admin.update_db.prepare_dataset); without it the
+                             window serves whatever the database holds
+        """
+        self.prepare_dataset = prepare_dataset
         self.root = root
         self.root.title("EasyA - Grade Comparison")
         self.root.geometry("1200x800")
@@ -21,8 +50,20 @@ class DualWindowApp:
         self.left_page = 0
         self.right_page = 0
         self.results_per_page = 8
-        self.left_current_results = []
-        self.right_current_results = []
+
+        # Only the pages viewed so far are fetched: page number -> rows,
+        # plus the search they belong to and its total number of results
+        self.left_pages = {}
+        self.right_pages = {}
+        self.left_total = 0
+        self.right_total = 0
+        self.left_query = None
+        self.right_query = None
+
+        # Trend mode: per-term series of the shown page, with the
+        # (search, page, metric) they were fetched for
+        self.left_trends = (None, [])
+        self.right_trends = (None, [])
 
         self.departments = [
             "ANTH",  # Anthropology
@@ -43,9 +84,12 @@ class DualWindowApp:
             "400-level", "500-level", "600-level"
         ]
 
-        self.db_manager = DatabaseManager()
-        importer = DataImporter(self.db_manager)
-        importer.import_grade_data("src/data/gradedata.js")
+        self.db_manager = self.open_dataset(backend)
+
+        # Queries run in the background; redraws are coalesced per side
+        self.queries = QueryDispatcher(self.root)
+        self.pending_redraws = set()
+        self.redraw_scheduled = False
 
         # Configure global styles
         self.style = ttk.Style()
@@ -98,6 +142,43 @@ class DualWindowApp:
         # Create footer
         self.create_footer()
 
+    def open_dataset(self, backend):
+        """
+        Return the query backend, importing the bundled data only when needed.
+        A fresh snapshot written by the admin tools (or a previous launch) is
+        memory-mapped directly and, like a store loaded from MongoDB, reloads
+        once the admin changes the live data. A snapshot that is missing,
+        unreadable, from another format version or older than the bundled data
+        file is rewritten from the live database. The bundled data is only
+        imported (through prepare_dataset, as a new dataset version with its
+        own snapshot) when the database is empty, so it never replaces data
+        the admin imported.
+        """
+        snapshot_fresh = is_snapshot_fresh(DEFAULT_SNAPSHOT_PATH, DATA_FILE)
+        source = None
+        if backend == "columnar" and snapshot_fresh:
+            try:
+                source = DatabaseManager()
+            except PyMongoError:
+                pass  # no database: serve the snapshot as written
+            try:
+                return load_snapshot(DEFAULT_SNAPSHOT_PATH, source=source)
+            except (OSError, ValueError):
+                snapshot_fresh = False  # unreadable (e.g., damaged); rewritten below
+
+        db_manager = source if source is not None else DatabaseManager()
+        if self.prepare_dataset is not None and db_manager.grade_distributions.estimated_document_count() == 0:
+            self.prepare_dataset(db_manager, DATA_FILE)
+            snapshot_fresh = True
+
+        if backend == "columnar":
+            # Same query interface, served from memory; reloads when the admin imports new data
+            store = ColumnarGradeStore.from_database(db_manager)
+            if not snapshot_fresh and store.size:
+                write_snapshot(DEFAULT_SNAPSHOT_PATH, store)
+            return store
+        return db_manager
+
     def create_graph_controls(self):
         """Create controls for graph display options"""
         # Grade type toggle
@@ -117,6 +198,23 @@ class DualWindowApp:
             command=self.update_all_graphs
         ).pack(side=tk.LEFT, padx=10, pady=5)
 
+        # Chart mode toggle: one bar per result, or one per-term line per result
+        self.chart_mode_var = tk.StringVar(value="bars")
+        ttk.Radiobutton(
+            self.control_panel,
+            text="Averages",
+            variable=self.chart_mode_var,
+            value="bars",
+            command=self.change_chart_mode
+        ).pack(side=tk.LEFT, padx=10, pady=5)
+        ttk.Radiobutton(
+            self.control_panel,
+            text="Trends",
+            variable=self.chart_mode_var,
+            value="trends",
+            command=self.change_chart_mode
+        ).pack(side=tk.LEFT, padx=10, pady=5)
+
         # Class count toggle
         self.count_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(
@@ -170,13 +268,25 @@ class DualWindowApp:
         fig = Figure(figsize=(6, 4), dpi=100)
         canvas = FigureCanvasTkAgg(fig, master=container)
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        chart = BarChart(fig, canvas, color='blue' if side == "left" else 'red', slots=self.results_per_page)
+
+        # The trend chart has its own canvas, packed in place of the bars in trend mode
+        trend_fig = Figure(figsize=(6, 4), dpi=100)
+        trend_canvas = FigureCanvasTkAgg(trend_fig, master=container)
+        trend_chart = TrendChart(trend_fig, trend_canvas, slots=self.results_per_page)
         
         if side == "left":
             self.left_fig = fig
             self.left_canvas = canvas
+            self.left_chart = chart
+            self.left_trend_canvas = trend_canvas
+            self.left_trend_chart = trend_chart
         else:
             self.right_fig = fig
             self.right_canvas = canvas
+            self.right_chart = chart
+            self.right_trend_canvas = trend_canvas
+            self.right_trend_chart = trend_chart
 
     def create_search_area(self, parent):
         """Create search parameters area"""
@@ -210,8 +320,9 @@ class DualWindowApp:
         entries['class'] = ttk.Entry(parent, width=10)
         entries['class'].grid(row=1, column=1, padx=5, pady=5)
 
-        ttk.Label(parent, text="Year:").grid(row=1, column=2, padx=5, pady=5)
-        entries['year'] = ttk.Entry(parent, width=8)
+        # A year, a year range ("2013-2016") or a term range ("Fall 2013 - Spring 2016")
+        ttk.Label(parent, text="Years/Terms:").grid(row=1, column=2, padx=5, pady=5)
+        entries['year'] = ttk.Entry(parent, width=22)
         entries['year'].grid(row=1, column=3, padx=5, pady=5)
 
         button_frame = ttk.Frame(parent)
@@ -250,7 +361,7 @@ class DualWindowApp:
         if level and level != "Show All":
             title_parts.append(f"Level: {level}")
         if year:
-            title_parts.append(f"Year: {year}")
+            title_parts.append(f"Terms: {year}")
             
         return " | ".join(title_parts) if title_parts else "No Search Parameters"
 
@@ -259,36 +370,120 @@ class DualWindowApp:
         self.show_as = self.grade_var.get() == "% As"
         self.show_class_count = self.count_var.get()
         
-        if hasattr(self, 'left_current_results'):
-            self.update_side_graph('left', self.left_current_results)
-        if hasattr(self, 'right_current_results'):
-            self.update_side_graph('right', self.right_current_results)
+        self.schedule_redraw('left')
+        self.schedule_redraw('right')
+
+    def change_chart_mode(self):
+        """Swap every graph between average bars and per-term trend lines."""
+        trends = self.chart_mode_var.get() == "trends"
+        for shown, hidden in ((self.left_trend_canvas, self.left_canvas),
+                              (self.right_trend_canvas, self.right_canvas)):
+            if not trends:
+                shown, hidden = hidden, shown
+            hidden.get_tk_widget().pack_forget()
+            shown.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        self.schedule_redraw('left')
+        self.schedule_redraw('right')
+
+    def schedule_redraw(self, side):
+        """
+        Redraw a side's graph shortly, on the Tk thread. Requests arriving
+        before the redraw runs (e.g., several toggles clicked quickly) are
+        merged into one draw of the latest state.
+        """
+        self.pending_redraws.add(side)
+        if not self.redraw_scheduled:
+            self.redraw_scheduled = True
+            self.root.after(REDRAW_DELAY_MS, self.flush_redraws)
+
+    def flush_redraws(self):
+        """Draw every side with a pending redraw request."""
+        sides, self.pending_redraws = self.pending_redraws, set()
+        self.redraw_scheduled = False
+        for side in sorted(sides):
+            self.update_side_graph(side)
+
+    def total_pages(self, side):
+        total = self.left_total if side == "left" else self.right_total
+        # An empty result still shows as "page 1 of 1"
+        return max(1, (total - 1) // self.results_per_page + 1)
 
     def change_page(self, side, direction):
         """Change the current page for the specified side
+        Pages already viewed are redrawn from memory; the next page of a
+        search is fetched in the background, starting after the last row
+        of the current page (keyset pagination).
         Args:
             side (str): 'left' or 'right'
             direction (int): 1 for next page, -1 for previous page
         """
+        if self.queries.pending(side):
+            return  # a search or page fetch for this side is still running
+
         if side == "left":
-            results = self.left_current_results
-            current_page = self.left_page
+            pages, query, current_page = self.left_pages, self.left_query, self.left_page
         else:
-            results = self.right_current_results
-            current_page = self.right_page
+            pages, query, current_page = self.right_pages, self.right_query, self.right_page
         
-        total_pages = (len(results) - 1) // self.results_per_page + 1
         new_page = current_page + direction
-        
-        if 0 <= new_page < total_pages:
-            if side == "left":
-                self.left_page = new_page
-                self.left_page_label.config(text=f"Page {new_page + 1} of {total_pages}")
-            else:
-                self.right_page = new_page
-                self.right_page_label.config(text=f"Page {new_page + 1} of {total_pages}")
-            
-            self.update_side_graph(side, results)
+        if not 0 <= new_page < self.total_pages(side):
+            return
+
+        if new_page in pages:
+            self.show_page(side, new_page, pages[new_page])
+            return
+
+        group_by, filters = query
+        after = pages[current_page][-1]
+        self.status_label.config(text="Status: Loading page...")
+        self.queries.submit(
+            side,
+            lambda: self.db_manager.group_stats_after(group_by, filters, SORT_BY, after, self.results_per_page),
+            on_result=lambda rows: self.show_page(side, new_page, rows),
+            on_error=self.show_query_error
+        )
+
+    def show_page(self, side, page, rows):
+        """Store one fetched page of a side's results and display it."""
+        if side == "left":
+            self.left_pages[page] = rows
+            self.left_page = page
+        else:
+            self.right_pages[page] = rows
+            self.right_page = page
+
+        self.schedule_redraw(side)
+        self.status_label.config(text=f"Status: Showing page {page + 1} of {self.total_pages(side)}")
+
+    def run_query(self, side, group_by, filters):
+        """
+        Run a rollup query for one side in the background, fetching only its
+        first page and the total number of results.
+        Only the newest query per side is shown; results of older queries
+        for that side that are still running are dropped.
+        """
+        self.status_label.config(text="Status: Searching...")
+        self.queries.submit(
+            side,
+            lambda: self.db_manager.group_stats_page(group_by, filters, SORT_BY, 0, self.results_per_page),
+            on_result=lambda first_page: self.show_results(side, (group_by, filters), first_page),
+            on_error=self.show_query_error
+        )
+
+    def show_results(self, side, query, first_page):
+        """Start a side over on the first page of a new search."""
+        if side == "left":
+            self.left_query, self.left_total, self.left_pages = query, first_page["total"], {}
+        else:
+            self.right_query, self.right_total, self.right_pages = query, first_page["total"], {}
+        self.show_page(side, 0, first_page["results"])
+        self.status_label.config(
+            text=f"Status: Found {first_page['total']} results ({self.total_pages(side)} pages)")
+
+    def show_query_error(self, error):
+        messagebox.showerror("Error", f"An error occurred: {str(error)}")
+        self.status_label.config(text="Status: Error fetching data")
 
     def handle_search(self, side, regular_faculty):
         """Handles searching by course number with an optional filter for Regular Faculty."""
@@ -302,63 +497,26 @@ class DualWindowApp:
             messagebox.showerror("Error", "Please select a department")
             return
 
-        course_id = department + class_num if class_num else None
-
-        try:
-            # Construct the base match condition
-            match_conditions = {}
-
-            # Ensure the department filter is properly applied
-            if department:
-                match_conditions["course_id"] = {"$regex": f"^{department}"}  # Matches BI101, BI202, etc.
-
-            if class_num:
-                match_conditions["course_id"] = department + class_num  # Exact course filter
+        # Build exact-match filters on the rollup cells
+        if class_num:
+            filters = {"course_id": department + class_num}  # Exact course filter
+        else:
+            filters = {"department": department}  # Every course in the department
 
-            if year:
-                try:
-                    match_conditions["year"] = int(year)
-                except ValueError:
-                    messagebox.showerror("Error", "Year must be a valid number")
-                    return
+        if year:
+            try:
+                first, last = parse_term_range(year)
+            except ValueError:
+                messagebox.showerror("Error", TERM_RANGE_HELP)
+                return
+            filters["term_ordinal"] = {"$gte": first, "$lte": last}
 
-            # Build the aggregation pipeline
-            pipeline = [{"$match": match_conditions}]
+        # if we're checking if its reg that add this in there
+        if regular_faculty:
+            filters["is_regular_faculty"] = True
 
-        
-            # if we're checking if its reg that add this in there
-            if regular_faculty:
-                pipeline.append({"$match": {"is_regular_faculty": True}})  # Move filter into pipeline
-
-            # Continue the aggregation
-            pipeline.extend([
-                {"$group": {
-                    "_id": "$instructor_name",
-                    "avg_percent_a": {"$avg": "$percent_a"},
-                    "avg_percent_df": {"$avg": "$percent_df"},
-                    "class_count": {"$sum": 1}
-                }},
-                {"$sort": {"avg_percent_a": -1}}
-            ])
-
-            # Execute the query
-            results = list(self.db_manager.grade_distributions.aggregate(pipeline))
-
-            # Reset pagination and store current results
-            if side == "left":
-                self.left_page = 0
-                self.left_current_results = results
-            else:
-                self.right_page = 0
-                self.right_current_results = results
-
-            self.update_side_graph(side, results)
-            total_pages = (len(results) - 1) // self.results_per_page + 1
-            self.status_label.config(text=f"Status: Found {len(results)} results ({total_pages} pages)")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-            self.status_label.config(text="Status: Error fetching data")
+        # Query the precomputed rollups in the background
+        self.run_query(side, "instructor_name", filters)
 
     def handle_level_search(self, side, regular_faculty):
         """Handles searching by course level with an optional filter for Regular Faculty."""
@@ -373,116 +531,101 @@ class DualWindowApp:
             messagebox.showerror("Error", "Please select both department and course level")
             return
 
-        try:
-            # Build regex pattern for matching course levels
-            regex_pattern = f"^{department}"  # Default to all courses in department
-            if level_text != "Show All":
-                level_num = level_text[0]  # Extract first character (1, 2, 3, etc.)
-                regex_pattern = f"^{department}{level_num}"  # Matches BI1xx, BI2xx, etc.
-
-            # Construct match conditions
-            match_conditions = {"course_id": {"$regex": regex_pattern}}
-
-            # Apply year filter if provided
-            if year:
-                try:
-                    match_conditions["year"] = int(year)
-                except ValueError:
-                    messagebox.showerror("Error", "Year must be a valid number")
-                    return
-
-            # if we're checking if its reg that add this in there
-            if regular_faculty:
-                match_conditions["is_regular_faculty"] = True
-
-            # Build aggregation pipeline
-            pipeline = [
-                {"$match": match_conditions},
-                {"$group": {
-                    "_id": "$course_id",
-                    "avg_percent_a": {"$avg": "$percent_a"},
-                    "avg_percent_df": {"$avg": "$percent_df"},
-                    "class_count": {"$sum": 1},
-                    "instructors": {"$addToSet": "$instructor_name"}
-                }},
-                {"$sort": {"avg_percent_a": -1}}
-            ]
-
-
-            # execute the query ig
-            results = list(self.db_manager.grade_distributions.aggregate(pipeline))
-
-            if side == "left":
-                self.left_page = 0
-                self.left_current_results = results
-            else:
-                self.right_page = 0
-                self.right_current_results = results
-
-            self.update_side_graph(side, results)
-            total_pages = (len(results) - 1) // self.results_per_page + 1
-            self.status_label.config(text=f"Status: Found {len(results)} results ({total_pages} pages)")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-            self.status_label.config(text="Status: Error fetching data")
-
-
-    def update_side_graph(self, side, results):
-        """Update graph for one side with the search results"""
-        fig = self.left_fig if side == "left" else self.right_fig
-        canvas = self.left_canvas if side == "left" else self.right_canvas
+        # Default to all courses in department
+        filters = {"department": department}
+        if level_text != "Show All":
+            filters["level"] = int(level_text[0]) * 100  # "300-level" -> 300
+
+        # Apply year / term range filter if provided
+        if year:
+            try:
+                first, last = parse_term_range(year)
+            except ValueError:
+                messagebox.showerror("Error", TERM_RANGE_HELP)
+                return
+            filters["term_ordinal"] = {"$gte": first, "$lte": last}
+
+        # if we're checking if its reg that add this in there
+        if regular_faculty:
+            filters["is_regular_faculty"] = True
+
+        # Query the precomputed rollups in the background
+        self.run_query(side, "course_id", filters)
+
+
+    def update_side_graph(self, side):
+        """Update graph for one side with the current page of its search results"""
         current_page = self.left_page if side == "left" else self.right_page
-        
-        # Calculate slice indices for current page
-        start_idx = current_page * self.results_per_page
-        end_idx = start_idx + self.results_per_page
-        page_results = results[start_idx:end_idx]
-        
-        fig.clear()
-        ax = fig.add_subplot(111)
+
+        # Update page indicator
+        page_label = self.left_page_label if side == "left" else self.right_page_label
+        page_label.config(text=f"Page {current_page + 1} of {self.total_pages(side)}")
+
+        if self.chart_mode_var.get() == "trends":
+            self.update_side_trends(side)
+            return
+
+        chart = self.left_chart if side == "left" else self.right_chart
+        pages = self.left_pages if side == "left" else self.right_pages
+        page_results = pages.get(current_page, [])
         
         # Extract data for plotting
         courses = [r["_id"] for r in page_results]
         percentages = [r['avg_percent_a' if self.show_as else 'avg_percent_df'] for r in page_results]
         counts = [r['class_count'] for r in page_results]
         
-        # Create bars
-        bars = ax.bar(range(len(courses)), percentages, 
-                    color='blue' if side == "left" else 'red', alpha=0.7)
-        
-        # Add class count labels if enabled
-        if self.show_class_count:
-            for bar, count in zip(bars, counts):
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                    f'n={count}',
-                    ha='center', va='bottom')
-        
-        # Customize the graph
-        ax.set_ylabel("% As" if self.show_as else "% Ds/Fs")
-        ax.set_title(self.get_graph_title(side))
-        ax.set_xticks(range(len(courses)))
-        ax.set_xticklabels(courses, rotation=45, ha='right')
-        
-        # Add grid for better readability
-        ax.grid(True, axis='y', linestyle='--', alpha=0.7)
-        
-        # Set y-axis limits
-        ax.set_ylim(0, 100)
-        
-        # Update page indicator
-        total_pages = (len(results) - 1) // self.results_per_page + 1
-        page_label = self.left_page_label if side == "left" else self.right_page_label
-        page_label.config(text=f"Page {current_page + 1} of {total_pages}")
-        
-        fig.tight_layout()
-        canvas.draw()
+        # Update the existing bars and labels in place
+        chart.update(courses, percentages, counts,
+                     show_counts=self.show_class_count,
+                     y_label="% As" if self.show_as else "% Ds/Fs",
+                     title=self.get_graph_title(side))
+
+    def update_side_trends(self, side):
+        """
+        Draw one per-term line for every result on a side's current page.
+        The series of the whole page are fetched in the background with a
+        single get_trends query, then drawn on the redraw that follows.
+        """
+        if side == "left":
+            chart, query, current_page = self.left_trend_chart, self.left_query, self.left_page
+            pages, (fetched_for, series) = self.left_pages, self.left_trends
+        else:
+            chart, query, current_page = self.right_trend_chart, self.right_query, self.right_page
+            pages, (fetched_for, series) = self.right_pages, self.right_trends
+        page_results = pages.get(current_page, [])
+        metric = "percent_a" if self.show_as else "percent_df"
+
+        wanted = (query, current_page, metric)
+        if page_results and fetched_for != wanted:
+            group_by, filters = query
+            selections = [dict(filters, **{group_by: r["_id"]}) for r in page_results]
+            self.queries.submit(
+                f"{side} trends",
+                lambda: self.db_manager.get_trends(selections, metric),
+                on_result=lambda fetched: self.show_trends(side, wanted, fetched),
+                on_error=self.show_query_error
+            )
+            return
+
+        chart.update([r["_id"] for r in page_results], series,
+                     y_label="% As" if self.show_as else "% Ds/Fs",
+                     title=self.get_graph_title(side))
+
+    def show_trends(self, side, fetched_for, series):
+        """Keep the fetched series of a side's page and draw them."""
+        if side == "left":
+            self.left_trends = (fetched_for, series)
+        else:
+            self.right_trends = (fetched_for, series)
+        self.schedule_redraw(side)
 
 
 if __name__ == "__main__":
+    # The admin tools own dataset imports; the window only asks for one
+    from admin.update_db import prepare_dataset
+
     root = tk.Tk()
-    app = DualWindowApp(root)
+    app = DualWindowApp(root, prepare_dataset=prepare_dataset)
     root.mainloop()
 
 
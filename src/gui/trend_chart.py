@@ -0,0 +1,89 @@
+# trend_chart.py
+
+"""
+Per-Term Line Chart for the EasyA Student Window
+
+The trend mode of a graph shows how each result on the current page (an
+instructor or a course) moved from term to term, one line per result. The
+points come from one batched get_trends query for the whole page.
+
+Like BarChart, TrendChart builds its axes and a fixed pool of lines once and
+only updates their data. The x-axis (terms) changes with every page, so
+updates are drawn with a full draw_idle rather than blitted.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from src.gui.bar_chart import SUBPLOT_MARGINS
+from src.utils.helpers import term_name
+
+
+class TrendChart:
+    def __init__(self, fig, canvas, slots: int):
+        """
+        Args:
+            fig: matplotlib Figure to draw into
+            canvas: Canvas the figure is shown on (e.g., FigureCanvasTkAgg)
+            slots: Most lines shown at once (results per page)
+        """
+        self.fig = fig
+        self.canvas = canvas
+        self.slots = slots
+
+        fig.subplots_adjust(**SUBPLOT_MARGINS)
+        self.ax = ax = fig.add_subplot(111)
+        ax.set_ylim(0, 100)
+        ax.grid(True, linestyle="--", alpha=0.7)
+        # x values are term ordinals; label whole terms only
+        ax.xaxis.set_major_locator(MaxNLocator(nbins=6, integer=True))
+        ax.xaxis.set_major_formatter(FuncFormatter(lambda ordinal, position: term_name(ordinal)))
+        ax.tick_params(axis="x", labelrotation=45)
+
+        self.lines = [ax.plot([], [], marker="o", markersize=3, visible=False)[0] for _ in range(slots)]
+        self.legend = None
+
+    def update(self, labels: Sequence[str], series: Sequence[List[Dict[str, Any]]],
+               y_label: str, title: str) -> None:
+        """Show one page of series (see set_data) and schedule a draw."""
+        self.set_data(labels, series, y_label, title)
+        self.canvas.draw_idle()
+
+    def set_data(self, labels: Sequence[str], series: Sequence[List[Dict[str, Any]]],
+                 y_label: str, title: str) -> None:
+        """
+        Update the lines for one page of results without drawing.
+        Lines without both a label and a series are hidden.
+
+        Args:
+            labels: Legend label per line
+            series: Per line, the points get_trends returns for it
+            y_label: y-axis label text
+            title: Chart title
+        """
+        pairs = list(zip(labels, series))
+        shown = []
+        for i, line in enumerate(self.lines):
+            visible = i < len(pairs) and bool(pairs[i][1])
+            line.set_visible(visible)
+            if not visible:
+                line.set_data([], [])
+                continue
+            label, points = pairs[i]
+            line.set_data([p["term_ordinal"] for p in points], [p["average"] for p in points])
+            line.set_label(label)
+            shown.append(line)
+
+        ordinals = [p["term_ordinal"] for _, points in pairs for p in points]
+        if ordinals:
+            self.ax.set_xlim(min(ordinals) - 0.5, max(ordinals) + 0.5)
+
+        if self.legend is not None:
+            self.legend.remove()
+            self.legend = None
+        if shown:
+            self.legend = self.ax.legend(handles=shown, loc="upper left", fontsize="small")
+
+        self.ax.set_ylabel(y_label)
+        self.ax.set_title(title)
@@ -0,0 +1,121 @@
+# helpers.py
+
+"""
+Shared helper functions for the EasyA Grade Analysis System.
+"""
+
+import re
+from typing import Any, Dict, Optional, Tuple
+
+_COURSE_ID = re.compile(r'^([A-Za-z]*)(\d*)')
+
+# Terms in calendar order within a year
+TERMS = ("Winter", "Spring", "Summer", "Fall")
+_TERM_INDEX = {term: index for index, term in enumerate(TERMS)}
+
+# "Fall 2013 - Spring 2016", "2013-2016", "Fall 2013 through Spring 2016", "2013 to 2016"
+_RANGE_SEPARATOR = re.compile(r'\s*(?:-|\bthrough\b|\bto\b)\s*', re.IGNORECASE)
+
+
+def split_course_id(course_id: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Split a course id into its department, number and level.
+
+    Args:
+        course_id: Course identifier (e.g., "MATH111")
+
+    Returns:
+        Tuple of (department, number, level), e.g. ("MATH", 111, 100),
+        or None if the id has no course number
+    """
+    department, number = _COURSE_ID.match(course_id).groups()
+    if not number:
+        return None
+    number = int(number)
+    return department, number, (number // 100) * 100
+
+
+def academic_year(term: str, year: int) -> int:
+    """
+    Academic year a term belongs to, named by the year it starts in: Fall 2014
+    belongs to 2014, Winter/Spring/Summer 2015 also belong to 2014.
+
+    Args:
+        term: Term name ("Fall", "Winter", "Spring" or "Summer")
+        year: Calendar year of the term
+    """
+    return year if term == "Fall" else year - 1
+
+
+def term_ordinal(term: str, year: int) -> Optional[int]:
+    """
+    Number terms consecutively across years (year * 4 + position of the term
+    in the calendar year), so a span of terms is one integer range.
+
+    Args:
+        term: Term name ("Winter", "Spring", "Summer" or "Fall")
+        year: Calendar year of the term
+
+    Returns:
+        The ordinal, or None for an unknown term name
+    """
+    index = _TERM_INDEX.get(term)
+    return None if index is None else year * len(TERMS) + index
+
+
+def term_name(ordinal: int) -> str:
+    """Term and year of a term ordinal, e.g. "Fall 2014"."""
+    year, index = divmod(int(ordinal), len(TERMS))
+    return f"{TERMS[index]} {year}"
+
+
+def parse_term(text: str, end: bool = False) -> int:
+    """
+    Parse "Fall 2013" or a bare year ("2013") into a term ordinal. A bare
+    year stands for its first term, or its last term when end is True.
+
+    Raises:
+        ValueError: if text is not a term or a year
+    """
+    parts = text.split()
+    if len(parts) == 1 and parts[0].isdigit():
+        return term_ordinal(TERMS[-1] if end else TERMS[0], int(parts[0]))
+    if len(parts) == 2 and parts[1].isdigit():
+        ordinal = term_ordinal(parts[0].capitalize(), int(parts[1]))
+        if ordinal is not None:
+            return ordinal
+    raise ValueError(f"Not a term or year: {text!r}")
+
+
+def parse_term_range(text: str) -> Tuple[int, int]:
+    """
+    Parse a year ("2014"), a year range ("2013-2016") or a term range
+    ("Fall 2013 through Spring 2016") into inclusive term ordinal bounds.
+
+    Raises:
+        ValueError: if either end cannot be parsed or the range is reversed
+    """
+    pieces = _RANGE_SEPARATOR.split(text.strip(), maxsplit=1)
+    first, last = parse_term(pieces[0]), parse_term(pieces[-1], end=True)
+    if first > last:
+        raise ValueError(f"Range ends before it starts: {text!r}")
+    return first, last
+
+
+def term_range_filter(start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the rollup filter for the terms from start through end.
+
+    Args:
+        start: First term or year included (e.g., "Fall 2013"), or None for no lower bound
+        end: Last term or year included (e.g., "Spring 2016"), or None for no upper bound
+
+    Returns:
+        A {"term_ordinal": {"$gte": ..., "$lte": ...}} filter, or {} without bounds
+    """
+    bounds = {}
+    if start:
+        bounds["$gte"] = parse_term(start)
+    if end:
+        bounds["$lte"] = parse_term(end, end=True)
+    return {"term_ordinal": bounds} if bounds else {}
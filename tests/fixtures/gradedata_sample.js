@@ -0,0 +1,436 @@
+var groups = {
+ "MATH111": [
+  {
+   "TERM_DESC": "Fall 2016",
+   "aprec": "25.2",
+   "bprec": "11.8",
+   "cprec": "52.0",
+   "dprec": "7.2",
+   "fprec": "3.8",
+   "crn": "28002",
+   "instructor": "Wilson, Chris"
+  },
+  {
+   "TERM_DESC": "Spring 2014",
+   "aprec": "50.0",
+   "bprec": "20.7",
+   "cprec": "19.8",
+   "dprec": "7.7",
+   "fprec": "1.8",
+   "crn": "37094",
+   "instructor": "Lee, Gyoung-Ah"
+  },
+  {
+   "TERM_DESC": "Spring 2015",
+   "aprec": "23.1",
+   "bprec": "22.8",
+   "cprec": "44.5",
+   "dprec": "9.4",
+   "fprec": "0.2",
+   "crn": "16338",
+   "instructor": "Frost, Stephen R."
+  }
+ ],
+ "MATH251": [
+  {
+   "TERM_DESC": "Spring 2013",
+   "aprec": "24.5",
+   "bprec": "27.0",
+   "cprec": "32.1",
+   "dprec": "8.7",
+   "fprec": "7.7",
+   "crn": "37682",
+   "instructor": "Li, Wei"
+  },
+  {
+   "TERM_DESC": "Fall 2015",
+   "aprec": "43.6",
+   "bprec": "19.5",
+   "cprec": "30.4",
+   "dprec": "5.1",
+   "fprec": "1.4",
+   "crn": "10236",
+   "instructor": "Wilson, Chris"
+  },
+  {
+   "TERM_DESC": "Summer 2016",
+   "aprec": "38.6",
+   "bprec": "20.2",
+   "cprec": "25.6",
+   "dprec": "8.8",
+   "fprec": "6.8",
+   "crn": "29625",
+   "instructor": "Wilson, Chris"
+  },
+  {
+   "TERM_DESC": "Fall 2013",
+   "aprec": "31.6",
+   "bprec": "26.3",
+   "cprec": "38.1",
+   "dprec": "1.6",
+   "fprec": "2.4",
+   "crn": "11517",
+   "instructor": "O'Neill, Brian L."
+  }
+ ],
+ "MATH341": [
+  {
+   "TERM_DESC": "Winter 2013",
+   "aprec": "35.9",
+   "bprec": "12.9",
+   "cprec": "39.1",
+   "dprec": "6.5",
+   "fprec": "5.6",
+   "crn": "23526",
+   "instructor": "Moss, Madonna L."
+  },
+  {
+   "TERM_DESC": "Spring 2014",
+   "aprec": "41.8",
+   "bprec": "18.7",
+   "cprec": "33.6",
+   "dprec": "4.4",
+   "fprec": "1.5",
+   "crn": "39632",
+   "instructor": "Li, Wei"
+  },
+  {
+   "TERM_DESC": "Winter 2013",
+   "aprec": "15.0",
+   "bprec": "25.3",
+   "cprec": "57.3",
+   "dprec": "0.6",
+   "fprec": "1.8",
+   "crn": "20848",
+   "instructor": "Frost, Stephen R."
+  },
+  {
+   "TERM_DESC": "Spring 2015",
+   "aprec": "24.5",
+   "bprec": "11.7",
+   "cprec": "60.6",
+   "dprec": "0.3",
+   "fprec": "2.9",
+   "crn": "10595",
+   "instructor": "Li, Wei"
+  }
+ ],
+ "CIS422": [
+  {
+   "TERM_DESC": "Fall 2015",
+   "aprec": "26.1",
+   "bprec": "27.2",
+   "cprec": "40.0",
+   "dprec": "1.5",
+   "fprec": "5.2",
+   "crn": "30241",
+   "instructor": "Moss, Madonna L."
+  },
+  {
+   "TERM_DESC": "Winter 2015",
+   "aprec": "54.7",
+   "bprec": "22.0",
+   "cprec": "18.4",
+   "dprec": "2.9",
+   "fprec": "2.0",
+   "crn": "28779",
+   "instructor": "Smith, John A."
+  },
+  {
+   "TERM_DESC": "Spring 2013",
+   "aprec": "28.2",
+   "bprec": "26.1",
+   "cprec": "38.3",
+   "dprec": "4.5",
+   "fprec": "2.9",
+   "crn": "24395",
+   "instructor": "Moss, Madonna L."
+  },
+  {
+   "TERM_DESC": "Winter 2014",
+   "aprec": "31.2",
+   "bprec": "11.1",
+   "cprec": "55.1",
+   "dprec": "2.1",
+   "fprec": "0.5",
+   "crn": "29874",
+   "instructor": "Smith, John A."
+  }
+ ],
+ "CIS210": [
+  {
+   "TERM_DESC": "Spring 2016",
+   "aprec": "34.5",
+   "bprec": "12.4",
+   "cprec": "42.6",
+   "dprec": "2.5",
+   "fprec": "8.0",
+   "crn": "31352",
+   "instructor": "Moss, Madonna L."
+  },
+  {
+   "TERM_DESC": "Summer 2016",
+   "aprec": "33.9",
+   "bprec": "10.7",
+   "cprec": "49.7",
+   "dprec": "2.4",
+   "fprec": "3.3",
+   "crn": "18145",
+   "instructor": "Lincoln, Abraham"
+  },
+  {
+   "TERM_DESC": "Winter 2014",
+   "aprec": "51.6",
+   "bprec": "15.1",
+   "cprec": "28.0",
+   "dprec": "5.0",
+   "fprec": "0.3",
+   "crn": "35307",
+   "instructor": "Moss, Madonna L."
+  },
+  {
+   "TERM_DESC": "Spring 2013",
+   "aprec": "30.9",
+   "bprec": "27.8",
+   "cprec": "36.1",
+   "dprec": "2.6",
+   "fprec": "2.6",
+   "crn": "28668",
+   "instructor": "Lincoln, Abraham"
+  },
+  {
+   "TERM_DESC": "Fall 2016",
+   "aprec": "58.1",
+   "bprec": "24.3",
+   "cprec": "4.1",
+   "dprec": "6.5",
+   "fprec": "7.0",
+   "crn": "22696",
+   "instructor": "Lee, Gyoung-Ah"
+  },
+  {
+   "TERM_DESC": "Winter 2015",
+   "aprec": "31.5",
+   "bprec": "28.9",
+   "cprec": "25.7",
+   "dprec": "9.3",
+   "fprec": "4.6",
+   "crn": "19706",
+   "instructor": "O'Neill, Brian L."
+  }
+ ],
+ "BI121": [
+  {
+   "TERM_DESC": "Spring 2015",
+   "aprec": "50.7",
+   "bprec": "23.7",
+   "cprec": "15.1",
+   "dprec": "5.3",
+   "fprec": "5.2",
+   "crn": "22851",
+   "instructor": "O'Neill, Brian L."
+  },
+  {
+   "TERM_DESC": "Fall 2016",
+   "aprec": "13.7",
+   "bprec": "23.4",
+   "cprec": "45.5",
+   "dprec": "9.7",
+   "fprec": "7.7",
+   "crn": "39457",
+   "instructor": "Frost, Stephen R."
+  },
+  {
+   "TERM_DESC": "Summer 2016",
+   "aprec": "48.3",
+   "bprec": "27.4",
+   "cprec": "14.7",
+   "dprec": "2.7",
+   "fprec": "6.9",
+   "crn": "34461",
+   "instructor": "Lincoln, Abraham"
+  },
+  {
+   "TERM_DESC": "Fall 2015",
+   "aprec": "56.4",
+   "bprec": "28.4",
+   "cprec": "13.0",
+   "dprec": "2.2",
+   "fprec": "0.0",
+   "crn": "13797",
+   "instructor": "Lincoln, Abraham"
+  }
+ ],
+ "BI330": [
+  {
+   "TERM_DESC": "Spring 2016",
+   "aprec": "53.9",
+   "bprec": "14.0",
+   "cprec": "19.6",
+   "dprec": "5.5",
+   "fprec": "7.0",
+   "crn": "39990",
+   "instructor": "O'Neill, Brian L."
+  },
+  {
+   "TERM_DESC": "Spring 2014",
+   "aprec": "11.3",
+   "bprec": "19.8",
+   "cprec": "63.8",
+   "dprec": "0.3",
+   "fprec": "4.8",
+   "crn": "11355",
+   "instructor": "Li, Wei"
+  },
+  {
+   "TERM_DESC": "Spring 2013",
+   "aprec": "14.0",
+   "bprec": "15.9",
+   "cprec": "54.1",
+   "dprec": "8.8",
+   "fprec": "7.2",
+   "crn": "12789",
+   "instructor": "O'Neill, Brian L."
+  },
+  {
+   "TERM_DESC": "Summer 2016",
+   "aprec": "29.1",
+   "bprec": "14.7",
+   "cprec": "45.8",
+   "dprec": "7.9",
+   "fprec": "2.5",
+   "crn": "13116",
+   "instructor": "Lee, Gyoung-Ah"
+  },
+  {
+   "TERM_DESC": "Summer 2016",
+   "aprec": "15.7",
+   "bprec": "20.2",
+   "cprec": "50.8",
+   "dprec": "6.2",
+   "fprec": "7.1",
+   "crn": "38109",
+   "instructor": "O'Neill, Brian L."
+  }
+ ],
+ "CH221": [
+  {
+   "TERM_DESC": "Summer 2016",
+   "aprec": "41.4",
+   "bprec": "28.6",
+   "cprec": "15.5",
+   "dprec": "9.4",
+   "fprec": "5.1",
+   "crn": "13872",
+   "instructor": "Frost, Stephen R."
+  },
+  {
+   "TERM_DESC": "Spring 2015",
+   "aprec": "28.6",
+   "bprec": "16.5",
+   "cprec": "47.6",
+   "dprec": "1.6",
+   "fprec": "5.7",
+   "crn": "27755",
+   "instructor": "Smith, John A."
+  }
+ ],
+ "CHN101": [
+  {
+   "TERM_DESC": "Summer 2013",
+   "aprec": "10.3",
+   "bprec": "19.7",
+   "cprec": "62.5",
+   "dprec": "3.1",
+   "fprec": "4.4",
+   "crn": "27062",
+   "instructor": "Moss, Madonna L."
+  },
+  {
+   "TERM_DESC": "Fall 2013",
+   "aprec": "30.6",
+   "bprec": "13.6",
+   "cprec": "51.1",
+   "dprec": "2.9",
+   "fprec": "1.8",
+   "crn": "29973",
+   "instructor": "Li, Wei"
+  },
+  {
+   "TERM_DESC": "Summer 2016",
+   "aprec": "37.2",
+   "bprec": "21.4",
+   "cprec": "26.0",
+   "dprec": "9.1",
+   "fprec": "6.3",
+   "crn": "22838",
+   "instructor": "Frost, Stephen R."
+  }
+ ],
+ "PSY201": [
+  {
+   "TERM_DESC": "Fall 2014",
+   "aprec": "48.6",
+   "bprec": "12.7",
+   "cprec": "29.8",
+   "dprec": "3.6",
+   "fprec": "5.3",
+   "crn": "32131",
+   "instructor": "Frost, Stephen R."
+  },
+  {
+   "TERM_DESC": "Fall 2013",
+   "aprec": "24.3",
+   "bprec": "25.9",
+   "cprec": "38.8",
+   "dprec": "9.4",
+   "fprec": "1.6",
+   "crn": "23190",
+   "instructor": "Frost, Stephen R."
+  },
+  {
+   "TERM_DESC": "Fall 2013",
+   "aprec": "26.5",
+   "bprec": "27.7",
+   "cprec": "40.7",
+   "dprec": "3.7",
+   "fprec": "1.4",
+   "crn": "36250",
+   "instructor": "Li, Wei"
+  },
+  {
+   "TERM_DESC": "Summer 2013",
+   "aprec": "50.4",
+   "bprec": "21.7",
+   "cprec": "17.1",
+   "dprec": "9.5",
+   "fprec": "1.3",
+   "crn": "34911",
+   "instructor": "Lee, Gyoung-Ah"
+  }
+ ],
+ "LAW601": [
+  {
+   "TERM_DESC": "Fall Semester Law 2014",
+   "aprec": "20",
+   "bprec": "0",
+   "cprec": "0",
+   "dprec": "0",
+   "fprec": "0",
+   "crn": "1",
+   "instructor": "Doe, Jane"
+  }
+ ],
+ "GEOG141": [
+  {
+   "TERM_DESC": "Spring 2015",
+   "aprec": "NA",
+   "bprec": "NA",
+   "cprec": "NA",
+   "dprec": "NA",
+   "fprec": "NA",
+   "crn": "2",
+   "instructor": "Doe, Jane"
+  }
+ ]
+};
@@ -0,0 +1,87 @@
+# test_async_queries.py
+
+import threading
+import time
+
+from src.gui.async_queries import QueryDispatcher
+
+
+class FakeRoot:
+    """Collects root.after callbacks so tests can run the main loop by hand."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay_ms, callback):
+        self.scheduled.append(callback)
+
+    def run_pending(self):
+        callbacks, self.scheduled = self.scheduled, []
+        for callback in callbacks:
+            callback()
+
+
+def run_until(root, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "query was not delivered"
+        root.run_pending()
+        time.sleep(0.01)
+
+
+def test_only_the_latest_result_per_side_is_delivered():
+    root = FakeRoot()
+    dispatcher = QueryDispatcher(root, max_workers=2)
+    release = threading.Event()
+    shown = []
+
+    def slow():
+        release.wait(5)
+        return "old"
+
+    dispatcher.submit("left", slow, shown.append, shown.append)
+    dispatcher.submit("left", lambda: "new", shown.append, shown.append)
+    dispatcher.submit("right", lambda: "other", shown.append, shown.append)
+    run_until(root, lambda: len(shown) == 2)
+    release.set()
+
+    # The superseded "old" result finishes last and is dropped
+    time.sleep(0.05)
+    root.run_pending()
+    assert sorted(shown) == ["new", "other"]
+    assert not dispatcher.pending("left")
+    assert root.scheduled == []
+    dispatcher.shutdown()
+
+
+def test_errors_are_delivered_to_on_error():
+    root = FakeRoot()
+    dispatcher = QueryDispatcher(root)
+    errors = []
+
+    def failing():
+        raise ValueError("no connection")
+
+    dispatcher.submit("left", failing, lambda result: None, errors.append)
+    run_until(root, lambda: errors)
+    assert str(errors[0]) == "no connection"
+    dispatcher.shutdown()
+
+
+def test_a_failing_callback_does_not_stop_delivery():
+    root = FakeRoot()
+    dispatcher = QueryDispatcher(root)
+    shown = []
+
+    def broken(result):
+        raise RuntimeError("widget destroyed")
+
+    dispatcher.submit("left", lambda: "left", broken, shown.append)
+    dispatcher.submit("right", lambda: "right", shown.append, shown.append)
+    run_until(root, lambda: shown)
+    assert shown == ["right"]
+
+    dispatcher.submit("left", lambda: "again", shown.append, shown.append)
+    run_until(root, lambda: len(shown) == 2)
+    assert shown == ["right", "again"]
+    dispatcher.shutdown()
@@ -0,0 +1,44 @@
+# test_bar_chart.py
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from src.gui.bar_chart import BarChart
+
+
+def make_chart(slots=4):
+    fig = Figure(figsize=(6, 4), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    return BarChart(fig, canvas, color="blue", slots=slots), canvas
+
+
+def test_update_reuses_artists_and_hides_unused_slots():
+    chart, canvas = make_chart()
+    bars = list(chart.bars)
+    canvas.draw()
+
+    chart.update(["CIS210", "CIS211", "CIS212"], [40.0, 55.5, 30.0], [3, 5, 2],
+                 show_counts=True, y_label="% As", title="Dept: CIS")
+    chart.update(["MATH251", "MATH252"], [12.0, 80.0], [7, 1],
+                 show_counts=False, y_label="% Ds/Fs", title="Dept: MATH")
+
+    assert chart.bars == bars
+    assert [bar.get_visible() for bar in chart.bars] == [True, True, False, False]
+    assert [bar.get_height() for bar in chart.bars[:2]] == [12.0, 80.0]
+    assert [label.get_text() for label in chart.x_labels[:2]] == ["MATH251", "MATH252"]
+    assert not any(label.get_visible() for label in chart.count_labels)
+    assert chart.y_label.get_text() == "% Ds/Fs"
+    assert chart.title.get_text() == "Dept: MATH"
+
+
+def test_full_draw_paints_the_animated_artists():
+    chart, canvas = make_chart()
+    canvas.draw()
+    blank = bytes(canvas.buffer_rgba())
+
+    chart.update(["CIS210"], [90.0], [3], show_counts=True, y_label="% As", title="Dept: CIS")
+    blitted = bytes(canvas.buffer_rgba())
+    canvas.draw()
+
+    assert blitted != blank
+    assert bytes(canvas.buffer_rgba()) == blitted
@@ -0,0 +1,124 @@
+# test_columnar_store.py
+
+from collections import defaultdict
+from src.data.columnar_store import ColumnarGradeStore
+from src.data.query_builder import QueryBuilder
+
+ROWS = [
+    {"department": "MATH", "course_id": "MATH111", "instructor_name": "Smith, John", "term": "Fall",
+     "number": 111, "level": 100, "year": 2014, "is_regular_faculty": True, "percent_a": 40.0, "percent_df": 10.0},
+    {"department": "MATH", "course_id": "MATH111", "instructor_name": "Smith, John", "term": "Winter",
+     "number": 111, "level": 100, "year": 2015, "is_regular_faculty": True, "percent_a": 60.0, "percent_df": 6.0},
+    {"department": "MATH", "course_id": "MATH111", "instructor_name": "Lee, Ann", "term": "Fall",
+     "number": 111, "level": 100, "year": 2015, "is_regular_faculty": False, "percent_a": 55.0, "percent_df": 5.0},
+    {"department": "MATH", "course_id": "MATH341", "instructor_name": "Lee, Ann", "term": "Spring",
+     "number": 341, "level": 300, "year": 2014, "is_regular_faculty": False, "percent_a": 20.0, "percent_df": 12.0},
+    {"department": "CH", "course_id": "CH221", "instructor_name": "Moss, Madonna", "term": "Fall",
+     "number": 221, "level": 200, "year": 2014, "is_regular_faculty": True, "percent_a": 30.0, "percent_df": 8.0},
+]
+
+
+def naive_group_stats(group_by, filters):
+    groups = defaultdict(list)
+    for row in ROWS:
+        if all(row[field] == value for field, value in filters.items()):
+            groups[row[group_by]].append(row)
+    return {
+        key: (sum(r["percent_a"] for r in rows) / len(rows), len(rows))
+        for key, rows in groups.items()
+    }
+
+
+def test_group_stats_matches_naive_group_by():
+    store = ColumnarGradeStore.from_rows(ROWS)
+    for group_by in ("instructor_name", "course_id", "year", "level"):
+        for filters in ({}, {"department": "MATH"}, {"department": "MATH", "level": 100},
+                        {"is_regular_faculty": True}, {"year": 2015}):
+            results = store.group_stats(group_by, filters)
+            actual = {r["_id"]: (r["avg_percent_a"], r["class_count"]) for r in results}
+            assert actual == naive_group_stats(group_by, filters)
+
+
+def test_unknown_filter_value_returns_nothing():
+    store = ColumnarGradeStore.from_rows(ROWS)
+    assert store.get_department_stats("CHN") == []
+
+
+def test_query_builder_runs_on_columnar_store():
+    results = QueryBuilder(ColumnarGradeStore.from_rows(ROWS)).build_comparison_query("MATH", level=100)
+    assert [r["_id"] for r in results] == ["Lee, Ann", "Smith, John"]
+    assert results[1]["average"] == 50.0
+    assert results[1]["class_count"] == 2
+
+
+def test_pages_and_keyset_pages_follow_group_stats_order():
+    rows = [dict(ROWS[0], instructor_name=f"Instructor {i:02d}", percent_a=float(i % 4)) for i in range(11)]
+    store = ColumnarGradeStore.from_rows(rows)
+    ordered = [r["_id"] for r in store.group_stats("instructor_name", {"department": "MATH"}, "avg_percent_a")]
+
+    paged, after = [], None
+    for page in range(3):
+        numbered = store.group_stats_page("instructor_name", {"department": "MATH"}, "avg_percent_a", page, 4)
+        keyset = store.group_stats_after("instructor_name", {"department": "MATH"}, "avg_percent_a", after, 4)
+        assert numbered["total"] == 11
+        assert numbered["results"] == keyset
+        paged += [r["_id"] for r in keyset]
+        after = keyset[-1]
+    assert paged == ordered
+    assert store.group_stats_after("instructor_name", {"department": "MATH"}, "avg_percent_a", after, 4) == []
+
+
+def test_spread_and_enrollment_weighted_statistics():
+    rows = [dict(ROWS[0], percent_a=40.0, total_students=30), dict(ROWS[1], percent_a=60.0, total_students=10),
+            dict(ROWS[3], instructor_name="Smith, John")]
+    store = ColumnarGradeStore.from_rows(rows)
+    assert set(store.group_stats("instructor_name")[0]) == {"_id", "class_count", "avg_percent_a", "avg_percent_df"}
+    stats = store.group_stats("instructor_name", spread=True)[0]
+    assert stats["class_count"] == 3 and stats["students"] == 40
+    assert stats["avg_percent_a"] == 40.0
+    assert abs(stats["var_percent_a"] - 800 / 3) < 1e-9
+    assert (stats["min_percent_a"], stats["max_percent_a"]) == (20.0, 60.0)
+    # the section without an enrollment count is left out of the weighted statistics
+    assert stats["wavg_percent_a"] == 45.0
+    assert abs(stats["wvar_percent_a"] - 75.0) < 1e-9
+
+    unknown = ColumnarGradeStore.from_rows(ROWS).group_stats("instructor_name", {"instructor_name": "Lee, Ann"},
+                                                             spread=True)[0]
+    assert unknown["wavg_percent_a"] is None and unknown["students"] == 0
+
+
+def test_term_range_filters_select_spans_of_terms():
+    store = ColumnarGradeStore.from_rows(ROWS)
+    # Fall 2014 through Winter 2015 leaves out Spring 2014 and Fall 2015
+    results = store.get_department_stats("MATH", start="Fall 2014", end="Winter 2015")
+    assert [(r["_id"], r["class_count"]) for r in results] == [("Smith, John", 2)]
+
+    builder = QueryBuilder(store)
+    results = builder.build_comparison_query("MATH", start="2015")
+    assert [(r["_id"], r["class_count"]) for r in results] == [("Smith, John", 1), ("Lee, Ann", 1)]
+    assert builder.build_comparison_query("MATH", end="2013") == []
+
+
+def test_trends_are_per_term_series_in_term_order():
+    store = ColumnarGradeStore.from_rows(ROWS)
+    smith = store.get_trend("instructor_name", "Smith, John")
+    assert [(p["term"], p["average"], p["class_count"]) for p in smith] == [("Fall 2014", 40.0, 1),
+                                                                             ("Winter 2015", 60.0, 1)]
+    assert [p["average"] for p in store.get_trend("course_id", "MATH111", metric="percent_df")] == [10.0, 6.0, 5.0]
+    assert store.get_trend("department", "MATH", start="2015") == store.get_trends(
+        [{"department": "MATH", "term_ordinal": {"$gte": smith[1]["term_ordinal"]}}])[0]
+
+    lee, chemistry = store.get_trends([{"instructor_name": "Lee, Ann"}, {"department": "CH"}])
+    assert [p["term"] for p in lee] == ["Spring 2014", "Fall 2015"]
+    assert [p["term"] for p in chemistry] == ["Fall 2014"]
+    assert store.get_trends([]) == []
+
+
+if __name__ == "__main__":
+    test_group_stats_matches_naive_group_by()
+    test_unknown_filter_value_returns_nothing()
+    test_query_builder_runs_on_columnar_store()
+    test_pages_and_keyset_pages_follow_group_stats_order()
+    test_spread_and_enrollment_weighted_statistics()
+    test_term_range_filters_select_spans_of_terms()
+    test_trends_are_per_term_series_in_term_order()
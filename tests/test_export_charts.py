@@ -0,0 +1,43 @@
+# test_export_charts.py
+
+import os
+
+from admin.export_charts import ChartExporter
+from src.data.columnar_store import ColumnarGradeStore
+from tests.test_columnar_store import ROWS
+
+
+def test_export_renders_charts_once_and_rerenders_changed_data(tmp_path):
+    exporter = ChartExporter(ColumnarGradeStore.from_rows(ROWS), str(tmp_path), formats=["png", "svg"], workers=2)
+
+    first = exporter.export(levels=[None, 100])
+    # 2 metrics x 2 faculty filters for MATH (all, 100) and CH (all; no 100-level courses), in 2 formats
+    assert first["rendered"] == 4 * 3 * 2
+    assert first["empty"] == 4
+    assert os.path.getsize(tmp_path / "MATH_100_percent_a_all.png") > 0
+    assert (tmp_path / "CH_all_percent_df_faculty.svg").exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+    second = exporter.export(levels=[None, 100])
+    assert second["rendered"] == 0
+    assert second["unchanged"] == first["rendered"]
+
+    # New MATH 100-level data changes only the MATH charts that include it
+    changed = ROWS + [dict(ROWS[2], term="Winter", year=2016, percent_a=90.0)]
+    exporter = ChartExporter(ColumnarGradeStore.from_rows(changed), str(tmp_path), formats=["png"], workers=2)
+    third = exporter.export(departments=["MATH"], levels=[None, 100])
+    # Lee, Ann is not regular faculty, so the faculty-only charts are unchanged
+    assert third["rendered"] == 4
+    assert third["unchanged"] == 4
+
+
+def test_term_range_exports_get_their_own_files(tmp_path):
+    exporter = ChartExporter(ColumnarGradeStore.from_rows(ROWS), str(tmp_path), workers=2)
+    everything = exporter.export(departments=["MATH"], levels=[100])
+    ranged = exporter.export(departments=["MATH"], levels=[100], start="Fall 2014", end="2015")
+    assert ranged["rendered"] == everything["rendered"] == 4
+    assert (tmp_path / "MATH_100_percent_a_all_from_Fall2014_to_Fall2015.png").exists()
+
+    # the range export left the all-terms charts and their fingerprints alone
+    assert exporter.export(departments=["MATH"], levels=[100])["unchanged"] == 4
+    assert len(list(tmp_path.glob("*.png"))) == 8
@@ -0,0 +1,85 @@
+# test_faculty_index.py
+
+from admin.resolve_discrepancies import NameStandardizer
+
+FACULTY_LIST = """Mathematics:
+John Smith
+Ann B. Lee
+Ann C. Lee
+Madonna L. Moss
+Brian O'Neill
+Plato
+Mary Jo Carter
+"""
+
+INSTRUCTORS = ["Smith, John", "Smith, John A.", "Lee, Ann", "Lee, Ann B.", "Lee, Ann D.",
+               "Moss, Madonna L.", "Moss, Madonna K.", "Moss, Madonna", "O'Neill, Brian L.",
+               "Plato", "Carter, Mary", "Carter, Mary Jo", "Carter, Mary J.", "Doe, Jane"]
+
+
+def make_standardizer(tmp_path):
+    path = tmp_path / "faculty_list.txt"
+    path.write_text(FACULTY_LIST, encoding="utf-8")
+    return NameStandardizer(str(path), db_manager=object())
+
+
+def brute_force(standardizer, instructor_name):
+    """The original scan over the whole faculty list."""
+    name = standardizer.format_name_tuple(standardizer.standardize_instructor_name(instructor_name))
+    return any(
+        standardizer.compare_names(name, standardizer.format_name_tuple(standardizer.standardize_faculty_name(f)))
+        for f in standardizer.faculty_list
+    )
+
+
+def test_index_matches_compare_names(tmp_path):
+    standardizer = make_standardizer(tmp_path)
+    for instructor in INSTRUCTORS:
+        assert standardizer.is_regular_faculty(instructor) == brute_force(standardizer, instructor), instructor
+
+
+def test_middle_initial_disambiguation(tmp_path):
+    standardizer = make_standardizer(tmp_path)
+    assert standardizer.is_regular_faculty("Lee, Ann B.")
+    assert not standardizer.is_regular_faculty("Lee, Ann D.")
+    assert standardizer.is_regular_faculty("Lee, Ann")
+    assert standardizer.is_regular_faculty("Smith, John A.")  # faculty entry has no middle
+    assert not standardizer.is_regular_faculty("Doe, Jane")
+
+
+def test_index_matches_compare_names_on_shipped_faculty_list():
+    standardizer = NameStandardizer("faculty_list.txt", db_manager=object())
+    instructors = []
+    for faculty in standardizer.faculty_list[::5]:
+        first, middle, last = standardizer.standardize_faculty_name(faculty)
+        instructors += [f"{last}, {first}", f"{last}, {first} {middle or 'Q.'}", f"{last}, {first} Z."]
+    for instructor in instructors:
+        assert standardizer.is_regular_faculty(instructor) == brute_force(standardizer, instructor), instructor
+
+
+def test_name_mapping_shares_flag_per_new_name(tmp_path):
+    standardizer = make_standardizer(tmp_path)
+    mapping = standardizer.build_name_mapping(["Lee, Ann B.", "Doe, Jane", "Jane Doe", "Plato"])
+    assert mapping["Lee, Ann B."] == ("Ann B. Lee", True)
+    assert mapping["Doe, Jane"] == ("Jane Doe", False)
+    assert mapping["Jane Doe"] == ("Jane Doe", False)
+    assert mapping["Plato"] == ("Plato", True)
+
+
+def test_term_mapping_uses_the_catalog_of_each_academic_year(tmp_path):
+    dataset = tmp_path / "faculty_dataset.json"
+    dataset.write_text('{"faculty": {"2013": {"Anthropology": ["Ann B. Lee"]},'
+                       ' "2015": {"Anthropology": ["John Smith"]}}}', encoding="utf-8")
+    path = tmp_path / "faculty_list.txt"
+    path.write_text(FACULTY_LIST, encoding="utf-8")
+    standardizer = NameStandardizer(str(path), db_manager=object(), faculty_dataset_path=str(dataset))
+
+    mapping = standardizer.build_term_mapping([
+        ("Lee, Ann B.", 2013, "Fall"), ("Lee, Ann B.", 2014, "Spring"), ("Lee, Ann B.", 2016, "Winter"),
+        ("Smith, John", 2014, "Spring"), ("Smith, John", 2016, "Fall"),
+    ])
+    assert mapping[("Lee, Ann B.", 2013, "Fall")] == ("Ann B. Lee", True)
+    assert mapping[("Lee, Ann B.", 2014, "Spring")] == ("Ann B. Lee", True)   # academic year 2013
+    assert mapping[("Lee, Ann B.", 2016, "Winter")] == ("Ann B. Lee", False)  # academic year 2015
+    assert mapping[("Smith, John", 2014, "Spring")] == ("John Smith", False)
+    assert mapping[("Smith, John", 2016, "Fall")] == ("John Smith", True)     # nearest catalog is 2015
@@ -0,0 +1,32 @@
+# test_helpers.py
+
+import pytest
+
+from src.utils.helpers import parse_term_range, split_course_id, term_name, term_ordinal, term_range_filter
+
+
+def test_split_course_id():
+    assert split_course_id("MATH111") == ("MATH", 111, 100)
+    assert split_course_id("CH425") == ("CH", 425, 400)
+    assert split_course_id("LAWNA") is None
+
+
+def test_term_ranges():
+    assert term_ordinal("Winter", 2015) == term_ordinal("Fall", 2014) + 1
+    assert term_ordinal("Autumn", 2015) is None
+    assert term_name(term_ordinal("Fall", 2014)) == "Fall 2014"
+    assert parse_term_range("Fall 2013 through Spring 2016") == (term_ordinal("Fall", 2013),
+                                                                  term_ordinal("Spring", 2016))
+    assert parse_term_range("2013-2016") == (term_ordinal("Winter", 2013), term_ordinal("Fall", 2016))
+    assert parse_term_range("fall 2014 to 2015") == (term_ordinal("Fall", 2014), term_ordinal("Fall", 2015))
+    assert parse_term_range("2014") == (term_ordinal("Winter", 2014), term_ordinal("Fall", 2014))
+    assert term_range_filter(end="2014") == {"term_ordinal": {"$lte": term_ordinal("Fall", 2014)}}
+    assert term_range_filter() == {}
+    for text in ("Spring 2016 - Fall 2013", "Fall", "Fall 2013 through later"):
+        with pytest.raises(ValueError):
+            parse_term_range(text)
+
+
+if __name__ == "__main__":
+    test_split_course_id()
+    test_term_ranges()
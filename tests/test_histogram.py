@@ -0,0 +1,32 @@
+# test_histogram.py
+
+import math
+
+import numpy as np
+
+from src.data.columnar_store import ColumnarGradeStore
+from src.data.histogram import BIN_WIDTH, HISTOGRAM_BINS, bin_indexes, quantiles
+from tests.test_columnar_store import ROWS
+
+
+def test_quantiles_are_within_one_bin_of_the_ranked_value():
+    values = np.random.default_rng(422).uniform(0, 100, 500).round(1)
+    histogram = np.bincount(bin_indexes(values), minlength=HISTOGRAM_BINS)
+    ordered = np.sort(values)
+    for percent, estimate in zip((10, 25, 50, 75, 90), quantiles(histogram, (10, 25, 50, 75, 90))):
+        assert abs(estimate - ordered[math.ceil(percent * len(values) / 100) - 1]) <= BIN_WIDTH
+
+    assert bin_indexes([0.0, 99.9, 100.0]).tolist() == [0, HISTOGRAM_BINS - 1, HISTOGRAM_BINS - 1]
+    assert quantiles([0] * HISTOGRAM_BINS, (50,)) == [None]
+
+
+def test_group_percentiles_merge_rows_per_group():
+    results = ColumnarGradeStore.from_rows(ROWS).group_percentiles("instructor_name", {"department": "MATH"},
+                                                                  percents=(0, 50, 100))
+    assert [r["_id"] for r in results] == ["Lee, Ann", "Smith, John"]
+    lee = results[0]
+    # Lee, Ann taught two classes with 20 % and 55 % As
+    assert lee["class_count"] == 2 and sum(lee["histogram"]) == 2
+    assert 20.0 <= lee["p0"] <= 20.0 + BIN_WIDTH
+    assert 20.0 <= lee["p50"] <= 20.0 + BIN_WIDTH
+    assert 55.0 - BIN_WIDTH <= lee["p100"] <= 55.0 + BIN_WIDTH
@@ -0,0 +1,35 @@
+# test_import_pipeline.py
+
+import json
+
+from admin.import_data import DataImporter
+from admin.import_pipeline import PipelinedImporter
+from tests.test_import_streaming import SAMPLE_FILE, RecordingDatabase
+
+
+def imported_rows(database):
+    # writer threads may finish batches in any order
+    rows = [row for batch in database.grade_distributions.batches for row in batch]
+    return sorted(rows, key=lambda row: json.dumps(row, sort_keys=True))
+
+
+def test_pipelined_import_matches_data_importer():
+    expected_db = RecordingDatabase()
+    assert DataImporter(expected_db).import_grade_data(SAMPLE_FILE)
+
+    pipelined_db = RecordingDatabase()
+    importer = PipelinedImporter(pipelined_db, parse_workers=2, writer_threads=2, batch_size=5, courses_per_task=2)
+    assert importer.import_grade_data(SAMPLE_FILE)
+
+    assert imported_rows(pipelined_db) == imported_rows(expected_db)
+    assert len(pipelined_db.grade_distributions.batches) > 1
+    assert all(len(batch) <= 5 for batch in pipelined_db.grade_distributions.batches)
+
+    expected_courses = sorted(c['course_id'] for c in expected_db.courses.batches[0])
+    assert sorted(c['course_id'] for c in pipelined_db.courses.batches[0]) == expected_courses
+    # rollups are rebuilt once the rows are written
+    assert len(pipelined_db.grade_distributions.pipelines) == 1
+
+
+if __name__ == "__main__":
+    test_pipelined_import_matches_data_importer()
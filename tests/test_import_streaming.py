@@ -0,0 +1,83 @@
+# test_import_streaming.py
+
+import json
+from admin.import_data import DataImporter, iter_grade_data, normalize_course
+
+SAMPLE_FILE = "tests/fixtures/gradedata_sample.js"
+
+
+class RecordingCollection:
+    """Collection stand-in that records each insert_many batch and aggregate pipeline."""
+    def __init__(self, name=""):
+        self.name = name
+        self.batches = []
+        self.pipelines = []
+
+    @property
+    def database(self):
+        return self
+
+    @property
+    def dataset_meta(self):
+        return self
+
+    def insert_many(self, documents, ordered=True):
+        self.batches.append(list(documents))
+
+    def find_one_and_update(self, filter, update, **kwargs):
+        return {"_id": filter["_id"], "value": 1}
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return iter([])
+
+
+class RecordingDatabase:
+    def __init__(self):
+        self.courses = RecordingCollection("courses")
+        self.grade_distributions = RecordingCollection("grade_distributions")
+        self.grade_rollups = RecordingCollection("grade_rollups")
+
+
+def load_whole_file():
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as file:
+        return json.loads(file.read().split("= ")[1].split(";")[0])
+
+
+def test_iter_grade_data_matches_json_loads():
+    expected = list(load_whole_file().items())
+
+    # tiny chunks force every token to straddle chunk boundaries
+    for chunk_size in (1, 7, 64, 1 << 16):
+        assert list(iter_grade_data(SAMPLE_FILE, chunk_size=chunk_size)) == expected
+
+
+def test_streaming_import_matches_full_import():
+    full_db = RecordingDatabase()
+    DataImporter(full_db).import_grade_data(SAMPLE_FILE)
+
+    stream_db = RecordingDatabase()
+    DataImporter(stream_db).import_grade_data(SAMPLE_FILE, streaming=True, batch_size=5)
+
+    full_rows = [row for batch in full_db.grade_distributions.batches for row in batch]
+    stream_rows = [row for batch in stream_db.grade_distributions.batches for row in batch]
+    assert stream_rows == full_rows
+    assert len(stream_db.grade_distributions.batches) > 1
+    assert all(len(batch) <= 5 for batch in stream_db.grade_distributions.batches)
+
+    full_courses = sorted(c['course_id'] for c in full_db.courses.batches[0])
+    stream_courses = sorted(c['course_id'] for c in stream_db.courses.batches[0])
+    assert stream_courses == full_courses
+
+
+def test_enrollment_is_optional():
+    entry = {"TERM_DESC": "Fall 2016", "aprec": "25.2", "dprec": "7.2", "fprec": "3.8", "instructor": "Wilson, Chris"}
+    rows, skipped = normalize_course("MATH111", [entry, dict(entry, total_students="31"), dict(entry, students="NA")])
+    assert skipped == 0
+    assert [row["total_students"] for row in rows] == [None, 31, None]
+
+
+if __name__ == "__main__":
+    test_iter_grade_data_matches_json_loads()
+    test_streaming_import_matches_full_import()
+    test_enrollment_is_optional()
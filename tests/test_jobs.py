@@ -0,0 +1,85 @@
+# test_jobs.py
+
+import threading
+import time
+
+import pytest
+
+from admin.jobs import JobCancelled, JobConflict, JobRunner
+
+
+def poll_until(runner, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "job did not finish"
+        runner.poll()
+        time.sleep(0.01)
+
+
+def test_progress_and_result_are_delivered_on_poll():
+    runner = JobRunner()
+    seen, done = [], []
+
+    def work(job):
+        for rows in (100, 200):
+            job.progress(rows_inserted=rows)
+        return "v1"
+
+    runner.submit("Import", {"grade_distributions"}, work,
+                  on_progress=lambda job, counters: seen.append(counters["rows_inserted"]),
+                  on_done=lambda job, result: done.append((result, dict(job.counters))))
+    poll_until(runner, lambda: done)
+
+    assert seen == [100, 200]
+    assert done == [("v1", {"rows_inserted": 200})]
+    assert runner.running() == []
+
+
+def test_conflicting_jobs_are_rejected_and_cancel_stops_at_next_progress():
+    runner = JobRunner()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def work(job):
+        started.set()
+        release.wait(5)
+        job.progress(rows_parsed=1)
+        return "finished"
+
+    job = runner.submit("Import", {"grade_distributions", "courses"}, work,
+                        on_error=lambda job, error: errors.append(error))
+    started.wait(5)
+    with pytest.raises(JobConflict):
+        runner.submit("Resolve", {"grade_distributions"}, lambda job: None)
+    runner.submit("Scrape", {"faculty_list"}, lambda job: None)  # disjoint resources run alongside
+
+    runner.cancel(job)
+    release.set()
+    poll_until(runner, lambda: errors)
+    assert isinstance(errors[0], JobCancelled)
+    poll_until(runner, lambda: not runner.running())
+
+
+def test_a_failing_callback_does_not_stop_event_delivery():
+    scheduled = []
+    root = type("Root", (), {"after": lambda root, delay_ms, callback: scheduled.append(callback)})()
+    runner = JobRunner()
+    runner.attach(root)
+    done = []
+
+    def tick_until(condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, "job was not delivered"
+            scheduled.pop(0)()
+            time.sleep(0.01)
+
+    def broken(job, result):
+        raise RuntimeError("dialog failed")
+
+    runner.submit("Import", {"grade_distributions"}, lambda job: "v1", on_done=broken)
+    tick_until(lambda: not runner.running())
+    runner.submit("Roll Back", {"grade_distributions"}, lambda job: "v0",
+                  on_done=lambda job, result: done.append(result))
+    tick_until(lambda: done)
+    assert done == ["v0"]
@@ -0,0 +1,126 @@
+# test_migrate_db.py
+
+from admin.migrate_db import backfill_course_fields, migrate_database, needs_rollup_rebuild
+from src.data.db_manager import rollup_pipeline
+
+
+class OldSchemaCollection:
+    """Grade rows as imported before course fields were denormalized."""
+    def __init__(self, rows):
+        self.rows = rows
+
+    def distinct(self, field, query):
+        return sorted({row[field] for row in self.rows if "department" not in row})
+
+    def bulk_write(self, operations, ordered=True):
+        modified = 0
+        for operation in operations:
+            document = operation._doc
+            for row in self.rows:
+                if row["course_id"] == operation._filter["course_id"] and "department" not in row:
+                    row.update(document["$set"])
+                    modified += 1
+        return type("BulkWriteResult", (), {"modified_count": modified})()
+
+
+class Collection:
+    """Just enough of a pymongo collection for migrate_database."""
+    def __init__(self, database, name):
+        self.database = database
+        self.name = name
+        self.rows = []
+        self.pipelines = []
+
+    def _matches(self, row, query):
+        return all(field not in row if condition == {"$exists": False} else row.get(field) == condition
+                   for field, condition in query.items())
+
+    def estimated_document_count(self):
+        return len(self.rows)
+
+    def find_one(self, query, projection=None):
+        return next((row for row in self.rows if self._matches(row, query)), None)
+
+    def find(self, query):
+        return Cursor(row for row in self.rows if self._matches(row, query))
+
+    def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        row = self.find_one(query)
+        if row is None:
+            row = dict(query, value=0)
+            self.rows.append(row)
+        row["value"] += update["$inc"]["value"]
+        return row
+
+    def aggregate(self, pipeline):
+        """Stands in for the rollup pipeline: one cell per course and term, written with $out."""
+        self.pipelines.append(pipeline)
+        cells = {(row["course_id"], row["term_ordinal"]) for row in self.rows}
+        self.database[pipeline[-1]["$out"]].rows = [{"course_id": course_id, "term_ordinal": ordinal}
+                                                    for course_id, ordinal in sorted(cells)]
+
+
+class Cursor(list):
+    def sort(self, field, direction):
+        return sorted(self, key=lambda row: row[field], reverse=direction < 0)
+
+
+class Database(dict):
+    def __missing__(self, name):
+        self[name] = Collection(self, name)
+        return self[name]
+
+    def __getattr__(self, name):
+        return self[name]
+
+
+class Manager:
+    """A DatabaseManager over a Database, without a cache."""
+    def __init__(self):
+        self.db = Database()
+        self.cache = type("Cache", (), {"invalidate": lambda cache, generation: None})()
+
+    def __getattr__(self, name):
+        return self.db[name]
+
+    def get_generation(self):
+        meta = self.db.dataset_meta.find_one({"_id": "generation"})
+        return meta["value"] if meta else 0
+
+
+def test_backfill_sets_course_fields_once():
+    rows = [{"course_id": "MATH111"}, {"course_id": "MATH111"}, {"course_id": "CHN301"},
+            {"course_id": "CH221", "department": "CH", "number": 221, "level": 200}]
+    collection = OldSchemaCollection(rows)
+
+    assert backfill_course_fields(collection) == 3
+    assert rows[0] == {"course_id": "MATH111", "department": "MATH", "number": 111, "level": 100}
+    assert rows[2]["department"] == "CHN" and rows[2]["level"] == 300
+    assert backfill_course_fields(collection) == 0
+
+
+
+def test_rollups_are_built_for_datasets_imported_without_them():
+    manager = Manager()
+    manager.grade_distributions.rows = [
+        {"course_id": "MATH111", "department": "MATH", "number": 111, "level": 100, "term_ordinal": ordinal}
+        for ordinal in (8059, 8059, 8060)
+    ]
+    assert needs_rollup_rebuild(manager.grade_rollups, manager.grade_distributions)
+
+    assert migrate_database(manager) == 0
+    assert manager.grade_distributions.pipelines == [rollup_pipeline("grade_rollups")]
+    assert manager.grade_rollups.rows == [{"course_id": "MATH111", "term_ordinal": 8059},
+                                          {"course_id": "MATH111", "term_ordinal": 8060}]
+    assert manager.get_generation() == 1
+
+    # built once; an empty dataset gets no rollups either
+    migrate_database(manager)
+    assert len(manager.grade_distributions.pipelines) == 1
+    empty = Manager()
+    assert not needs_rollup_rebuild(empty.grade_rollups, empty.grade_distributions)
+
+
+if __name__ == "__main__":
+    test_backfill_sets_course_fields_once()
+    test_rollups_are_built_for_datasets_imported_without_them()
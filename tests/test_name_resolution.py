@@ -0,0 +1,55 @@
+# test_name_resolution.py
+
+import random
+from admin.name_resolution import NameResolver, edit_distances, parse_name, soundex
+from admin.update_db import DatabaseUpdater
+
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def test_edit_distances_match_reference():
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcde") for _ in range(rng.randint(0, 9))) for _ in range(40)]
+    queries, candidates = words[:15], words[15:]
+    distances = edit_distances(queries, candidates)
+    for i, query in enumerate(queries):
+        for j, candidate in enumerate(candidates):
+            assert distances[i, j] == levenshtein(query, candidate)
+
+
+def test_parse_and_soundex():
+    assert parse_name("Moss, Madonna L.") == parse_name("Madonna L. Moss") == ("madonna", ("l",), "moss")
+    assert parse_name("Theresa D. O’Nell").last == "onell"
+    assert soundex("Robert") == soundex("Rupert") == "R163"
+    assert soundex("Ashcraft") == "A261"
+    assert soundex("Li") != soundex("Lincoln")
+
+
+def test_resolver_ranks_and_thresholds():
+    resolver = NameResolver(["Madonna L. Moss", "Abraham Lincoln", "Gyoung-Ah Lee", "Jon M. Erlandson"])
+    report = resolver.resolve(["Moss, Madonna", "Li, Wei", "Erlandsen, Jon M.", "Lee, Gyoung-Ah",
+                               "Moss, Madonna K.", "Lincoln, A."])
+    found = {r.grade_name: (r.faculty_name, r.status) for r in report.results}
+
+    assert found["Moss, Madonna"] == ("Madonna L. Moss", "match")
+    assert found["Lee, Gyoung-Ah"] == ("Gyoung-Ah Lee", "match")
+    assert found["Lincoln, A."] == ("Abraham Lincoln", "match")
+    assert found["Li, Wei"] == (None, "unmatched")
+    assert found["Erlandsen, Jon M."][0] == "Jon M. Erlandson"
+    assert found["Moss, Madonna K."][1] == "review"
+    assert [r.score for r in report.results] == sorted((r.score for r in report.results), reverse=True)
+
+
+def test_match_instructor_names_keeps_its_return_shape():
+    matches, unmatched = DatabaseUpdater(object()).match_instructor_names(
+        ["Lincoln, Abraham", "Li, Wei"], ["Abraham Lincoln"])
+    assert matches == [("Lincoln, Abraham", "Abraham Lincoln")]
+    assert unmatched == ["Li, Wei"]
@@ -0,0 +1,69 @@
+# test_query_cache.py
+
+from src.data.columnar_store import ColumnarGradeStore
+from src.data.query_cache import QueryCache, canonical_filters, normalize_filters
+
+
+def test_lru_eviction_and_row_limit():
+    cache = QueryCache(lambda: 1, max_entries=2, max_rows=5)
+
+    cache.put("a", [1, 2])
+    cache.put("b", [3])
+    cache.get("a")             # "b" is now least recently used
+    cache.put("c", [4])
+    assert cache.get("b") is None
+    assert cache.get("a") == [1, 2]
+
+    cache.put("d", [5, 6, 7])  # 6 rows in total, so "c" has to go
+    assert cache.get("c") is None
+    assert cache.get("a") == [1, 2]
+    assert cache.stats()["rows"] <= 5
+
+
+def test_generation_change_invalidates():
+    generation = [1]
+    cache = QueryCache(lambda: generation[0], check_interval=0)
+
+    cache.put("key", [{"_id": "MATH111"}])
+    assert cache.get("key") == [{"_id": "MATH111"}]
+
+    generation[0] += 1
+    assert cache.get("key") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_equivalent_filters_run_the_same_query():
+    assert canonical_filters({"department": " math", "year": "2014"}) == {"department": "MATH", "year": 2014}
+    assert normalize_filters({"department": "math"}) != normalize_filters({"department": "MATH"})
+    assert normalize_filters({"year": 2014, "department": "MATH"}) == \
+        normalize_filters({"department": "MATH", "year": 2014})
+
+    rows = [{"department": "MATH", "course_id": "MATH111", "instructor_name": "Smith, John", "term": "Fall",
+             "number": 111, "level": 100, "year": 2014, "is_regular_faculty": True,
+             "percent_a": 40.0, "percent_df": 10.0}]
+    store = ColumnarGradeStore.from_rows(rows)
+    store.cache = QueryCache(lambda: 1)
+    lower = store.group_stats("instructor_name", {"department": "math", "number": "111"})
+    upper = store.group_stats("instructor_name", {"department": "MATH", "number": 111})
+    assert lower == upper and len(upper) == 1
+
+
+def test_cached_pages_keep_their_shape():
+    rows = [{"department": "MATH", "course_id": "MATH111", "instructor_name": name, "term": "Fall",
+             "number": 111, "level": 100, "year": 2014, "is_regular_faculty": True,
+             "percent_a": 40.0, "percent_df": 10.0} for name in ("Smith, John", "Lee, Ann")]
+    store = ColumnarGradeStore.from_rows(rows)
+    store.cache = QueryCache(lambda: 1)
+
+    first = store.group_stats_page("instructor_name", {"department": "MATH"}, "avg_percent_a", 0, 1)
+    again = store.group_stats_page("instructor_name", {"department": "MATH"}, "avg_percent_a", 0, 1)
+    assert again == first and again["total"] == 2
+    assert store.cache.stats()["hits"] == 1
+
+
+if __name__ == "__main__":
+    test_lru_eviction_and_row_limit()
+    test_generation_change_invalidates()
+    test_equivalent_filters_run_the_same_query()
+    test_cached_pages_keep_their_shape()
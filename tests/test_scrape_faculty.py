@@ -0,0 +1,134 @@
+# test_scrape_faculty.py
+
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from admin.scrape_faculty import WebScraper
+
+INDEX = """<html><body><ul class="nav" id="/arts_sciences/">
+<li><a href="/catalog/anthropology/">Anthropology</a></li>
+<li><a href="/catalog/mathematics/">Mathematics</a></li>
+<li><a href="/catalog/physics/">Physics</a></li>
+<li><a href="/catalog/history/">History</a></li>
+</ul></body></html>"""
+
+DEPARTMENT = """<html><head><title>{name} &lt; University of Oregon</title></head><body>
+<p class="facultylist">The date in parentheses at the end of each entry is the first year on the University of Oregon faculty.</p>
+<p class="facultylist">{faculty}, professor (1990)</p>
+</body></html>"""
+
+PAGES = {
+    "/catalog/": INDEX,
+    "/catalog/anthropology/": DEPARTMENT.format(name="Anthropology", faculty="Madonna L. Moss"),
+    "/catalog/mathematics/": DEPARTMENT.format(name="Mathematics", faculty="John Smith"),
+}
+
+
+@pytest.fixture
+def server():
+    """Local stand-in for the Wayback Machine; mathematics fails once with a 503."""
+    hits = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] += 1
+            if self.path == "/catalog/mathematics/" and hits[self.path] == 1:
+                self.send_response(503)
+                self.end_headers()
+                return
+            body = PAGES.get(self.path)
+            self.send_response(200 if body else 404)
+            self.end_headers()
+            if body:
+                self.wfile.write(body.encode("utf-8"))
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", hits
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_scraper(base_url, cache_dir):
+    return WebScraper(base_url, cache_dir=str(cache_dir), min_interval=0, backoff=0.01, retries=3)
+
+
+def test_scrape_retries_and_skips_failures(server, tmp_path):
+    base_url, hits = server
+    fac_list, failed = make_scraper(base_url, tmp_path).scrape(base_url + "/catalog/")
+
+    assert fac_list == {"Anthropology": ["Madonna L. Moss"], "Mathematics": ["John Smith"]}
+    assert failed == [base_url + "/catalog/physics/"]  # 404 is reported, not fatal
+    assert hits["/catalog/mathematics/"] == 2           # one 503, then success
+    assert hits["/catalog/physics/"] == 1               # permanent errors are not retried
+    assert "/catalog/history/" not in hits
+
+
+def test_rerun_is_served_from_cache(server, tmp_path):
+    base_url, hits = server
+    make_scraper(base_url, tmp_path).scrape(base_url + "/catalog/")
+    first_run = sum(hits.values())
+
+    fac_list, _ = make_scraper(base_url, tmp_path).scrape(base_url + "/catalog/")
+    assert fac_list["Mathematics"] == ["John Smith"]
+    assert sum(hits.values()) - first_run == 1  # only the uncached 404 page is requested again
+    assert len(list((tmp_path / "objects").glob("*.html"))) == 3
+
+
+SNAPSHOT_FACULTY = {"20140901091007": "Madonna L. Moss", "20150901000000": "Gyoung-Ah Lee"}
+
+
+@pytest.fixture
+def wayback(tmp_path):
+    """Two catalog snapshots whose anthropology pages list different faculty."""
+    hits = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] += 1
+            parts = self.path.split("/")  # "", "web", timestamp, "http:", "", host, section, [department], ""
+            timestamp, rest = parts[2], "/".join(parts[6:])
+            if rest == "arts_sciences/":
+                body = (f'<ul class="nav" id="/arts_sciences/"><li><a href="/web/{timestamp}/'
+                        f'http://catalog.uoregon.edu/arts_sciences/anthropology/">Anthropology</a></li></ul>')
+            elif rest == "arts_sciences/anthropology/":
+                body = DEPARTMENT.format(name="Anthropology", faculty=SNAPSHOT_FACULTY[timestamp])
+            else:
+                body = None
+            self.send_response(200 if body else 404)
+            self.end_headers()
+            if body:
+                self.wfile.write(body.encode("utf-8"))
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", hits
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_snapshots_merge_into_year_tagged_dataset(wayback, tmp_path):
+    base_url, hits = wayback
+    dataset, failed = make_scraper(base_url, tmp_path).scrape_snapshots(list(SNAPSHOT_FACULTY))
+
+    assert failed == []
+    assert dataset["faculty"] == {"2014": {"Anthropology": ["Madonna L. Moss"]},
+                                  "2015": {"Anthropology": ["Gyoung-Ah Lee"]}}
+    assert dataset["snapshots"]["20150901000000"]["catalog_year"] == 2015
+
+    # a refresh re-downloads but does not re-parse pages whose digest is unchanged
+    scraper = make_scraper(base_url, tmp_path)
+    scraper.refresh = True
+    scraper.get_faculty = None
+    assert scraper.scrape_snapshots(list(SNAPSHOT_FACULTY))[0] == dataset
+    assert set(hits.values()) == {2}
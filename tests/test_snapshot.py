@@ -0,0 +1,93 @@
+# test_snapshot.py
+
+import os
+import numpy as np
+from src.data.columnar_store import ColumnarGradeStore
+from src.data.snapshot import write_snapshot, load_snapshot, is_snapshot_fresh, read_header
+from tests.test_columnar_store import ROWS
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "grades.snapshot")
+    store = ColumnarGradeStore.from_rows(ROWS)
+    write_snapshot(path, store)
+
+    loaded = load_snapshot(path)
+    assert loaded.dictionaries == store.dictionaries
+    for name, column in store.columns.items():
+        assert np.array_equal(loaded.columns[name], column)
+        assert loaded.columns[name].dtype == column.dtype
+    assert loaded.group_stats("instructor_name", {"department": "MATH"}, sort_by="avg_percent_a") == \
+        store.group_stats("instructor_name", {"department": "MATH"}, sort_by="avg_percent_a")
+
+
+def test_empty_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "grades.snapshot")
+    write_snapshot(path, ColumnarGradeStore.from_rows([]))
+
+    loaded = load_snapshot(path)
+    assert loaded.size == 0
+    assert loaded.group_stats("instructor_name") == []
+
+
+class Rows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def find(self, query, projection):
+        return [{field: row[field] for field in projection if field in row} for row in self.rows]
+
+
+class Source:
+    """The parts of DatabaseManager a store reloads from."""
+    def __init__(self, rows, generation):
+        self.courses = Rows([])
+        self.grade_distributions = Rows(rows)
+        self.generation = generation
+
+    def get_generation(self):
+        return self.generation
+
+    def read_consistent(self, read):
+        return read()
+
+
+def test_snapshot_reloads_from_its_source_when_the_generation_changes(tmp_path):
+    path = str(tmp_path / "grades.snapshot")
+    write_snapshot(path, ColumnarGradeStore.from_rows(ROWS))
+    source = Source(ROWS[:1], generation=0)
+
+    loaded = load_snapshot(path, source=source, check_interval=0)
+    assert not loaded.refresh_if_stale()
+    assert loaded.size == len(ROWS)
+
+    source.generation = 1
+    assert [row["_id"] for row in loaded.group_stats("instructor_name")] == ["Smith, John"]
+    assert loaded.get_generation() == 1
+
+
+def test_snapshot_freshness(tmp_path):
+    path = str(tmp_path / "grades.snapshot")
+    source = tmp_path / "gradedata.js"
+    source.write_text("var groups = {};")
+    assert not is_snapshot_fresh(path, str(source))
+
+    write_snapshot(path, ColumnarGradeStore.from_rows(ROWS))
+    assert is_snapshot_fresh(path, str(source))
+
+    # a data file replaced after the snapshot was written makes it stale
+    created_at = read_header(path)["created_at"]
+    os.utime(source, (created_at + 10, created_at + 10))
+    assert not is_snapshot_fresh(path, str(source))
+
+    with open(path, "r+b") as file:
+        file.write(b"NOTASNAP")
+    assert read_header(path) is None
+
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    with tempfile.TemporaryDirectory() as directory:
+        test_snapshot_round_trip(pathlib.Path(directory))
+        test_empty_snapshot_round_trip(pathlib.Path(directory))
+        test_snapshot_freshness(pathlib.Path(directory))
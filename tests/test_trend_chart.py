@@ -0,0 +1,46 @@
+# test_trend_chart.py
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from src.gui.trend_chart import TrendChart
+from src.utils.helpers import term_ordinal
+
+
+def point(term, year, average):
+    return {"term_ordinal": term_ordinal(term, year), "term": f"{term} {year}", "average": average, "class_count": 1}
+
+
+def test_set_data_reuses_lines_and_hides_unused_ones():
+    chart = TrendChart(Figure(figsize=(6, 4), dpi=100), None, slots=3)
+    lines = list(chart.lines)
+    chart.set_data(["Smith, John", "Lee, Ann"],
+                   [[point("Fall", 2014, 40.0), point("Winter", 2015, 60.0)], [point("Spring", 2016, 20.0)]],
+                   y_label="% As", title="Dept: MATH")
+
+    assert chart.lines == lines
+    assert [line.get_visible() for line in chart.lines] == [True, True, False]
+    assert list(chart.lines[0].get_ydata()) == [40.0, 60.0]
+    assert [text.get_text() for text in chart.legend.get_texts()] == ["Smith, John", "Lee, Ann"]
+    assert chart.ax.get_xlim() == (term_ordinal("Fall", 2014) - 0.5, term_ordinal("Spring", 2016) + 0.5)
+
+
+def test_labels_without_series_are_hidden():
+    chart = TrendChart(Figure(figsize=(6, 4), dpi=100), None, slots=3)
+    chart.set_data(["Smith, John", "Lee, Ann", "Wilson, Chris"], [[point("Fall", 2014, 40.0)]],
+                   y_label="% As", title="Dept: MATH")
+
+    assert [line.get_visible() for line in chart.lines] == [True, False, False]
+    assert [text.get_text() for text in chart.legend.get_texts()] == ["Smith, John"]
+
+
+def test_tick_labels_name_terms():
+    fig = Figure(figsize=(6, 4), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    chart = TrendChart(fig, canvas, slots=2)
+    chart.set_data(["MATH111"], [[point("Fall", 2013, 35.0), point("Spring", 2016, 45.0)]],
+                   y_label="% As", title="Course: MATH111")
+    canvas.draw()
+
+    labels = [label.get_text() for label in chart.ax.get_xticklabels() if label.get_text()]
+    assert labels and all(label.split()[0] in ("Winter", "Spring", "Summer", "Fall") for label in labels)
@@ -0,0 +1,159 @@
+# test_update_db.py
+
+from datetime import datetime, timedelta
+
+from admin.update_db import DatabaseUpdater
+from src.data.db_manager import DATASET_COLLECTIONS, DatabaseManager
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection for version bookkeeping and renames."""
+    def __init__(self, database, name, rows=None):
+        self.database = database
+        self.name = name
+        self.rows = rows if rows is not None else []
+
+    def rename(self, new_name, dropTarget=False):
+        assert dropTarget or new_name not in self.database.collections
+        self.database.log.append(("rename", self.name))
+        del self.database.collections[self.name]
+        self.name = new_name
+        self.database.collections[new_name] = self
+
+    def estimated_document_count(self):
+        return len(self.rows)
+
+    def _matches(self, query):
+        return [row for row in self.rows if all(row.get(field) == value for field, value in query.items())]
+
+    def find(self, query):
+        return FakeCursor(self._matches(query))
+
+    def find_one(self, query):
+        matches = self._matches(query)
+        return matches[0] if matches else None
+
+    def insert_one(self, document):
+        self.rows.append(dict(document))
+
+    def update_one(self, query, update):
+        for row in self._matches(query)[:1]:
+            row.update(update["$set"])
+
+    def delete_one(self, query):
+        for row in self._matches(query)[:1]:
+            self.rows.remove(row)
+
+
+class FakeCursor(list):
+    def sort(self, field, direction):
+        return sorted(self, key=lambda row: row[field], reverse=direction < 0)
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.collections = {}
+        self.log = []
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(self, name)
+        return self.collections[name]
+
+    def list_collection_names(self):
+        return list(self.collections)
+
+    def create_collection(self, name):
+        return self[name]
+
+    def drop_collection(self, name):
+        self.collections.pop(name, None)
+
+
+class FakeManager:
+    """The parts of DatabaseManager the updater uses for rollbacks."""
+    def __init__(self):
+        self.db = FakeDatabase()
+        self.generation = 0
+
+    def __getattr__(self, name):
+        return self.db[name]
+
+    def bump_generation(self, changing=False):
+        self.db.log.append(("bump", changing))
+        self.generation += 1
+        return self.generation
+
+
+def make_versions(manager, versions, live):
+    """Register versions (oldest first) with one marker row each; live is served from the live names."""
+    start = datetime(2025, 1, 1)
+    for i, version in enumerate(versions):
+        manager.dataset_versions.insert_one({"_id": version, "created_at": start + timedelta(days=i),
+                                             "live": version == live})
+        for name in DATASET_COLLECTIONS:
+            target = name if version == live else f"{name}_{version}"
+            manager.db[target].rows.append({"version": version})
+
+
+def live_data(manager):
+    return manager.grade_distributions.rows[0]["version"]
+
+
+def test_repeated_rollbacks_keep_going_back():
+    manager = FakeManager()
+    make_versions(manager, ["v1", "v2", "v3"], live="v3")
+    updater = DatabaseUpdater(manager)
+
+    assert updater.rollback() == "v2"
+    assert live_data(manager) == "v2"
+    assert updater.rollback() == "v1"
+    assert live_data(manager) == "v1"
+    assert updater.rollback() is None
+    assert live_data(manager) == "v1"
+
+    # an explicit version still rolls forward; rolling back then returns to
+    # the version it replaced
+    assert updater.rollback("v3") == "v3"
+    assert live_data(manager) == "v3"
+    assert updater.rollback() == "v1"
+
+
+
+def test_swaps_mark_the_dataset_as_changing_around_the_renames():
+    manager = FakeManager()
+    make_versions(manager, ["v1", "v2"], live="v2")
+    DatabaseUpdater(manager).rollback()
+
+    log = manager.db.log
+    assert log[0] == ("bump", True) and log[-1] == ("bump", False)
+    assert [kind for kind, _ in log[1:-1]] == ["rename"] * (2 * len(DATASET_COLLECTIONS))
+
+
+class GenerationStates:
+    """dataset_meta whose generation document changes between reads."""
+    def __init__(self, states):
+        self.states = states
+
+    def find_one(self, query):
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+
+def test_reads_wait_for_dataset_changes_and_retry_across_them():
+    manager = object.__new__(DatabaseManager)
+    manager.dataset_meta = GenerationStates([
+        {"_id": "generation", "value": 1, "changing": True},   # swap under way: wait
+        {"_id": "generation", "value": 2, "changing": False},  # read starts
+        {"_id": "generation", "value": 3, "changing": True},   # ...and overlaps the next swap
+        {"_id": "generation", "value": 4, "changing": False},
+    ])
+    reads = []
+
+    assert manager.read_consistent(lambda: reads.append(len(reads)) or len(reads)) == 2
+    assert reads == [0, 1]
+
+
+if __name__ == "__main__":
+    test_repeated_rollbacks_keep_going_back()
+    test_swaps_mark_the_dataset_as_changing_around_the_renames()
+    test_reads_wait_for_dataset_changes_and_retry_across_them()